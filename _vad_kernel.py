@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+VAD 수치 연산 커널
+Numba가 설치된 경우 JIT 컴파일된 루프를 사용하고, 없으면 numpy 구현으로 대체
+"""
+
+import math
+import numpy as np
+
+# 선택적 JIT 컴파일 모듈 (없으면 numpy 구현 사용)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def chunk_rms(audio_data):
+        """청크 RMS 에너지"""
+        n = audio_data.shape[0]
+        if n == 0:
+            return 0.0
+        acc = 0.0
+        for i in range(n):
+            v = audio_data[i]
+            acc += v * v
+        return math.sqrt(acc / n)
+
+    @njit(cache=True, fastmath=True)
+    def max_block_rms(audio_data, block):
+        """block 샘플 단위 RMS 중 최댓값 (긴 무음에 섞인 짧은 발화도 드러나도록)"""
+        n = audio_data.shape[0]
+        peak = 0.0
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            acc = 0.0
+            for i in range(start, stop):
+                v = audio_data[i]
+                acc += v * v
+            peak = max(peak, acc / (stop - start))
+        return math.sqrt(peak)
+else:
+    def chunk_rms(audio_data):
+        """청크 RMS 에너지 (BLAS 내적 - 제곱 임시 배열 없음)"""
+        n = len(audio_data)
+        if n == 0:
+            return 0.0
+        return math.sqrt(float(np.dot(audio_data, audio_data)) / n)
+
+    def max_block_rms(audio_data, block):
+        """block 샘플 단위 RMS 중 최댓값 (긴 무음에 섞인 짧은 발화도 드러나도록)"""
+        n = len(audio_data)
+        full = n - n % block
+        peak = 0.0
+        if full:
+            # 블록별 제곱합을 한 번에 (제곱 임시 배열 없음)
+            blocks = audio_data[:full].reshape(-1, block)
+            peak = float(np.einsum('ij,ij->i', blocks, blocks).max()) / block
+        if full < n:
+            tail = audio_data[full:]
+            peak = max(peak, float(np.dot(tail, tail)) / len(tail))
+        return math.sqrt(peak)
+
+
+def band_energy_ratio(spec, lo, hi, n):
+    """길이 n 실수 신호의 rFFT 스펙트럼에서 [lo, hi) 대역이 전체 에너지에서 차지하는 비율 (scipy 미설치 시의 VAD 경로 전용)
+
+    양쪽 스펙트럼 기준의 실제 대역 비율 - [lo, hi)는 DC/나이퀴스트 bin을 포함하지 않아야 함.
+    """
+    # vdot(x, x) = sum(|x|^2) - abs/제곱 임시 배열 없이 파워 합 계산
+    band = np.vdot(spec[lo:hi], spec[lo:hi]).real
+    # rFFT는 양의 주파수만 담으므로 DC와 (n이 짝수면) 나이퀴스트를 뺀 나머지 bin은 두 번 셈
+    edges = abs(spec[0]) ** 2
+    if n % 2 == 0:
+        edges += abs(spec[-1]) ** 2
+    total = 2.0 * np.vdot(spec, spec).real - edges
+    return float(2.0 * band / (total + 1e-10))
+
+
+def warmup(chunk_size: int):
+    """JIT 컴파일을 미리 수행 (첫 오디오 콜백 지연 방지)"""
+    dummy = np.zeros(chunk_size, dtype=np.float32)
+    chunk_rms(dummy)
+    max_block_rms(dummy, max(1, chunk_size // 4))
@@ -1,355 +1,768 @@
-#!/usr/bin/env python3
-"""
-실시간 오디오 캡처 모듈 - Chrome 브라우저 오디오를 실시간으로 캡처
-Windows WASAPI를 사용하여 시스템 오디오(스피커 출력)를 모니터링
-"""
-
-import pyaudio
-import numpy as np
-import threading
-import time
-import wave
-from collections import deque
-from typing import Optional, Callable
-import logging
-
-class AudioCaptureConfig:
-    """오디오 캡처 설정"""
-    def __init__(self):
-        self.sample_rate = 16000  # Whisper 최적화
-        self.channels = 1  # 모노 오디오
-        self.chunk_size = 1024  # 버퍼 크기
-        self.format = pyaudio.paFloat32
-        self.buffer_duration = 5.0  # 5초 버퍼 (더 긴 발화 대응)
-        self.overlap_duration = 1.0  # 오디오 청크 간 겹침 시간 (연속성 보장)
-        self.silence_threshold = 0.005  # 무음 감지 임계값 (낮춤 - 배경음악 고려)
-        self.min_speech_duration = 0.3  # 최소 음성 지속시간 (짧게)
-        self.max_silence_duration = 2.0  # 최대 지속 침묵 시간 (긴 발화 대응)
-        self.background_noise_threshold = 0.008  # 배경 소음 임계값
-
-class ChromeAudioCapture:
-    """Chrome 오디오 실시간 캡처"""
-    
-    def __init__(self, config: Optional[AudioCaptureConfig] = None):
-        self.config = config or AudioCaptureConfig()
-        self.pyaudio = pyaudio.PyAudio()
-        
-        # 오디오 버퍼 (3초간)
-        buffer_size = int(self.config.buffer_duration * self.config.sample_rate / self.config.chunk_size)
-        self.audio_buffer = deque(maxlen=buffer_size)
-        
-        # 상태 관리
-        self.is_recording = False
-        self.is_speaking = False
-        self.speech_start_time = None
-        self.last_speech_time = None  # 마지막 음성 감지 시간
-        self.silence_start_time = None  # 침묵 시작 시간
-
-        # 배경 노이즈 적응형 감지
-        self.noise_buffer = deque(maxlen=50)  # 배경 소음 레벨 저장
-        self.adaptive_threshold = self.config.silence_threshold
-        
-        # 콜백 함수들
-        self.on_speech_detected: Optional[Callable] = None
-        self.on_speech_ended: Optional[Callable] = None
-        self.on_continuous_audio: Optional[Callable] = None  # 연속 처리용 콜백
-        
-        # 스레드 관리
-        self.capture_thread = None
-        self.processing_thread = None
-        self.continuous_thread = None
-
-        # 연속 처리를 위한 상태
-        self.continuous_mode = True  # 연속 처리 모드 활성화
-        self.last_processing_time = 0
-        self.processing_interval = 3.0  # 3초마다 연속 처리
-        
-        # 로깅
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
-        
-    def get_default_speaker_device(self) -> int:
-        """기본 스피커 디바이스를 찾기 (시스템 오디오 캡처용)"""
-        # 우선순위별 디바이스 검색
-        priority_keywords = [
-            # WASAPI loopback (최고 우선순위)
-            ['WASAPI', 'loopback'],
-            # Virtual Audio Cable 계열
-            ['VoiceMeeter Output', 'VB-Audio'],
-            ['CABLE Output', 'VB-Audio'],
-            # 스테레오 믹스
-            ['스테레오 믹스', 'Stereo Mix'],
-            # 기타 가능한 시스템 오디오 소스
-            ['Virtual Desktop Audio'],
-            ['Steam Streaming Speakers', 'Input'],
-            # 일반 입력 디바이스 (마지막 수단)
-            ['Speakers', 'Input'],
-            ['마이크', 'Microphone']
-        ]
-        
-        for keywords in priority_keywords:
-            for i in range(self.pyaudio.get_device_count()):
-                try:
-                    device_info = self.pyaudio.get_device_info_by_index(i)
-                    device_name = device_info['name']
-                    
-                    # 입력 채널이 있는 디바이스만
-                    if device_info['maxInputChannels'] == 0:
-                        continue
-                    
-                    # 키워드 매칭 (대소문자 무시)
-                    name_lower = device_name.lower()
-                    if all(keyword.lower() in name_lower for keyword in keywords):
-                        self.logger.info(f"Found audio capture device: {device_name}")
-                        return i
-                        
-                except Exception as e:
-                    continue
-        
-        # 기본 입력 디바이스 사용
-        try:
-            default_device = self.pyaudio.get_default_input_device_info()
-            self.logger.warning(f"Using default input device: {default_device['name']}")
-            return default_device['index']
-        except Exception as e:
-            self.logger.error(f"No suitable audio device found: {e}")
-            return 0
-    
-    def detect_voice_activity(self, audio_data: np.ndarray) -> bool:
-        """개선된 음성 활동 감지 (VAD) - 배경음악 대응"""
-        # RMS 에너지 계산
-        rms = np.sqrt(np.mean(audio_data ** 2))
-
-        # 배경 노이즈 레벨 업데이트
-        self.noise_buffer.append(rms)
-
-        # 적응형 임계값 업데이트 (배경 노이즈의 2배)
-        if len(self.noise_buffer) >= 10:
-            avg_noise = sum(list(self.noise_buffer)[:10]) / 10  # 초기 10개 샘플의 평균
-            self.adaptive_threshold = max(self.config.silence_threshold, avg_noise * 2.0)
-
-        # 음성 감지: RMS가 적응형 임계값을 초과하고
-        # 추가로 스펙트럼 기반 검증
-        is_speech_rms = rms > self.adaptive_threshold
-
-        if is_speech_rms:
-            # 고주파 강도 검사 (음성의 특징)
-            fft = np.fft.fft(audio_data)
-            freqs = np.fft.fftfreq(len(audio_data), 1/self.config.sample_rate)
-
-            # 300Hz - 3400Hz 대역의 에너지 (음성 주파수 대역)
-            speech_band = (freqs >= 300) & (freqs <= 3400)
-            speech_energy = np.sum(np.abs(fft[speech_band]) ** 2)
-
-            # 전체 에너지 대비 음성 대역 에너지 비율
-            total_energy = np.sum(np.abs(fft) ** 2)
-            speech_ratio = speech_energy / (total_energy + 1e-10)
-
-            # 음성으로 판단할 최소 비율
-            return speech_ratio > 0.1
-
-        return False
-    
-    def get_audio_segment(self, duration_seconds: float = 3.0) -> Optional[np.ndarray]:
-        """지정된 길이의 오디오 세그먼트 반환"""
-        if not self.audio_buffer:
-            return None
-            
-        # 필요한 청크 수 계산
-        chunks_needed = int(duration_seconds * self.config.sample_rate / self.config.chunk_size)
-        chunks_needed = min(chunks_needed, len(self.audio_buffer))
-        
-        if chunks_needed == 0:
-            return None
-            
-        # 최신 청크들을 가져와서 연결
-        recent_chunks = list(self.audio_buffer)[-chunks_needed:]
-        return np.concatenate(recent_chunks)
-    
-    def audio_callback(self, in_data, frame_count, time_info, status):
-        """PyAudio 콜백 함수"""
-        try:
-            # 바이트 데이터를 numpy 배열로 변환
-            audio_data = np.frombuffer(in_data, dtype=np.float32)
-            
-            # 스테레오를 모노로 변환 (필요시)
-            if len(audio_data) == frame_count * 2:
-                audio_data = audio_data.reshape(-1, 2).mean(axis=1)
-            
-            # 버퍼에 추가
-            self.audio_buffer.append(audio_data)
-            
-            # 음성 활동 감지
-            has_speech = self.detect_voice_activity(audio_data)
-            
-            current_time = time.time()
-            
-            # 음성 감지 상태 업데이트
-            if has_speech:
-                self.last_speech_time = current_time
-
-                # 음성 시작 감지
-                if not self.is_speaking:
-                    self.is_speaking = True
-                    self.speech_start_time = current_time
-                    self.silence_start_time = None
-                    self.logger.debug("Speech started")
-            else:
-                # 침묵 감지
-                if self.is_speaking:
-                    if self.silence_start_time is None:
-                        self.silence_start_time = current_time
-
-                    # 충분히 긴 침묵이 지속되면 음성 종료로 판단
-                    silence_duration = current_time - self.silence_start_time
-                    if silence_duration >= self.config.max_silence_duration:
-                        # 최소 음성 지속 시간 체크
-                        if current_time - self.speech_start_time >= self.config.min_speech_duration:
-                            self.is_speaking = False
-                            self.silence_start_time = None
-                            self.logger.debug(f"Speech ended after {silence_duration:.1f}s silence")
-
-                            # 음성 종료 콜백 호출
-                            if self.on_speech_ended:
-                                # 침묵 시작 이전까지의 오디오만 가져오기
-                                audio_segment = self.get_audio_segment()
-                                if audio_segment is not None:
-                                    threading.Thread(
-                                        target=self.on_speech_ended,
-                                        args=(audio_segment,),
-                                        daemon=True
-                                    ).start()
-                            
-        except Exception as e:
-            self.logger.error(f"Audio callback error: {e}")
-            
-        return (in_data, pyaudio.paContinue)
-    
-    def start_capture(self):
-        """오디오 캡처 시작"""
-        if self.is_recording:
-            self.logger.warning("Already recording")
-            return
-            
-        try:
-            device_index = self.get_default_speaker_device()
-            
-            # 오디오 스트림 설정
-            self.stream = self.pyaudio.open(
-                format=self.config.format,
-                channels=self.config.channels,
-                rate=self.config.sample_rate,
-                input=True,
-                input_device_index=device_index,
-                frames_per_buffer=self.config.chunk_size,
-                stream_callback=self.audio_callback,
-                start=False
-            )
-            
-            self.is_recording = True
-            self.stream.start_stream()
-
-            # 연속 처리 워커 시작
-            if self.continuous_mode:
-                self.continuous_thread = threading.Thread(
-                    target=self._continuous_processing_worker,
-                    daemon=True
-                )
-                self.continuous_thread.start()
-
-            self.logger.info(f"Audio capture started (device: {device_index}, continuous mode: {self.continuous_mode})")
-
-        except Exception as e:
-            self.logger.error(f"Failed to start audio capture: {e}")
-            raise
-    
-    def stop_capture(self):
-        """오디오 캡처 중지"""
-        if not self.is_recording:
-            return
-            
-        try:
-            self.is_recording = False
-            if hasattr(self, 'stream'):
-                self.stream.stop_stream()
-                self.stream.close()
-            self.logger.info("Audio capture stopped")
-            
-        except Exception as e:
-            self.logger.error(f"Error stopping audio capture: {e}")
-    
-    def save_audio_buffer_to_file(self, filename: str, duration: float = 3.0):
-        """현재 오디오 버퍼를 WAV 파일로 저장 (디버깅용)"""
-        audio_data = self.get_audio_segment(duration)
-        if audio_data is None:
-            self.logger.warning("No audio data to save")
-            return
-            
-        # float32를 int16으로 변환
-        audio_int16 = (audio_data * 32767).astype(np.int16)
-        
-        with wave.open(filename, 'w') as wf:
-            wf.setnchannels(self.config.channels)
-            wf.setsampwidth(2)  # 16-bit
-            wf.setframerate(self.config.sample_rate)
-            wf.writeframes(audio_int16.tobytes())
-            
-        self.logger.info(f"Audio saved to {filename}")
-
-    def _continuous_processing_worker(self):
-        """연속 처리 워커 - 배경음악이나 긴 발화 처리용"""
-        self.logger.info("Continuous processing worker started")
-
-        while self.is_recording:
-            try:
-                current_time = time.time()
-
-                # 연속 처리 간격 체크
-                if current_time - self.last_processing_time >= self.processing_interval:
-                    # 최근 오디오 세그먼트 가져오기
-                    audio_segment = self.get_audio_segment(duration_seconds=3.0)
-
-                    if audio_segment is not None and self.on_continuous_audio:
-                        # 연속 처리 콜백 호출
-                        threading.Thread(
-                            target=self.on_continuous_audio,
-                            args=(audio_segment,),
-                            daemon=True
-                        ).start()
-
-                        self.last_processing_time = current_time
-                        self.logger.debug("Continuous processing triggered")
-
-                time.sleep(0.5)  # 500ms마다 체크
-
-            except Exception as e:
-                self.logger.error(f"Continuous processing worker error: {e}")
-                time.sleep(1.0)
-
-        self.logger.info("Continuous processing worker stopped")
-
-    def __del__(self):
-        """소멸자"""
-        self.stop_capture()
-        if hasattr(self, 'pyaudio'):
-            self.pyaudio.terminate()
-
-# 테스트 코드
-if __name__ == "__main__":
-    def on_speech_callback(audio_data):
-        print(f"Speech detected! Audio length: {len(audio_data)/16000:.2f}s")
-    
-    capture = ChromeAudioCapture()
-    capture.on_speech_ended = on_speech_callback
-    
-    print("Starting audio capture... Speak something!")
-    capture.start_capture()
-    
-    try:
-        # 30초간 테스트
-        time.sleep(30)
-    except KeyboardInterrupt:
-        print("\nStopping...")
-    finally:
-        capture.stop_capture()
+#!/usr/bin/env python3
+"""
+실시간 오디오 캡처 모듈 - Chrome 브라우저 오디오를 실시간으로 캡처
+Windows WASAPI를 사용하여 시스템 오디오(스피커 출력)를 모니터링
+"""
+
+import pyaudio
+import numpy as np
+import threading
+import time
+import queue
+import wave
+import sys
+from typing import Optional, Callable, Tuple
+import logging
+
+import _vad_kernel
+
+# 음성 대역 필터 (없으면 FFT 기반 대역 에너지 비율 사용)
+try:
+    from scipy import signal as sp_signal
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# int16 PCM → float32 정규화 계수
+_INT16_TO_FLOAT = np.float32(1.0 / 32768.0)
+
+# Windows 스레드 우선순위 (THREAD_PRIORITY_TIME_CRITICAL)
+_THREAD_PRIORITY_TIME_CRITICAL = 15
+
+
+def _enter_realtime_thread(logger: logging.Logger, cpu: Optional[int] = None):
+    """현재 스레드를 실시간 오디오 스레드로 설정 (Windows 전용, 그 외 플랫폼은 무시)
+
+    MMCSS 'Pro Audio' 작업으로 등록하고 우선순위를 TIME_CRITICAL로 올림.
+    cpu가 지정되면 해당 코어에 고정. 반환된 핸들은 _leave_realtime_thread()로 해제.
+    """
+    if sys.platform != 'win32':
+        return None
+    try:
+        import ctypes
+        from ctypes import wintypes
+        kernel32 = ctypes.windll.kernel32
+        thread = kernel32.GetCurrentThread()
+
+        mmcss_handle = None
+        try:
+            avrt = ctypes.windll.avrt
+            avrt.AvSetMmThreadCharacteristicsW.restype = wintypes.HANDLE
+            task_index = wintypes.DWORD(0)
+            mmcss_handle = avrt.AvSetMmThreadCharacteristicsW("Pro Audio", ctypes.byref(task_index)) or None
+        except OSError:
+            pass
+
+        if not kernel32.SetThreadPriority(thread, _THREAD_PRIORITY_TIME_CRITICAL):
+            logger.warning("Failed to raise thread priority")
+
+        if cpu is not None:
+            kernel32.SetThreadAffinityMask.argtypes = [wintypes.HANDLE, ctypes.c_size_t]
+            kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+            if not kernel32.SetThreadAffinityMask(thread, 1 << cpu):
+                logger.warning(f"Failed to pin thread to CPU {cpu}")
+
+        return mmcss_handle
+    except Exception as e:
+        logger.warning(f"Realtime thread setup failed: {e}")
+        return None
+
+
+def _leave_realtime_thread(mmcss_handle):
+    """_enter_realtime_thread()에서 등록한 MMCSS 작업 해제"""
+    if mmcss_handle is None:
+        return
+    try:
+        import ctypes
+        ctypes.windll.avrt.AvRevertMmThreadCharacteristics(mmcss_handle)
+    except Exception:
+        pass
+
+
+class AudioCaptureConfig:
+    """오디오 캡처 설정"""
+    def __init__(self):
+        self.sample_rate = 16000  # Whisper 최적화
+        self.channels = 1  # 모노 오디오
+        self.chunk_size = 1024  # 버퍼 크기
+        self.format = pyaudio.paInt16  # 16-bit 정수로 수신 (float32 대비 전송량 절반)
+        self.sampwidth = 2  # 샘플당 바이트 수
+        self.buffer_duration = 5.0  # 5초 버퍼 (더 긴 발화 대응)
+        self.overlap_duration = 1.0  # 오디오 청크 간 겹침 시간 (연속성 보장)
+        self.silence_threshold = 0.005  # 무음 감지 임계값 (낮춤 - 배경음악 고려)
+        self.min_speech_duration = 0.3  # 최소 음성 지속시간 (짧게)
+        self.max_silence_duration = 2.0  # 최대 지속 침묵 시간 (긴 발화 대응)
+        self.background_noise_threshold = 0.008  # 배경 소음 임계값
+        self.realtime_vad_thread = True  # VAD 워커를 실시간 우선순위로 실행 (Windows)
+        self.vad_thread_cpu = None  # VAD 워커를 고정할 CPU 코어 번호 (None이면 고정 안 함)
+
+class AudioSegmentPool:
+    """오디오 세그먼트용 사전 할당 float32 버퍼 풀 (세그먼트마다 배열 할당 방지)
+
+    acquire()로 받은 배열은 소비자가 사용을 마친 뒤 release()로 반환해야 재사용됨.
+    풀이 비어 있으면 None을 반환하므로 호출 측에서 일반 할당으로 대체.
+    대여 중인 슬롯만 반환을 받으므로 같은 세그먼트를 두 번 반환해도 자유 목록에 중복되지 않음.
+    """
+
+    def __init__(self, num_slots: int, max_samples: int):
+        self._buffers = [np.empty(max_samples, dtype=np.float32) for _ in range(num_slots)]
+        self._slot_by_id = {id(buf): slot for slot, buf in enumerate(self._buffers)}
+        self._free = queue.SimpleQueue()
+        for slot in range(num_slots):
+            self._free.put(slot)
+        self._leased = set()  # 대여 중인 슬롯
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def acquire(self, n: int) -> Optional[np.ndarray]:
+        """길이 n의 버퍼 뷰 반환 (여유 슬롯이 없거나 n이 너무 크면 None)"""
+        if n > len(self._buffers[0]):
+            return None
+        try:
+            slot = self._free.get_nowait()
+        except queue.Empty:
+            return None
+        with self._lock:
+            self._leased.add(slot)
+        return self._buffers[slot][:n]
+
+    def release(self, segment: np.ndarray):
+        """acquire()로 받은 버퍼 반환 (풀에서 나온 배열이 아니면 무시, 이미 반환된 슬롯이면 경고 후 무시)"""
+        base = segment.base if segment.base is not None else segment
+        slot = self._slot_by_id.get(id(base))
+        if slot is None:
+            return
+        with self._lock:
+            if slot not in self._leased:
+                self.logger.warning(f"Audio segment slot {slot} released twice, ignored")
+                return
+            self._leased.remove(slot)
+        self._free.put(slot)
+
+class ChromeAudioCapture:
+    """Chrome 오디오 실시간 캡처"""
+
+    # 음성으로 판단할 최소 음성 대역(300Hz - 3400Hz) 에너지 비율 - 대역통과/rFFT 경로 모두 실제 대역 비율을 반환.
+    # 원래 구현은 양의 주파수 대역만 양쪽 스펙트럼 전체로 나눠 실제 비율의 절반을 0.1과 비교했으므로 같은 기준인 0.2 사용
+    SPEECH_BAND_RATIO = 0.2
+    
+    def __init__(self, config: Optional[AudioCaptureConfig] = None):
+        self.config = config or AudioCaptureConfig()
+        self.pyaudio = pyaudio.PyAudio()
+        
+        # 오디오 링 버퍼 (buffer_duration 초) - 캡처 스레드만 쓰고 소비자는 읽기만 함 (SPSC)
+        # int16 PCM으로 저장하고 읽을 때 float32로 변환 (메모리 대역폭 절반)
+        buffer_size = int(self.config.buffer_duration * self.config.sample_rate / self.config.chunk_size)
+        self._ring = np.zeros(buffer_size * self.config.chunk_size, dtype=np.int16)
+        self._ring_write_pos = 0  # 다음 쓰기 위치 (audio_callback에서만 갱신)
+        self._ring_filled = 0  # 유효 샘플 수
+        self._ring_total = 0  # 누적 기록 샘플 수 (VAD 워커의 읽기 위치 기준)
+        self._vad_ready = threading.Event()  # 새 오디오 도착 알림 (audio_callback → VAD 워커)
+        self._downmix_buf: Optional[np.ndarray] = None  # 스테레오 → 모노 변환용 재사용 버퍼
+        # 세그먼트 길이(초) → 샘플 수 캐시 (자주 쓰는 길이는 미리 계산)
+        self._segment_samples = {
+            duration: self._segment_samples_for(duration)
+            for duration in (3.0, self.config.buffer_duration)
+        }
+        
+        # 상태 관리
+        self.is_recording = False
+        self.is_speaking = False
+        # 발화 시점은 누적 샘플 위치(프레임)로 기록 - 벽시계 시간 대신 정수 비교
+        self.speech_start_frame = None
+        self.last_speech_frame = None  # 마지막 음성 감지 위치
+        self.silence_start_frame = None  # 침묵 시작 위치
+        self._max_silence_frames = int(self.config.max_silence_duration * self.config.sample_rate)
+        self._min_speech_frames = int(self.config.min_speech_duration * self.config.sample_rate)
+
+        # 배경 노이즈 적응형 감지
+        # 최근 50개 RMS를 고정 크기 배열에 저장하고, 가장 오래된 10개의 합을 증분 유지
+        self._noise_ring = np.zeros(50, dtype=np.float64)  # 배경 소음 레벨 저장
+        self._noise_idx = 0  # 다음 쓰기 위치 (가득 찬 뒤에는 가장 오래된 값의 위치)
+        self._noise_count = 0
+        self._noise_head_sum = 0.0  # 가장 오래된 10개 샘플의 합
+        self.adaptive_threshold = self.config.silence_threshold
+
+        # VAD 음성 대역(300Hz - 3400Hz) 필터 - 청크 간 필터 상태 유지
+        self._bp_sos = None
+        if SCIPY_AVAILABLE:
+            self._bp_sos = sp_signal.butter(4, [300, 3400], btype='band',
+                                            fs=self.config.sample_rate, output='sos')
+            self._bp_zi_unit = sp_signal.sosfilt_zi(self._bp_sos)
+            self._bp_zi = np.zeros_like(self._bp_zi_unit)
+            self._bp_primed = False  # 직전 청크까지 필터 상태가 이어져 있는지
+
+        # scipy가 없을 때의 FFT 경로용 사전 계산 (청크마다 fftfreq/마스크 재생성 방지)
+        self._rfft_n = self.config.chunk_size
+        self._speech_lo, self._speech_hi = self._speech_band_bins(self._rfft_n)
+
+        # VAD 커널 사전 컴파일 (Numba 사용 시)
+        _vad_kernel.warmup(self._rfft_n)
+        
+        # 콜백 함수들
+        self.on_speech_detected: Optional[Callable] = None
+        self.on_speech_ended: Optional[Callable] = None
+        self.on_continuous_audio: Optional[Callable] = None  # 연속 처리용 콜백
+        
+        # 스레드 관리
+        self.capture_thread = None
+        self.processing_thread = None
+        self.continuous_thread = None
+        self.dispatch_thread = None
+
+        # 세그먼트 전달: 사전 할당 버퍼 풀 + 단일 소비자 큐 (이벤트마다 스레드/배열 생성 방지)
+        # 콜백 수신 측은 세그먼트 사용 후 release_segment()를 호출해야 버퍼가 재사용됨
+        self.segment_pool = AudioSegmentPool(num_slots=4, max_samples=len(self._ring))
+        self._dispatch_queue = queue.SimpleQueue()
+
+        # 연속 처리를 위한 상태
+        self.continuous_mode = True  # 연속 처리 모드 활성화
+        self.last_processing_time = 0  # time.monotonic() 기준
+        self.processing_interval = 3.0  # 3초마다 연속 처리
+        self.processing_retry_interval = 0.5  # 처리할 오디오가 없을 때 재시도 간격
+        self._continuous_wakeup = threading.Event()  # stop_capture 시 워커 즉시 깨우기
+        
+        # 로깅 (핸들러/레벨 설정은 애플리케이션 진입점에서 담당)
+        self.logger = logging.getLogger(__name__)
+        # 핫 패스의 debug 로그 가드 (비활성 시 메시지 포맷팅 생략, start_capture에서 갱신)
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        
+    def get_default_speaker_device(self) -> int:
+        """기본 스피커 디바이스를 찾기 (시스템 오디오 캡처용)"""
+        # 우선순위별 디바이스 검색
+        priority_keywords = [
+            # WASAPI loopback (최고 우선순위)
+            ['WASAPI', 'loopback'],
+            # Virtual Audio Cable 계열
+            ['VoiceMeeter Output', 'VB-Audio'],
+            ['CABLE Output', 'VB-Audio'],
+            # 스테레오 믹스
+            ['스테레오 믹스', 'Stereo Mix'],
+            # 기타 가능한 시스템 오디오 소스
+            ['Virtual Desktop Audio'],
+            ['Steam Streaming Speakers', 'Input'],
+            # 일반 입력 디바이스 (마지막 수단)
+            ['Speakers', 'Input'],
+            ['마이크', 'Microphone']
+        ]
+        
+        # 입력 가능한 디바이스 목록을 한 번만 조회 (우선순위마다 재조회 방지)
+        input_devices = []
+        for i in range(self.pyaudio.get_device_count()):
+            try:
+                device_info = self.pyaudio.get_device_info_by_index(i)
+                device_name = device_info['name']
+
+                # 입력 채널이 있는 디바이스만
+                if device_info['maxInputChannels'] == 0:
+                    continue
+
+                input_devices.append((i, device_name, device_name.lower()))
+
+            except Exception:
+                continue
+
+        for keywords in priority_keywords:
+            keywords_lower = [keyword.lower() for keyword in keywords]
+            for i, device_name, name_lower in input_devices:
+                # 키워드 매칭 (대소문자 무시)
+                if all(keyword in name_lower for keyword in keywords_lower):
+                    self.logger.info(f"Found audio capture device: {device_name}")
+                    return i
+        
+        # 기본 입력 디바이스 사용
+        try:
+            default_device = self.pyaudio.get_default_input_device_info()
+            self.logger.warning(f"Using default input device: {default_device['name']}")
+            return default_device['index']
+        except Exception as e:
+            self.logger.error(f"No suitable audio device found: {e}")
+            return 0
+    
+    def _speech_band_bins(self, n: int) -> Tuple[int, int]:
+        """rFFT 결과에서 음성 대역(300Hz - 3400Hz)의 bin 인덱스 범위 계산"""
+        freqs = np.fft.rfftfreq(n, 1 / self.config.sample_rate)
+        lo = int(np.searchsorted(freqs, 300, side='left'))
+        hi = int(np.searchsorted(freqs, 3400, side='right'))
+        return lo, hi
+
+    def _update_noise_level(self, rms: float):
+        """배경 소음 레벨 기록 - 가장 오래된 10개 샘플의 합을 O(1)로 갱신"""
+        ring = self._noise_ring
+        size = len(ring)
+        idx = self._noise_idx
+
+        if self._noise_count < size:
+            if self._noise_count < 10:
+                self._noise_head_sum += rms
+            self._noise_count += 1
+        else:
+            # 가장 오래된 값(idx)이 빠지고 11번째로 오래된 값이 앞쪽 10개에 합류
+            self._noise_head_sum += ring[(idx + 10) % size] - ring[idx]
+
+        ring[idx] = rms
+        idx = (idx + 1) % size
+        self._noise_idx = idx
+
+        # 한 바퀴마다 누적 오차 보정 (가장 오래된 10개 = ring[0:10])
+        if idx == 0:
+            self._noise_head_sum = float(ring[:10].sum())
+
+    def detect_voice_activity(self, audio_data: np.ndarray) -> bool:
+        """개선된 음성 활동 감지 (VAD) - 배경음악 대응"""
+        n = len(audio_data)
+        if n == 0:
+            return False
+
+        # RMS 에너지 계산
+        rms = _vad_kernel.chunk_rms(audio_data)
+
+        # 배경 노이즈 레벨 업데이트
+        self._update_noise_level(rms)
+
+        # 적응형 임계값 업데이트 (배경 노이즈의 2배)
+        if self._noise_count >= 10:
+            avg_noise = self._noise_head_sum / 10  # 초기 10개 샘플의 평균
+            self.adaptive_threshold = max(self.config.silence_threshold, avg_noise * 2.0)
+
+        # 음성 감지: RMS가 적응형 임계값을 초과하는 경우에만
+        # 스펙트럼 기반 검증 수행 (대부분의 무음 청크는 필터/FFT 없이 종료)
+        if rms <= self.adaptive_threshold:
+            if self._bp_sos is not None:
+                self._bp_primed = False
+            return False
+
+        # 고주파 강도 검사 (음성의 특징) - 전체 에너지 대비 음성 대역 에너지 비율
+        if self._bp_sos is not None:
+            speech_ratio = self._bandpass_energy_ratio(audio_data, rms * rms * n)
+        else:
+            speech_ratio = self._fft_energy_ratio(audio_data)
+
+        # 음성으로 판단할 최소 비율
+        return speech_ratio > self.SPEECH_BAND_RATIO
+
+    def _bandpass_energy_ratio(self, audio_data: np.ndarray, total_energy: float) -> float:
+        """대역통과 필터 출력 에너지 / 입력 에너지 (필터 상태는 청크 간 유지)
+
+        rFFT 경로와 같은 실제 음성 대역 비율이므로 같은 SPEECH_BAND_RATIO 기준으로 비교.
+        """
+        if not self._bp_primed:
+            # 직전 청크를 건너뛴 경우 현재 입력 기준 정상 상태로 초기화 (과도 응답 억제)
+            self._bp_zi = self._bp_zi_unit * audio_data[0]
+            self._bp_primed = True
+
+        filtered, self._bp_zi = sp_signal.sosfilt(self._bp_sos, audio_data, zi=self._bp_zi)
+        speech_energy = float(np.dot(filtered, filtered))
+        return speech_energy / (total_energy + 1e-10)
+
+    def _fft_energy_ratio(self, audio_data: np.ndarray) -> float:
+        """rFFT 스펙트럼에서 300Hz - 3400Hz 대역 에너지 비율 (scipy 미설치 시)"""
+        n = len(audio_data)
+        # 실수 입력이므로 rFFT로 절반만 계산
+        spec = np.fft.rfft(audio_data)
+
+        if n == self._rfft_n:
+            lo, hi = self._speech_lo, self._speech_hi
+        else:
+            # 청크 크기가 다른 경우 (드물게 발생) 대역 인덱스 재계산
+            lo, hi = self._speech_band_bins(n)
+
+        # 실수 신호의 스펙트럼은 대칭 - 음의 주파수 몫은 커널이 양쪽 스펙트럼 기준으로 환산
+        return _vad_kernel.band_energy_ratio(spec, lo, hi, n)
+    
+    def _write_ring(self, audio_data: np.ndarray):
+        """링 버퍼에 int16 PCM 오디오 기록 (캡처 스레드 전용)"""
+        size = len(self._ring)
+        n = len(audio_data)
+        if n >= size:
+            # 버퍼보다 긴 입력은 최신 부분만 유지
+            self._ring[:] = audio_data[-size:]
+            self._ring_write_pos = 0
+            self._ring_filled = size
+            self._ring_total += n
+            return
+
+        wr = self._ring_write_pos
+        end = wr + n
+        if end <= size:
+            self._ring[wr:end] = audio_data
+        else:
+            # 버퍼 끝에서 나뉘는 경우 두 번에 나누어 복사
+            first = size - wr
+            self._ring[wr:] = audio_data[:first]
+            self._ring[:n - first] = audio_data[first:]
+
+        # 데이터 기록 후 인덱스 갱신 (GIL 하에서 정수 대입은 원자적)
+        self._ring_filled = min(size, self._ring_filled + n)
+        self._ring_write_pos = end % size
+        self._ring_total += n
+
+    def _read_ring_block(self, position: int, n: int) -> np.ndarray:
+        """누적 위치 position부터 n개 샘플을 float32로 읽기 (VAD 워커용)"""
+        size = len(self._ring)
+        start = position % size
+        block = np.empty(n, dtype=np.float32)
+        end = start + n
+        if end <= size:
+            np.multiply(self._ring[start:end], _INT16_TO_FLOAT, out=block)
+        else:
+            first = size - start
+            np.multiply(self._ring[start:], _INT16_TO_FLOAT, out=block[:first])
+            np.multiply(self._ring[:n - first], _INT16_TO_FLOAT, out=block[first:])
+        return block
+
+    def _segment_samples_for(self, duration_seconds: float) -> int:
+        """세그먼트 길이(초)에 해당하는 샘플 수 (청크 단위로 내림)"""
+        chunks_needed = int(duration_seconds * self.config.sample_rate / self.config.chunk_size)
+        return chunks_needed * self.config.chunk_size
+
+    def _ring_slices(self, duration_seconds: float,
+                     end_position: Optional[int] = None) -> Optional[Tuple[np.ndarray, ...]]:
+        """duration_seconds 구간의 int16 링 버퍼 뷰 (대부분 1개, 경계에 걸치면 2개)
+
+        end_position(누적 샘플 위치)이 주어지면 그 위치에서 끝나는 구간, 없으면 최신 구간.
+        """
+        if end_position is None:
+            # 쓰기 위치/유효 샘플 수 스냅샷
+            wr = self._ring_write_pos
+            filled = self._ring_filled
+        else:
+            # end_position 이후에 기록된 샘플은 구간에서 제외 (_read_ring_block과 같은 위치 → 인덱스 변환)
+            wr = end_position % len(self._ring)
+            filled = self._ring_filled - (self._ring_total - end_position)
+        if filled <= 0:
+            return None
+
+        # 필요한 샘플 수 (청크 단위) - 길이별로 한 번만 계산
+        samples_needed = self._segment_samples.get(duration_seconds)
+        if samples_needed is None:
+            samples_needed = self._segment_samples_for(duration_seconds)
+            self._segment_samples[duration_seconds] = samples_needed
+        samples = min(samples_needed, filled)
+
+        if samples == 0:
+            return None
+
+        start = wr - samples
+        if start >= 0:
+            return (self._ring[start:wr],)
+        return (self._ring[start:], self._ring[:wr])
+
+    def _copy_ring_slices(self, parts: Tuple[np.ndarray, ...], segment: np.ndarray) -> np.ndarray:
+        """링 버퍼 뷰들을 float32로 변환하며 segment에 이어서 복사"""
+        offset = 0
+        for part in parts:
+            np.multiply(part, _INT16_TO_FLOAT, out=segment[offset:offset + len(part)])
+            offset += len(part)
+        return segment
+
+    def get_audio_segment(self, duration_seconds: float = 3.0) -> Optional[np.ndarray]:
+        """지정된 길이의 오디오 세그먼트 반환"""
+        parts = self._ring_slices(duration_seconds)
+        if parts is None:
+            return None
+
+        # 최신 샘플들을 float32로 변환하며 복사
+        segment = np.empty(sum(len(part) for part in parts), dtype=np.float32)
+        return self._copy_ring_slices(parts, segment)
+
+    def _acquire_segment(self, duration_seconds: float = 3.0,
+                         end_position: Optional[int] = None) -> Optional[np.ndarray]:
+        """콜백 전달용 세그먼트 - 버퍼 풀 슬롯에 기록 (풀이 비어 있으면 새로 할당)"""
+        parts = self._ring_slices(duration_seconds, end_position)
+        if parts is None:
+            return None
+
+        n = sum(len(part) for part in parts)
+        segment = self.segment_pool.acquire(n)
+        if segment is None:
+            segment = np.empty(n, dtype=np.float32)
+        return self._copy_ring_slices(parts, segment)
+
+    def release_segment(self, audio_segment: np.ndarray):
+        """콜백으로 전달된 세그먼트 사용 완료 - 버퍼를 풀에 반환"""
+        self.segment_pool.release(audio_segment)
+    
+    def audio_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio 콜백 함수 - 링 버퍼 기록과 알림만 수행 (VAD는 별도 워커에서 처리)"""
+        try:
+            # 바이트 데이터를 numpy 배열로 변환 (int16)
+            samples = np.frombuffer(in_data, dtype=np.int16)
+            
+            # 스테레오를 모노로 변환 (필요시) - 좌/우 뷰를 한 번에 합산해 재사용 버퍼에 기록
+            if len(samples) == frame_count * 2:
+                if self._downmix_buf is None or len(self._downmix_buf) != frame_count:
+                    self._downmix_buf = np.empty(frame_count, dtype=np.int32)
+                mono = self._downmix_buf
+                np.add(samples[0::2], samples[1::2], out=mono, dtype=np.int32)
+                np.right_shift(mono, 1, out=mono)  # (L + R) / 2
+                samples = mono
+
+            # 버퍼에 추가 (int16 그대로 저장)
+            self._write_ring(samples)
+            self._vad_ready.set()
+                            
+        except Exception as e:
+            self.logger.error(f"Audio callback error: {e}")
+            
+        return (in_data, pyaudio.paContinue)
+
+    def _vad_worker(self):
+        """VAD 워커 - 링 버퍼에 쌓인 청크를 순서대로 음성 감지 처리"""
+        self.logger.info("VAD worker started")
+        # 오디오 콜백 스레드는 PortAudio 소유이므로, 직접 관리하는 VAD 워커만 실시간 설정
+        mmcss_handle = None
+        if self.config.realtime_vad_thread:
+            mmcss_handle = _enter_realtime_thread(self.logger, self.config.vad_thread_cpu)
+        chunk_size = self.config.chunk_size
+        processed = self._ring_total
+
+        while self.is_recording:
+            if not self._vad_ready.wait(timeout=0.5):
+                continue
+            self._vad_ready.clear()
+
+            total = self._ring_total
+            # 링 버퍼 크기 이상 밀린 경우 덮어써진 구간은 건너뜀
+            if total - processed > len(self._ring):
+                processed = total - len(self._ring)
+
+            while self.is_recording and total - processed >= chunk_size:
+                audio_data = self._read_ring_block(processed, chunk_size)
+                processed += chunk_size
+                try:
+                    self._process_chunk(audio_data, processed)
+                except Exception as e:
+                    self.logger.error(f"VAD worker error: {e}")
+
+        _leave_realtime_thread(mmcss_handle)
+        self.logger.info("VAD worker stopped")
+
+    def _process_chunk(self, audio_data: np.ndarray, frame_position: int):
+        """청크 하나에 대한 음성 활동 감지 및 발화 상태 갱신 (frame_position: 청크 끝의 누적 샘플 위치)"""
+        # 음성 활동 감지
+        has_speech = self.detect_voice_activity(audio_data)
+        
+        # 음성 감지 상태 업데이트
+        if has_speech:
+            self.last_speech_frame = frame_position
+
+            # 음성 시작 감지
+            if not self.is_speaking:
+                self.is_speaking = True
+                self.speech_start_frame = frame_position
+                self.silence_start_frame = None
+                if self._debug_enabled:
+                    self.logger.debug("Speech started")
+        else:
+            # 침묵 감지
+            if self.is_speaking:
+                if self.silence_start_frame is None:
+                    self.silence_start_frame = frame_position
+
+                # 충분히 긴 침묵이 지속되면 음성 종료로 판단
+                silence_frames = frame_position - self.silence_start_frame
+                if silence_frames >= self._max_silence_frames:
+                    # 최소 음성 지속 시간 체크
+                    if frame_position - self.speech_start_frame >= self._min_speech_frames:
+                        self.is_speaking = False
+                        self.silence_start_frame = None
+                        if self._debug_enabled:
+                            silence_duration = silence_frames / self.config.sample_rate
+                            self.logger.debug(f"Speech ended after {silence_duration:.1f}s silence")
+
+                        # 음성 종료 콜백 호출
+                        if self.on_speech_ended:
+                            # 캡처 헤드가 아니라 발화 종료로 판단한 청크 위치에서 끝나는 오디오
+                            # (VAD 워커가 밀려 있어도 해당 발화 구간을 전달)
+                            audio_segment = self._acquire_segment(end_position=frame_position)
+                            if audio_segment is not None:
+                                self._dispatch_callback(self.on_speech_ended, audio_segment)
+    
+    def _dispatch_callback(self, callback: Callable, audio_segment: np.ndarray):
+        """콜백을 전달 스레드에서 실행하도록 큐에 추가 (VAD/연속 처리 워커를 막지 않음)"""
+        if not self.is_recording:
+            self.release_segment(audio_segment)
+            return
+        self._dispatch_queue.put((callback, audio_segment))
+
+    def _dispatch_worker(self):
+        """콜백 전달 워커 - 큐의 세그먼트를 순서대로 콜백에 전달"""
+        while True:
+            item = self._dispatch_queue.get()
+            if item is None:  # 종료 신호
+                break
+
+            callback, audio_segment = item
+            try:
+                callback(audio_segment)
+            except Exception as e:
+                # 콜백이 예외 전에 세그먼트를 넘겼을 수 있으므로 여기서 반환하지 않음
+                # (소비자가 나중에 반환하면 그 사이 재사용된 슬롯을 두 번 내주게 됨)
+                self.logger.error(f"Audio callback handler error: {e}")
+
+        # 남은 세그먼트 정리
+        while True:
+            try:
+                item = self._dispatch_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self.release_segment(item[1])
+
+    def start_capture(self):
+        """오디오 캡처 시작"""
+        if self.is_recording:
+            self.logger.warning("Already recording")
+            return
+            
+        try:
+            device_index = self.get_default_speaker_device()
+            
+            # 오디오 스트림 설정
+            self.stream = self.pyaudio.open(
+                format=self.config.format,
+                channels=self.config.channels,
+                rate=self.config.sample_rate,
+                input=True,
+                input_device_index=device_index,
+                frames_per_buffer=self.config.chunk_size,
+                stream_callback=self.audio_callback,
+                start=False
+            )
+            
+            self.is_recording = True
+            self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+
+            # 콜백 전달 워커 시작
+            self.dispatch_thread = threading.Thread(
+                target=self._dispatch_worker,
+                name="AudioDispatchWorker",
+                daemon=True
+            )
+            self.dispatch_thread.start()
+
+            # VAD 워커 시작 (오디오 콜백 스레드와 분리)
+            self._vad_ready.clear()
+            self.processing_thread = threading.Thread(
+                target=self._vad_worker,
+                name="VADWorker",
+                daemon=True
+            )
+            self.processing_thread.start()
+
+            self.stream.start_stream()
+
+            # 연속 처리 워커 시작
+            if self.continuous_mode:
+                self._continuous_wakeup.clear()
+                self.continuous_thread = threading.Thread(
+                    target=self._continuous_processing_worker,
+                    daemon=True
+                )
+                self.continuous_thread.start()
+
+            self.logger.info(f"Audio capture started (device: {device_index}, continuous mode: {self.continuous_mode})")
+
+        except Exception as e:
+            self.logger.error(f"Failed to start audio capture: {e}")
+            raise
+    
+    def stop_capture(self):
+        """오디오 캡처 중지"""
+        if not self.is_recording:
+            return
+            
+        try:
+            self.is_recording = False
+            self._continuous_wakeup.set()  # 대기 중인 연속 처리 워커 종료
+            self._vad_ready.set()  # 대기 중인 VAD 워커 종료
+            if hasattr(self, 'stream'):
+                self.stream.stop_stream()
+                self.stream.close()
+            self._dispatch_queue.put(None)  # 콜백 전달 워커 종료
+            self.logger.info("Audio capture stopped")
+            
+        except Exception as e:
+            self.logger.error(f"Error stopping audio capture: {e}")
+    
+    def save_audio_buffer_to_file(self, filename: str, duration: float = 3.0):
+        """현재 오디오 버퍼를 WAV 파일로 저장 (디버깅용)"""
+        # 링 버퍼의 int16 PCM을 그대로 기록 (float32 변환/재변환 없음)
+        parts = self._ring_slices(duration)
+        if parts is None:
+            self.logger.warning("No audio data to save")
+            return
+        
+        with wave.open(filename, 'w') as wf:
+            wf.setnchannels(1)  # 링 버퍼는 항상 모노
+            wf.setsampwidth(2)  # 16-bit
+            wf.setframerate(self.config.sample_rate)
+            for part in parts:
+                wf.writeframes(part.tobytes())
+            
+        self.logger.info(f"Audio saved to {filename}")
+
+    def _continuous_processing_worker(self):
+        """연속 처리 워커 - 배경음악이나 긴 발화 처리용"""
+        self.logger.info("Continuous processing worker started")
+
+        while self.is_recording:
+            try:
+                current_time = time.monotonic()
+
+                # 다음 처리 시점까지 정확히 대기 (stop_capture 시 즉시 깨어남)
+                remaining = self.processing_interval - (current_time - self.last_processing_time)
+                if remaining > 0:
+                    self._continuous_wakeup.wait(remaining)
+                    continue
+
+                # 최근 오디오 세그먼트 가져오기
+                audio_segment = None
+                if self.on_continuous_audio:
+                    audio_segment = self._acquire_segment(duration_seconds=3.0)
+
+                if audio_segment is not None:
+                    # 연속 처리 콜백 호출
+                    self._dispatch_callback(self.on_continuous_audio, audio_segment)
+
+                    self.last_processing_time = current_time
+                    if self._debug_enabled:
+                        self.logger.debug("Continuous processing triggered")
+                else:
+                    # 아직 처리할 오디오가 없으면 잠시 후 재시도
+                    self._continuous_wakeup.wait(self.processing_retry_interval)
+
+            except Exception as e:
+                self.logger.error(f"Continuous processing worker error: {e}")
+                self._continuous_wakeup.wait(1.0)
+
+        self.logger.info("Continuous processing worker stopped")
+
+    def __del__(self):
+        """소멸자"""
+        self.stop_capture()
+        if hasattr(self, 'pyaudio'):
+            self.pyaudio.terminate()
+
+# 테스트 코드
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    def on_speech_callback(audio_data):
+        print(f"Speech detected! Audio length: {len(audio_data)/16000:.2f}s")
+    
+    capture = ChromeAudioCapture()
+    capture.on_speech_ended = on_speech_callback
+    
+    print("Starting audio capture... Speak something!")
+    capture.start_capture()
+    
+    try:
+        # 30초간 테스트
+        time.sleep(30)
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        capture.stop_capture()
         print("Audio capture test completed.")
\ No newline at end of file
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+pytest 공용 설정
+torch/whisper/transformers/pyaudio가 설치되지 않은 환경에서도 파이프라인 로직을 검증할 수 있도록
+누락된 모듈만 최소 대체 모듈로 등록 (설치되어 있으면 실제 모듈 사용)
+"""
+
+import contextlib
+import importlib
+import sys
+import types
+
+
+def _stub_if_missing(name: str, **attrs):
+    """모듈을 import할 수 없으면 attrs를 가진 대체 모듈 등록"""
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        module = types.ModuleType(name)
+        module.__dict__.update(attrs)
+        sys.modules[name] = module
+
+
+class _StubPyAudio:
+    """테스트에서 장치를 열지 않는 PyAudio 대체"""
+
+    def terminate(self):
+        pass
+
+
+class _StubStoppingCriteria:
+    pass
+
+
+class _StubStoppingCriteriaList(list):
+    pass
+
+
+_stub_if_missing(
+    "torch",
+    cuda=types.SimpleNamespace(is_available=lambda: False, is_bf16_supported=lambda: False),
+    Tensor=object, LongTensor=object, FloatTensor=object,
+    float32="float32", float16="float16", bfloat16="bfloat16",
+    inference_mode=contextlib.nullcontext, no_grad=contextlib.nullcontext,
+)
+_stub_if_missing("whisper")
+_stub_if_missing(
+    "transformers",
+    AutoTokenizer=object, AutoModelForCausalLM=object, BitsAndBytesConfig=object,
+    StoppingCriteria=_StubStoppingCriteria, StoppingCriteriaList=_StubStoppingCriteriaList,
+)
+_stub_if_missing("pyaudio", paInt16=8, paContinue=0, PyAudio=_StubPyAudio)
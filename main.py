@@ -124,6 +124,9 @@ class ChromeRealtimeTranslator:
                 self.stt = RealtimeSTT(stt_config)
                 self.stt.on_transcription = self._on_transcription
                 self.stt.on_error = self._on_stt_error
+                if self.audio_capture:
+                    # 전사가 끝난 오디오 버퍼를 캡처 버퍼 풀에 반환
+                    self.stt.on_audio_consumed = self.audio_capture.release_segment
                 self.logger.info("STT initialized")
 
             # 번역기 초기화
@@ -214,6 +217,8 @@ class ChromeRealtimeTranslator:
             except Exception as e:
                 self.logger.error(f"Failed to process audio: {e}")
                 self.stats['errors'] += 1
+        else:
+            self.audio_capture.release_segment(audio_data)
 
     def _on_transcription(self, text: str):
         """STT 결과 처리"""
@@ -256,6 +261,8 @@ class ChromeRealtimeTranslator:
             except Exception as e:
                 self.logger.error(f"Failed to process continuous audio: {e}")
                 self.stats['errors'] += 1
+        else:
+            self.audio_capture.release_segment(audio_data)
 
     def _on_stt_error(self, error: str):
         """STT 오류 처리"""
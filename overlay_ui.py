@@ -1,912 +1,1145 @@
-#!/usr/bin/env python3
-"""
-투명 오버레이 UI 모듈
-실시간 자막을 화면에 반투명 오버레이로 표시
-"""
-
-import tkinter as tk
-from tkinter import ttk, font, messagebox
-import threading
-import queue
-import time
-from typing import Optional, Dict, Any
-import json
-from pathlib import Path
-import sys
-
-# Windows에서만 사용가능한 모듈들
-try:
-    import win32gui
-    import win32con
-    WINDOWS_AVAILABLE = True
-except ImportError:
-    WINDOWS_AVAILABLE = False
-
-class OverlayConfig:
-    """오버레이 UI 설정"""
-    def __init__(self):
-        # 기본 위치 및 크기
-        self.window_width = 800
-        self.window_height = 200
-        self.x_position = 100
-        self.y_position = 100
-        
-        # 투명도 및 외관
-        self.alpha = 0.8  # 투명도 (0.0 ~ 1.0)
-        self.bg_color = "#000000"  # 배경색
-        self.original_text_color = "#FFFFFF"  # 원문 색상
-        self.translated_text_color = "#00FF00"  # 번역문 색상
-        
-        # 폰트 설정
-        self.font_family = "맑은 고딕"
-        self.original_font_size = 14
-        self.translated_font_size = 16
-        self.font_weight = "normal"  # "normal" or "bold"
-        
-        # 동작 설정
-        self.always_on_top = True
-        self.click_through = False  # 클릭 투과 여부
-        self.auto_hide_enabled = True  # 자동 숨김 활성화 여부
-        self.auto_hide_delay = 10.0  # 자동 숨김 지연 (초) - 증가
-        self.fade_duration = 0.5  # 페이드 애니메이션 시간
-        self.resizable = True  # 윈도우 크기 조절 가능 여부
-        self.subtitle_alpha = 1.0  # 자막 투명도 (별도 조절)
-
-        # 가사 스타일 스크롤 설정
-        self.lyrics_style = True  # 위로 밀리는 가사 스타일 활성화
-        self.max_history_lines = 5  # 표시할 최대 이력 줄 수
-        self.scroll_animation_speed = 300  # 스크롤 애니메이션 속도 (ms)
-        
-        # 텍스트 표시 설정
-        self.show_original = True
-        self.show_translated = True
-        self.max_line_length = 80
-        self.max_lines = 3
-        
-        # 설정 파일
-        self.config_file = Path("overlay_config.json")
-    
-    def save(self):
-        """설정을 파일로 저장"""
-        config_dict = {
-            "window_width": self.window_width,
-            "window_height": self.window_height,
-            "x_position": self.x_position,
-            "y_position": self.y_position,
-            "alpha": self.alpha,
-            "bg_color": self.bg_color,
-            "original_text_color": self.original_text_color,
-            "translated_text_color": self.translated_text_color,
-            "font_family": self.font_family,
-            "original_font_size": self.original_font_size,
-            "translated_font_size": self.translated_font_size,
-            "font_weight": self.font_weight,
-            "always_on_top": self.always_on_top,
-            "click_through": self.click_through,
-            "auto_hide_delay": self.auto_hide_delay,
-            "show_original": self.show_original,
-            "show_translated": self.show_translated,
-            "lyrics_style": self.lyrics_style,
-            "max_history_lines": self.max_history_lines,
-            "scroll_animation_speed": self.scroll_animation_speed,
-            "auto_hide_enabled": self.auto_hide_enabled,
-            "resizable": self.resizable,
-            "subtitle_alpha": self.subtitle_alpha,
-        }
-        
-        try:
-            self.config_file.write_text(
-                json.dumps(config_dict, indent=2, ensure_ascii=False),
-                encoding='utf-8'
-            )
-        except Exception:
-            pass
-    
-    def load(self):
-        """파일에서 설정 로드"""
-        if not self.config_file.exists():
-            return
-        
-        try:
-            config_dict = json.loads(self.config_file.read_text(encoding='utf-8'))
-            for key, value in config_dict.items():
-                if hasattr(self, key):
-                    setattr(self, key, value)
-        except Exception:
-            pass
-
-class TransparentOverlay:
-    """투명 오버레이 UI"""
-    
-    def __init__(self, config: Optional[OverlayConfig] = None):
-        self.config = config or OverlayConfig()
-        self.config.load()
-        
-        # UI 요소
-        self.root: Optional[tk.Tk] = None
-        self.original_label: Optional[tk.Label] = None
-        self.translated_label: Optional[tk.Label] = None
-        self.settings_window: Optional[tk.Toplevel] = None
-        
-        # 상태 관리
-        self.is_visible = True
-        self.current_original = ""
-        self.current_translated = ""
-        self.last_update_time = time.time()
-
-        # 가사 스타일을 위한 이력 관리
-        self.translation_history = []  # (original, translated) 튜플 리스트
-        self.history_labels = []  # 이력 표시용 라벨들
-        
-        # 자동 숨김 타이머
-        self.hide_timer: Optional[threading.Timer] = None
-        
-        # 업데이트 큐 (스레드 안전)
-        self.update_queue = queue.Queue()
-        
-        # 드래그 관련
-        self.drag_start_x = 0
-        self.drag_start_y = 0
-        self.is_dragging = False
-    
-    def create_ui(self):
-        """UI 생성"""
-        self.root = tk.Tk()
-        self.root.title("Real-time Translation Overlay")
-        
-        # 윈도우 설정
-        self.root.geometry(f"{self.config.window_width}x{self.config.window_height}+"
-                          f"{self.config.x_position}+{self.config.y_position}")
-        self.root.configure(bg=self.config.bg_color)
-        
-        # 투명도 설정
-        self.root.wm_attributes('-alpha', self.config.alpha)
-        
-        # 항상 최상위
-        if self.config.always_on_top:
-            self.root.wm_attributes('-topmost', True)
-        
-        # 윈도우 경계 설정 (크기 조절 가능하도록)
-        if self.config.resizable:
-            self.root.overrideredirect(False)
-            self.root.resizable(True, True)
-            # 타이틀바는 숨기고 경계만 표시하도록 설정
-            try:
-                self.root.wm_attributes('-toolwindow', True)
-            except:
-                pass
-        else:
-            self.root.overrideredirect(True)
-        
-        # Windows 클릭 투과 설정
-        if WINDOWS_AVAILABLE and self.config.click_through:
-            self._setup_click_through()
-        
-        # 폰트 설정
-        original_font = font.Font(
-            family=self.config.font_family,
-            size=self.config.original_font_size,
-            weight=self.config.font_weight
-        )
-
-        translated_font = font.Font(
-            family=self.config.font_family,
-            size=self.config.translated_font_size,
-            weight="bold"
-        )
-
-        # 자막 투명도 적용된 색상 계산
-        original_color = self._blend_color_alpha(self.config.original_text_color, self.config.subtitle_alpha)
-        translated_color = self._blend_color_alpha(self.config.translated_text_color, self.config.subtitle_alpha)
-        
-        # 메인 프레임 (스크롤 가능하도록 Canvas 사용)
-        if self.config.lyrics_style:
-            # 가사 스타일: Canvas로 스크롤 구현
-            self.canvas = tk.Canvas(self.root, bg=self.config.bg_color, highlightthickness=0)
-            self.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-
-            main_frame = tk.Frame(self.canvas, bg=self.config.bg_color)
-            # Canvas 중앙에 프레임 배치
-            self.canvas_window = self.canvas.create_window(
-                self.config.window_width // 2, 0,
-                anchor="n", window=main_frame
-            )
-        else:
-            # 기본 스타일
-            main_frame = tk.Frame(self.root, bg=self.config.bg_color)
-            main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        # 가사 스타일 vs 기본 스타일 구분
-        if self.config.lyrics_style:
-            self._create_lyrics_style_ui(main_frame, original_font, translated_font)
-        else:
-            self._create_default_style_ui(main_frame, original_font, translated_font)
-        
-        # 마우스 이벤트 바인딩 (드래그 이동)
-        if not self.config.click_through:
-            self._setup_drag_events()
-        
-        # 키보드 이벤트 바인딩
-        self.root.bind('<Escape>', self._on_escape)
-        self.root.bind('<F1>', self._show_settings)
-        self.root.focus_set()
-        
-        # 업데이트 체크 타이머
-        self.root.after(100, self._check_updates)
-
-        # Canvas 크기 조정 바인딩 (가사 스타일인 경우)
-        if self.config.lyrics_style and hasattr(self, 'canvas'):
-            self.root.bind('<Configure>', self._on_window_resize)
-    
-    def _setup_click_through(self):
-        """Windows 클릭 투과 설정"""
-        if not WINDOWS_AVAILABLE:
-            return
-        
-        def setup():
-            try:
-                hwnd = self.root.winfo_id()
-                # WS_EX_TRANSPARENT: 클릭 투과
-                # WS_EX_LAYERED: 투명도 적용을 위해 필요
-                extended_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
-                win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE,
-                                     extended_style | win32con.WS_EX_LAYERED | win32con.WS_EX_TRANSPARENT)
-            except Exception:
-                pass
-        
-        # 윈도우가 완전히 생성된 후 설정
-        self.root.after(100, setup)
-    
-    def _create_lyrics_style_ui(self, parent, original_font, translated_font):
-        """가사 스타일 UI 생성"""
-        # 자막 투명도 적용된 색상 계산
-        original_color = self._blend_color_alpha(self.config.original_text_color, self.config.subtitle_alpha)
-        translated_color = self._blend_color_alpha(self.config.translated_text_color, self.config.subtitle_alpha)
-        # 현재 번역 표시용 (맨 아래)
-        if self.config.show_translated:
-            self.translated_label = tk.Label(
-                parent,
-                text="실시간 번역을 기다리는 중...",
-                font=translated_font,
-                fg=translated_color,
-                bg=self.config.bg_color,
-                justify=tk.CENTER,
-                wraplength=self.config.window_width - 20,
-                anchor=tk.CENTER
-            )
-            self.translated_label.pack(side=tk.BOTTOM, pady=(2, 5))
-
-        # 현재 원문 표시용 (번역문 위)
-        if self.config.show_original:
-            self.original_label = tk.Label(
-                parent,
-                text="",
-                font=original_font,
-                fg=original_color,
-                bg=self.config.bg_color,
-                justify=tk.CENTER,
-                wraplength=self.config.window_width - 20,
-                anchor=tk.CENTER
-            )
-            self.original_label.pack(side=tk.BOTTOM, pady=(5, 2))
-
-        # 이력 표시용 프레임 (맨 위)
-        self.history_frame = tk.Frame(parent, bg=self.config.bg_color)
-        self.history_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, pady=5)
-
-    def _create_default_style_ui(self, parent, original_font, translated_font):
-        """기본 스타일 UI 생성"""
-        # 자막 투명도 적용된 색상 계산
-        original_color = self._blend_color_alpha(self.config.original_text_color, self.config.subtitle_alpha)
-        translated_color = self._blend_color_alpha(self.config.translated_text_color, self.config.subtitle_alpha)
-        # 원문 라벨
-        if self.config.show_original:
-            self.original_label = tk.Label(
-                parent,
-                text="",
-                font=original_font,
-                fg=original_color,
-                bg=self.config.bg_color,
-                justify=tk.CENTER,
-                wraplength=self.config.window_width - 20,
-                anchor=tk.CENTER
-            )
-            self.original_label.pack(pady=(5, 2))
-
-        # 번역문 라벨
-        if self.config.show_translated:
-            self.translated_label = tk.Label(
-                parent,
-                text="실시간 번역을 기다리는 중...",
-                font=translated_font,
-                fg=translated_color,
-                bg=self.config.bg_color,
-                justify=tk.CENTER,
-                wraplength=self.config.window_width - 20,
-                anchor=tk.CENTER
-            )
-            self.translated_label.pack(pady=(2, 5))
-
-    def _on_window_resize(self, event):
-        """윈도우 크기 변경 시 Canvas 업데이트"""
-        if hasattr(self, 'canvas') and event.widget == self.root:
-            canvas_width = event.width - 20  # 패딩 고려
-            canvas_height = event.height - 10  # 패딩 고려
-            self.canvas.configure(width=canvas_width, height=canvas_height)
-            # Canvas 중앙에 프레임 위치 업데이트
-            self.canvas.coords(self.canvas_window, canvas_width // 2, 0)
-
-    def _setup_drag_events(self):
-        """드래그 이벤트 설정"""
-        def start_drag(event):
-            self.is_dragging = True
-            self.drag_start_x = event.x
-            self.drag_start_y = event.y
-        
-        def on_drag(event):
-            if self.is_dragging:
-                x = self.root.winfo_x() + (event.x - self.drag_start_x)
-                y = self.root.winfo_y() + (event.y - self.drag_start_y)
-                self.root.geometry(f"+{x}+{y}")
-                
-                # 설정 업데이트
-                self.config.x_position = x
-                self.config.y_position = y
-        
-        def end_drag(event):
-            self.is_dragging = False
-            self.config.save()  # 위치 저장
-        
-        # 모든 위젯에 드래그 이벤트 바인딩
-        widgets = [self.root]
-        if self.original_label:
-            widgets.append(self.original_label)
-        if self.translated_label:
-            widgets.append(self.translated_label)
-        
-        for widget in widgets:
-            widget.bind('<Button-1>', start_drag)
-            widget.bind('<B1-Motion>', on_drag)
-            widget.bind('<ButtonRelease-1>', end_drag)
-    
-    def _check_updates(self):
-        """업데이트 큐 확인 및 UI 업데이트"""
-        try:
-            while True:
-                update = self.update_queue.get_nowait()
-                if update['type'] == 'subtitle':
-                    self._update_subtitle_display(update['original'], update['translated'])
-                elif update['type'] == 'hide':
-                    self._hide_overlay()
-                elif update['type'] == 'show':
-                    self._show_overlay()
-        except queue.Empty:
-            pass
-        
-        # 자동 숨김 체크
-        if (self.config.auto_hide_enabled and self.config.auto_hide_delay > 0 and
-            time.time() - self.last_update_time > self.config.auto_hide_delay):
-            if self.is_visible:
-                self._hide_overlay()
-        
-        # 다음 업데이트 스케줄
-        if self.root:
-            self.root.after(100, self._check_updates)
-    
-    def _update_subtitle_display(self, original: str, translated: str):
-        """자막 표시 업데이트"""
-        self.current_original = original
-        self.current_translated = translated
-        self.last_update_time = time.time()
-
-        # 오버레이 표시
-        if not self.is_visible:
-            self._show_overlay()
-
-        # 텍스트 길이 제한
-        if len(original) > self.config.max_line_length:
-            original = original[:self.config.max_line_length] + "..."
-        if len(translated) > self.config.max_line_length:
-            translated = translated[:self.config.max_line_length] + "..."
-
-        if self.config.lyrics_style:
-            self._update_lyrics_style(original, translated)
-        else:
-            self._update_default_style(original, translated)
-
-        # 자동 숨김 타이머 재설정
-        if self.hide_timer:
-            self.hide_timer.cancel()
-
-        if self.config.auto_hide_enabled and self.config.auto_hide_delay > 0:
-            self.hide_timer = threading.Timer(
-                self.config.auto_hide_delay,
-                lambda: self.update_queue.put({'type': 'hide'})
-            )
-            self.hide_timer.start()
-
-    def _update_default_style(self, original: str, translated: str):
-        """기본 스타일 업데이트"""
-        # 라벨 업데이트
-        if self.original_label and self.config.show_original:
-            self.original_label.config(text=original)
-
-        if self.translated_label and self.config.show_translated:
-            self.translated_label.config(text=translated)
-
-    def _update_lyrics_style(self, original: str, translated: str):
-        """가사 스타일 업데이트 (위로 밀려 올라감)"""
-        # 현재 번역을 이력에 추가
-        if self.current_translated and self.current_translated != "실시간 번역을 기다리는 중...":
-            self.translation_history.append((self.current_original, self.current_translated))
-
-            # 최대 이력 수 제한
-            if len(self.translation_history) > self.config.max_history_lines:
-                self.translation_history.pop(0)
-
-        # 현재 라벨 업데이트
-        if self.original_label and self.config.show_original:
-            self.original_label.config(text=original)
-
-        if self.translated_label and self.config.show_translated:
-            self.translated_label.config(text=translated)
-
-        # 이력 라벨들 업데이트
-        self._update_history_labels()
-    
-    def _show_overlay(self):
-        """오버레이 표시"""
-        if self.is_visible:
-            return
-        
-        self.is_visible = True
-        if self.root:
-            self.root.deiconify()
-    
-    def _hide_overlay(self):
-        """오버레이 숨김"""
-        if not self.is_visible:
-            return
-        
-        self.is_visible = False
-        if self.root:
-            self.root.withdraw()
-    
-    def _on_escape(self, event):
-        """ESC 키 처리"""
-        if self.settings_window and self.settings_window.winfo_exists():
-            self.settings_window.destroy()
-        else:
-            self.close()
-    
-    def _show_settings(self, event):
-        """설정 창 표시 (F1)"""
-        if self.settings_window and self.settings_window.winfo_exists():
-            self.settings_window.lift()
-            return
-        
-        self.settings_window = tk.Toplevel(self.root)
-        self.settings_window.title("오버레이 설정")
-        self.settings_window.geometry("400x500")
-        self.settings_window.resizable(False, False)
-        
-        # 설정 UI 생성
-        self._create_settings_ui()
-    
-    def _create_settings_ui(self):
-        """설정 UI 생성"""
-        if not self.settings_window:
-            return
-        
-        notebook = ttk.Notebook(self.settings_window)
-        notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # 외관 탭
-        appearance_frame = ttk.Frame(notebook)
-        notebook.add(appearance_frame, text="외관")
-
-        # 동작 탭
-        behavior_frame = ttk.Frame(notebook)
-        notebook.add(behavior_frame, text="동작")
-
-        # 크기 조절 탭
-        size_frame = ttk.Frame(notebook)
-        notebook.add(size_frame, text="크기")
-
-        # 윈도우 탭
-        window_frame = ttk.Frame(notebook)
-        notebook.add(window_frame, text="윈도우")
-
-        self._create_appearance_settings(appearance_frame)
-        self._create_behavior_settings(behavior_frame)
-        self._create_size_settings(size_frame)
-        self._create_window_settings(window_frame)
-
-    def _create_appearance_settings(self, parent):
-        """외관 설정 UI"""
-
-        # 창 투명도
-        ttk.Label(parent, text="창 투명도:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        alpha_var = tk.DoubleVar(value=self.config.alpha)
-        alpha_scale = ttk.Scale(parent, from_=0.1, to=1.0, variable=alpha_var,
-                               command=lambda v: self._update_alpha(float(v)))
-        alpha_scale.grid(row=0, column=1, columnspan=2, sticky=tk.EW, padx=5)
-
-        # 자막 투명도
-        ttk.Label(parent, text="자막 투명도:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        subtitle_alpha_var = tk.DoubleVar(value=self.config.subtitle_alpha)
-        subtitle_alpha_scale = ttk.Scale(parent, from_=0.1, to=1.0, variable=subtitle_alpha_var,
-                                        command=lambda v: self._update_subtitle_alpha(float(v)))
-        subtitle_alpha_scale.grid(row=1, column=1, columnspan=2, sticky=tk.EW, padx=5)
-
-        # 폰트 크기
-        ttk.Label(parent, text="번역문 폰트 크기:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        font_size_var = tk.IntVar(value=self.config.translated_font_size)
-        font_size_spinbox = ttk.Spinbox(parent, from_=8, to=72, textvariable=font_size_var,
-                                       command=lambda: self._update_font_size(font_size_var.get()))
-        font_size_spinbox.grid(row=2, column=1, sticky=tk.EW, padx=5)
-
-        # 원문 폰트 크기
-        ttk.Label(parent, text="원문 폰트 크기:").grid(row=3, column=0, sticky=tk.W, pady=5)
-        orig_font_size_var = tk.IntVar(value=self.config.original_font_size)
-        orig_font_size_spinbox = ttk.Spinbox(parent, from_=8, to=72, textvariable=orig_font_size_var,
-                                            command=lambda: self._update_original_font_size(orig_font_size_var.get()))
-        orig_font_size_spinbox.grid(row=3, column=1, sticky=tk.EW, padx=5)
-
-    def _create_behavior_settings(self, parent):
-        """동작 설정 UI"""
-        # 원문 표시 토글
-        show_original_var = tk.BooleanVar(value=self.config.show_original)
-        ttk.Checkbutton(parent, text="원문 표시", variable=show_original_var,
-                       command=lambda: self._toggle_original_display(show_original_var.get())).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=5)
-
-        # 가사 스타일 토글
-        lyrics_style_var = tk.BooleanVar(value=self.config.lyrics_style)
-        ttk.Checkbutton(parent, text="가사 스타일 (위로 스크롤)", variable=lyrics_style_var,
-                       command=lambda: self._toggle_lyrics_style(lyrics_style_var.get())).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=5)
-
-        # 자동 숨김 활성화
-        auto_hide_enabled_var = tk.BooleanVar(value=self.config.auto_hide_enabled)
-        ttk.Checkbutton(parent, text="자동 숨김 활성화", variable=auto_hide_enabled_var,
-                       command=lambda: self._toggle_auto_hide(auto_hide_enabled_var.get())).grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=5)
-
-        # 자동 숨김 시간
-        ttk.Label(parent, text="자동 숨김 시간 (초):").grid(row=3, column=0, sticky=tk.W, pady=5)
-        hide_delay_var = tk.DoubleVar(value=self.config.auto_hide_delay)
-        hide_delay_scale = ttk.Scale(parent, from_=3.0, to=20.0, variable=hide_delay_var,
-                                    command=lambda v: self._update_hide_delay(float(v)))
-        hide_delay_scale.grid(row=3, column=1, columnspan=2, sticky=tk.EW, padx=5)
-
-        # 이력 줄 수 (가사 스타일용)
-        ttk.Label(parent, text="이력 표시 줄 수:").grid(row=4, column=0, sticky=tk.W, pady=5)
-        history_lines_var = tk.IntVar(value=self.config.max_history_lines)
-        history_lines_spinbox = ttk.Spinbox(parent, from_=1, to=10, textvariable=history_lines_var,
-                                           command=lambda: self._update_history_lines(history_lines_var.get()))
-        history_lines_spinbox.grid(row=4, column=1, sticky=tk.EW, padx=5)
-
-    def _create_size_settings(self, parent):
-        """크기 설정 UI"""
-        # 윈도우 너비
-        ttk.Label(parent, text="오버레이 너비:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        width_var = tk.IntVar(value=self.config.window_width)
-        width_scale = ttk.Scale(parent, from_=400, to=1200, variable=width_var,
-                               command=lambda v: self._update_window_width(int(float(v))))
-        width_scale.grid(row=0, column=1, columnspan=2, sticky=tk.EW, padx=5)
-
-        # 윈도우 높이
-        ttk.Label(parent, text="오버레이 높이:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        height_var = tk.IntVar(value=self.config.window_height)
-        height_scale = ttk.Scale(parent, from_=100, to=600, variable=height_var,
-                                command=lambda v: self._update_window_height(int(float(v))))
-        height_scale.grid(row=1, column=1, columnspan=2, sticky=tk.EW, padx=5)
-        
-        # 버튼 프레임
-        button_frame = ttk.Frame(self.settings_window)
-        button_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        ttk.Button(button_frame, text="저장", command=self._save_settings).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="닫기", command=lambda: self.settings_window.destroy()).pack(side=tk.RIGHT, padx=5)
-
-    def _create_window_settings(self, parent):
-        """윈도우 설정 UI"""
-        # 크기 조절 가능 토글
-        resizable_var = tk.BooleanVar(value=self.config.resizable)
-        ttk.Checkbutton(parent, text="창 테두리로 크기 조절 가능", variable=resizable_var,
-                       command=lambda: self._toggle_resizable(resizable_var.get())).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=5)
-
-        # 클릭 투과 토글
-        click_through_var = tk.BooleanVar(value=self.config.click_through)
-        ttk.Checkbutton(parent, text="클릭 투과 모드", variable=click_through_var,
-                       command=lambda: self._toggle_click_through(click_through_var.get())).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=5)
-
-        # 항상 최상위 토글
-        always_on_top_var = tk.BooleanVar(value=self.config.always_on_top)
-        ttk.Checkbutton(parent, text="항상 최상위 표시", variable=always_on_top_var,
-                       command=lambda: self._toggle_always_on_top(always_on_top_var.get())).grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=5)
-    
-    def _update_alpha(self, value: float):
-        """창 투명도 실시간 업데이트"""
-        self.config.alpha = value
-        if self.root:
-            self.root.wm_attributes('-alpha', value)
-
-    def _update_subtitle_alpha(self, value: float):
-        """자막 투명도 실시간 업데이트"""
-        self.config.subtitle_alpha = value
-        # 모든 텍스트 라벨의 색상 업데이트
-        self._apply_subtitle_alpha()
-    
-    def _update_font_size(self, size: int):
-        """폰트 크기 실시간 업데이트"""
-        self.config.translated_font_size = size
-        if self.translated_label:
-            current_font = self.translated_label.cget("font")
-            new_font = font.Font(font=current_font)
-            new_font.config(size=size)
-            self.translated_label.config(font=new_font)
-
-    def _update_original_font_size(self, size: int):
-        """원문 폰트 크기 실시간 업데이트"""
-        self.config.original_font_size = size
-        if self.original_label:
-            current_font = self.original_label.cget("font")
-            new_font = font.Font(font=current_font)
-            new_font.config(size=size)
-            self.original_label.config(font=new_font)
-
-    def _toggle_original_display(self, show: bool):
-        """원문 표시 토글"""
-        self.config.show_original = show
-        if self.original_label:
-            if show:
-                self.original_label.pack()
-            else:
-                self.original_label.pack_forget()
-
-    def _toggle_lyrics_style(self, enable: bool):
-        """가사 스타일 토글 (재시작 필요)"""
-        self.config.lyrics_style = enable
-        # 설정 저장하고 재시작 안내
-        self.config.save()
-        if hasattr(self, 'settings_window') and self.settings_window:
-            tk.messagebox.showinfo("알림", "가사 스타일 변경은 오버레이를 재시작한 후 적용됩니다.")
-
-    def _toggle_auto_hide(self, enabled: bool):
-        """자동 숨김 기능 토글"""
-        self.config.auto_hide_enabled = enabled
-        if not enabled and self.hide_timer:
-            self.hide_timer.cancel()
-
-    def _update_hide_delay(self, delay: float):
-        """자동 숨김 시간 업데이트"""
-        self.config.auto_hide_delay = delay
-
-    def _update_history_lines(self, lines: int):
-        """이력 줄 수 업데이트"""
-        self.config.max_history_lines = lines
-        # 현재 이력이 새 제한을 초과하면 줄임
-        while len(self.translation_history) > lines:
-            self.translation_history.pop(0)
-        self._update_history_labels()
-
-    def _update_window_width(self, width: int):
-        """오버레이 너비 실시간 업데이트"""
-        self.config.window_width = width
-        if self.root:
-            current_geometry = self.root.geometry()
-            parts = current_geometry.split('+')
-            height = parts[0].split('x')[1]
-            x, y = parts[1], parts[2]
-            self.root.geometry(f"{width}x{height}+{x}+{y}")
-
-            # 텍스트 wraplength도 업데이트
-            wrap_length = width - 40  # 여유 공간 증가
-            if self.original_label:
-                self.original_label.config(wraplength=wrap_length)
-            if self.translated_label:
-                self.translated_label.config(wraplength=wrap_length)
-
-            # Canvas 윈도우 위치도 업데이트 (가사 스타일인 경우)
-            if self.config.lyrics_style and hasattr(self, 'canvas'):
-                self.canvas.coords(self.canvas_window, width // 2, 0)
-
-    def _update_window_height(self, height: int):
-        """오버레이 높이 실시간 업데이트"""
-        self.config.window_height = height
-        if self.root:
-            current_geometry = self.root.geometry()
-            parts = current_geometry.split('+')
-            width = parts[0].split('x')[0]
-            x, y = parts[1], parts[2]
-            self.root.geometry(f"{width}x{height}+{x}+{y}")
-
-    def _update_history_labels(self):
-        """가사 스타일을 위한 이력 라벨 업데이트"""
-        if not self.config.lyrics_style or not hasattr(self, 'history_frame'):
-            return
-
-        # 기존 이력 라벨들 제거
-        for label in self.history_labels:
-            label.destroy()
-        self.history_labels.clear()
-
-        # 새 이력 라벨들 생성 (오래된 것부터 위에, 투명도 점진적 감소)
-        for i, (orig, trans) in enumerate(self.translation_history):
-            # 투명도 계산 (오래된 것일수록 투명)
-            alpha_factor = (i + 1) / len(self.translation_history)
-            alpha_color = self._blend_color_alpha(self.config.translated_text_color, alpha_factor * 0.7 * self.config.subtitle_alpha)
-
-            # 이력 번역문 라벨
-            history_label = tk.Label(
-                self.history_frame,
-                text=trans,
-                font=(self.config.font_family, max(8, self.config.translated_font_size - 4)),
-                fg=alpha_color,
-                bg=self.config.bg_color,
-                justify=tk.CENTER,
-                wraplength=self.config.window_width - 40,
-                anchor=tk.CENTER
-            )
-            history_label.pack(side=tk.TOP, pady=1, fill=tk.X)
-            self.history_labels.append(history_label)
-
-            # 원문도 표시하는 경우
-            if self.config.show_original and orig:
-                orig_alpha_color = self._blend_color_alpha(self.config.original_text_color, alpha_factor * 0.5 * self.config.subtitle_alpha)
-                orig_history_label = tk.Label(
-                    self.history_frame,
-                    text=orig,
-                    font=(self.config.font_family, max(6, self.config.original_font_size - 6)),
-                    fg=orig_alpha_color,
-                    bg=self.config.bg_color,
-                    justify=tk.CENTER,
-                    wraplength=self.config.window_width - 40,
-                    anchor=tk.CENTER
-                )
-                orig_history_label.pack(side=tk.TOP, pady=(0, 3), fill=tk.X)
-                self.history_labels.append(orig_history_label)
-
-    def _blend_color_alpha(self, color: str, alpha: float) -> str:
-        """색상에 투명도 적용 (어두운 배경 기준)"""
-        if color.startswith('#'):
-            # RGB 값 추출
-            r = int(color[1:3], 16)
-            g = int(color[3:5], 16)
-            b = int(color[5:7], 16)
-
-            # 알파 적용 (검은 배경과 블렌딩)
-            r = int(r * alpha)
-            g = int(g * alpha)
-            b = int(b * alpha)
-
-            return f"#{r:02x}{g:02x}{b:02x}"
-        return color
-
-    def _apply_subtitle_alpha(self):
-        """모든 자막 요소에 투명도 적용"""
-        # 현재 라벨들에 자막 투명도 적용
-        if self.original_label:
-            original_color = self._blend_color_alpha(self.config.original_text_color, self.config.subtitle_alpha)
-            self.original_label.config(fg=original_color)
-
-        if self.translated_label:
-            translated_color = self._blend_color_alpha(self.config.translated_text_color, self.config.subtitle_alpha)
-            self.translated_label.config(fg=translated_color)
-
-        # 히스토리 라벨들도 업데이트 (가사 스타일인 경우)
-        if hasattr(self, 'history_labels'):
-            for i, label in enumerate(self.history_labels):
-                if i % 2 == 0:  # 번역문 라벨
-                    color = self._blend_color_alpha(self.config.translated_text_color,
-                                                  self.config.subtitle_alpha * 0.7 * ((i//2 + 1) / max(1, len(self.history_labels)//2)))
-                else:  # 원문 라벨
-                    color = self._blend_color_alpha(self.config.original_text_color,
-                                                  self.config.subtitle_alpha * 0.5 * ((i//2 + 1) / max(1, len(self.history_labels)//2)))
-                label.config(fg=color)
-
-    def _toggle_resizable(self, enabled: bool):
-        """크기 조절 가능 토글 (재시작 필요)"""
-        self.config.resizable = enabled
-        self.config.save()
-        if hasattr(self, 'settings_window') and self.settings_window:
-            tk.messagebox.showinfo("알림", "윈도우 테두리 변경은 오버레이를 재시작한 후 적용됩니다.")
-
-    def _toggle_click_through(self, enabled: bool):
-        """클릭 투과 모드 토글 (재시작 필요)"""
-        self.config.click_through = enabled
-        self.config.save()
-        if hasattr(self, 'settings_window') and self.settings_window:
-            tk.messagebox.showinfo("알림", "클릭 투과 모드 변경은 오버레이를 재시작한 후 적용됩니다.")
-
-    def _toggle_always_on_top(self, enabled: bool):
-        """항상 최상위 토글"""
-        self.config.always_on_top = enabled
-        if self.root:
-            self.root.wm_attributes('-topmost', enabled)
-
-    def _save_settings(self):
-        """설정 저장"""
-        self.config.save()
-        if self.settings_window:
-            self.settings_window.destroy()
-    
-    def update_subtitle(self, original_text: str, translated_text: str):
-        """자막 업데이트 (외부 호출용)"""
-        self.update_queue.put({
-            'type': 'subtitle',
-            'original': original_text,
-            'translated': translated_text
-        })
-    
-    def show(self):
-        """오버레이 표시"""
-        self.update_queue.put({'type': 'show'})
-    
-    def hide(self):
-        """오버레이 숨김"""
-        self.update_queue.put({'type': 'hide'})
-    
-    def run(self):
-        """UI 메인 루프 시작"""
-        self.create_ui()
-        
-        try:
-            self.root.mainloop()
-        except KeyboardInterrupt:
-            pass
-        finally:
-            self.close()
-    
-    def close(self):
-        """오버레이 종료"""
-        if self.hide_timer:
-            self.hide_timer.cancel()
-        
-        if self.root:
-            self.root.quit()
-            self.root.destroy()
-        
-        self.config.save()
-
-# 테스트 코드
-if __name__ == "__main__":
-    def test_overlay():
-        overlay = TransparentOverlay()
-        
-        # 테스트용 자막 업데이트
-        def update_test_subtitles():
-            test_data = [
-                ("Hello, how are you?", "안녕하세요, 어떻게 지내세요?"),
-                ("This is a test.", "이것은 테스트입니다."),
-                ("Real-time translation works!", "실시간 번역이 작동합니다!"),
-                ("Press F1 for settings.", "F1을 눌러 설정을 열어보세요."),
-                ("Press Escape to exit.", "ESC를 눌러 종료하세요.")
-            ]
-            
-            def update_loop(index=0):
-                if index < len(test_data):
-                    original, translated = test_data[index]
-                    overlay.update_subtitle(original, translated)
-                    
-                    # 다음 업데이트 스케줄
-                    if overlay.root:
-                        overlay.root.after(4000, lambda: update_loop(index + 1))
-            
-            # 3초 후 시작
-            if overlay.root:
-                overlay.root.after(3000, update_loop)
-        
-        # 테스트 스레드 시작
-        import threading
-        threading.Thread(target=update_test_subtitles, daemon=True).start()
-        
-        # UI 실행
-        overlay.run()
-    
-    print("Testing overlay UI...")
-    print("Controls:")
-    print("- F1: Show settings")
-    print("- ESC: Close")
-    print("- Drag to move")
-    
+#!/usr/bin/env python3
+"""
+투명 오버레이 UI 모듈
+실시간 자막을 화면에 반투명 오버레이로 표시
+"""
+
+import tkinter as tk
+from tkinter import ttk, font, messagebox
+import queue
+import time
+from typing import Optional, Dict, Any, Tuple
+import json
+import os
+from pathlib import Path
+from functools import lru_cache
+import sys
+from collections import deque
+
+# Windows에서만 사용가능한 모듈들
+try:
+    import win32gui
+    import win32con
+    WINDOWS_AVAILABLE = True
+except ImportError:
+    WINDOWS_AVAILABLE = False
+
+# 자막 투명도 양자화 단계 (색상 캐시 키, _blend_hex의 >> 8과 일치)
+_ALPHA_STEPS = 256
+
+# 긴 자막 말줄임 표시
+_ELLIPSIS = "..."
+
+
+def _truncate(text: str, max_length: int, _ellipsis: str = _ELLIPSIS) -> str:
+    """max_length를 넘는 텍스트를 잘라 말줄임 표시 추가 (넘지 않으면 원본 그대로)"""
+    return text if len(text) <= max_length else text[:max_length] + _ellipsis
+
+
+@lru_cache(maxsize=512)
+def _blend_hex(color: str, alpha_q: int) -> str:
+    """색상에 양자화된 투명도 적용 (어두운 배경 기준, alpha = alpha_q / 256)"""
+    if not color.startswith('#'):
+        return color
+
+    # "#RRGGBB"를 한 번에 정수로 파싱한 뒤 시프트/마스크로 채널 분리
+    v = int(color[1:7], 16)
+
+    # 알파 적용 (검은 배경과 블렌딩) - 곱셈과 >> 8만 사용
+    r = ((v >> 16) * alpha_q) >> 8
+    g = (((v >> 8) & 0xFF) * alpha_q) >> 8
+    b = ((v & 0xFF) * alpha_q) >> 8
+
+    return f"#{r << 16 | g << 8 | b:06x}"
+
+class OverlayConfig:
+    """오버레이 UI 설정"""
+    def __init__(self):
+        # 기본 위치 및 크기
+        self.window_width = 800
+        self.window_height = 200
+        self.x_position = 100
+        self.y_position = 100
+        
+        # 투명도 및 외관
+        self.alpha = 0.8  # 투명도 (0.0 ~ 1.0)
+        self.bg_color = "#000000"  # 배경색
+        self.original_text_color = "#FFFFFF"  # 원문 색상
+        self.translated_text_color = "#00FF00"  # 번역문 색상
+        
+        # 폰트 설정
+        self.font_family = "맑은 고딕"
+        self.original_font_size = 14
+        self.translated_font_size = 16
+        self.font_weight = "normal"  # "normal" or "bold"
+        
+        # 동작 설정
+        self.always_on_top = True
+        self.click_through = False  # 클릭 투과 여부
+        self.auto_hide_enabled = True  # 자동 숨김 활성화 여부
+        self.auto_hide_delay = 10.0  # 자동 숨김 지연 (초) - 증가
+        self.fade_duration = 0.5  # 페이드 애니메이션 시간
+        self.resizable = True  # 윈도우 크기 조절 가능 여부
+        self.subtitle_alpha = 1.0  # 자막 투명도 (별도 조절)
+        # 성능 모드: 테두리 없는 창 + 창 투명도 고정 (Windows 레이어드 창 재합성 최소화, 클릭 투과 미사용 시 권장)
+        self.performance_mode = False
+
+        # 가사 스타일 스크롤 설정
+        self.lyrics_style = True  # 위로 밀리는 가사 스타일 활성화
+        self.max_history_lines = 5  # 표시할 최대 이력 줄 수
+        self.scroll_animation_speed = 300  # 스크롤 애니메이션 속도 (ms)
+        
+        # 텍스트 표시 설정
+        self.show_original = True
+        self.show_translated = True
+        self.max_line_length = 80
+        self.max_lines = 3
+        
+        # 설정 파일
+        self.config_file = Path("overlay_config.json")
+        self._save_after_id = None  # 지연 저장 예약 id (schedule_save)
+    
+    def schedule_save(self, root: tk.Misc, delay_ms: int = 500):
+        """연속 변경(드래그/토글)을 묶어 delay_ms 뒤 한 번만 저장"""
+        if self._save_after_id is not None:
+            root.after_cancel(self._save_after_id)
+        self._save_after_id = root.after(delay_ms, self._do_save)
+
+    def cancel_scheduled_save(self, root: tk.Misc):
+        """예약된 지연 저장 취소 (직후에 save()를 직접 호출하는 경우)"""
+        if self._save_after_id is not None:
+            root.after_cancel(self._save_after_id)
+            self._save_after_id = None
+
+    def _do_save(self):
+        """예약된 지연 저장 실행"""
+        self._save_after_id = None
+        self.save()
+
+    def save(self):
+        """설정을 파일로 저장 (임시 파일에 쓴 뒤 교체 - 중간에 실패해도 기존 파일 보존)"""
+        config_dict = {
+            "window_width": self.window_width,
+            "window_height": self.window_height,
+            "x_position": self.x_position,
+            "y_position": self.y_position,
+            "alpha": self.alpha,
+            "bg_color": self.bg_color,
+            "original_text_color": self.original_text_color,
+            "translated_text_color": self.translated_text_color,
+            "font_family": self.font_family,
+            "original_font_size": self.original_font_size,
+            "translated_font_size": self.translated_font_size,
+            "font_weight": self.font_weight,
+            "always_on_top": self.always_on_top,
+            "click_through": self.click_through,
+            "auto_hide_delay": self.auto_hide_delay,
+            "show_original": self.show_original,
+            "show_translated": self.show_translated,
+            "lyrics_style": self.lyrics_style,
+            "max_history_lines": self.max_history_lines,
+            "scroll_animation_speed": self.scroll_animation_speed,
+            "auto_hide_enabled": self.auto_hide_enabled,
+            "resizable": self.resizable,
+            "subtitle_alpha": self.subtitle_alpha,
+            "performance_mode": self.performance_mode,
+        }
+        
+        try:
+            tmp_file = self.config_file.with_name(self.config_file.name + ".tmp")
+            tmp_file.write_text(
+                json.dumps(config_dict, indent=2, ensure_ascii=False),
+                encoding='utf-8'
+            )
+            os.replace(tmp_file, self.config_file)
+        except Exception:
+            pass
+    
+    def load(self):
+        """파일에서 설정 로드"""
+        if not self.config_file.exists():
+            return
+        
+        try:
+            config_dict = json.loads(self.config_file.read_text(encoding='utf-8'))
+            for key, value in config_dict.items():
+                if hasattr(self, key):
+                    setattr(self, key, value)
+        except Exception:
+            pass
+
+class TransparentOverlay:
+    """투명 오버레이 UI"""
+
+    # 큐 감시 주기 (ms) - 자막 업데이트는 이벤트로 즉시 처리되고, 이 타이머는 누락 대비용
+    WATCHDOG_INTERVAL_MS = 1000
+    # 슬라이더 변경 반영 주기 (ms) - 드래그 중 연속 호출을 한 번으로 합침
+    SLIDER_FLUSH_MS = 33
+    
+    def __init__(self, config: Optional[OverlayConfig] = None):
+        self.config = config or OverlayConfig()
+        self.config.load()
+        
+        # UI 요소
+        self.root: Optional[tk.Tk] = None
+        self.original_label: Optional[tk.Label] = None
+        self.translated_label: Optional[tk.Label] = None
+        self.settings_window: Optional[tk.Toplevel] = None
+        
+        # 상태 관리
+        self.is_visible = True
+        self.current_original = ""
+        self.current_translated = ""
+        self.last_update_time = time.time()
+
+        # 가사 스타일을 위한 이력 관리
+        self.translation_history = deque(maxlen=self.config.max_history_lines)  # (original, translated) 튜플
+        self.history_text: Optional[tk.Text] = None  # 이력 표시용 단일 Text 위젯 (항목별 태그로 색상 지정)
+        # 이력 줄 수별 (번역문 색상, 원문 색상) 테이블 캐시 - 투명도/줄 수 변경 시 무효화
+        self._history_color_tables: Dict[int, tuple] = {}
+        # 현재 자막 라벨 (원문 색상, 번역문 색상) 캐시 및 라벨별 마지막 적용 색상
+        self._line_color_cache: Optional[Tuple[str, str]] = None
+        self._label_fg: Dict[tk.Label, str] = {}
+        # 이력 리비전 (지금까지 추가된 이력 수) - 마지막으로 반영한 리비전 이후의 항목만 Text 끝에 추가
+        self._history_rev = 0
+        self._last_rendered_rev = 0
+        # Text에 표시 중인 이력 항목 (리비전, 원문 표시 여부) - 오래된 것부터
+        self._rendered_history: deque = deque()
+        
+        # 자동 숨김 타이머
+        self._hide_after_id: Optional[str] = None  # Tk after() 예약 id
+        
+        # 업데이트 큐 (스레드 안전)
+        self.update_queue = queue.Queue()
+        
+        # 드래그 관련
+        self.drag_start_x = 0
+        self.drag_start_y = 0
+        self.is_dragging = False
+
+        # 슬라이더 변경 지연 반영 (키 → after id)
+        self._flush_jobs: Dict[str, str] = {}
+        self._dirty = set()  # 반영 대기 중인 레이아웃 항목 ('width', 'height', 'wrap')
+        self._applied_alpha: Optional[float] = None
+        # 마지막으로 색상에 반영한 자막 투명도 (UI는 설정값으로 생성됨)
+        self._applied_subtitle_alpha = self.config.subtitle_alpha
+    
+    def create_ui(self):
+        """UI 생성"""
+        self.root = tk.Tk()
+        self.root.title("Real-time Translation Overlay")
+        
+        # 윈도우 설정
+        self.root.geometry(f"{self.config.window_width}x{self.config.window_height}+"
+                          f"{self.config.x_position}+{self.config.y_position}")
+        self.root.configure(bg=self.config.bg_color)
+        
+        # 투명도 설정 (성능 모드에서는 불투명이면 아예 설정하지 않아 레이어드 창을 피함)
+        if not self.config.performance_mode or self.config.alpha < 1.0:
+            self.root.wm_attributes('-alpha', self.config.alpha)
+        
+        # 항상 최상위
+        if self.config.always_on_top:
+            self.root.wm_attributes('-topmost', True)
+        
+        # 윈도우 경계 설정 (크기 조절 가능하도록)
+        if self.config.performance_mode:
+            # 성능 모드: 테두리 없는 창, 크기 조절은 우클릭 드래그로 직접 처리
+            self.root.overrideredirect(True)
+        elif self.config.resizable:
+            self.root.overrideredirect(False)
+            self.root.resizable(True, True)
+            # 타이틀바는 숨기고 경계만 표시하도록 설정
+            try:
+                self.root.wm_attributes('-toolwindow', True)
+            except:
+                pass
+        else:
+            self.root.overrideredirect(True)
+        
+        # Windows 클릭 투과 설정
+        if WINDOWS_AVAILABLE and self.config.click_through:
+            self._setup_click_through()
+        
+        # 폰트 설정 (크기 변경 시 새로 만들지 않고 이 객체들을 직접 수정)
+        self._orig_font = font.Font(
+            family=self.config.font_family,
+            size=self.config.original_font_size,
+            weight=self.config.font_weight
+        )
+
+        self._trans_font = font.Font(
+            family=self.config.font_family,
+            size=self.config.translated_font_size,
+            weight="bold"
+        )
+
+        # 이력 라벨 공용 폰트
+        self._history_orig_font = font.Font(
+            family=self.config.font_family,
+            size=max(6, self.config.original_font_size - 6)
+        )
+        self._history_trans_font = font.Font(
+            family=self.config.font_family,
+            size=max(8, self.config.translated_font_size - 4)
+        )
+        
+        # 현재 자막 텍스트 변수 (업데이트 시 config 대신 변수 값만 설정)
+        self._orig_var = tk.StringVar(self.root, value="")
+        self._trans_var = tk.StringVar(self.root, value="실시간 번역을 기다리는 중...")
+        self._var_text: Dict[str, str] = {}  # 텍스트 변수 이름별 마지막 설정 값
+
+        # 메인 프레임 (두 스타일 모두 루트에 직접 배치 - 내용은 wraplength로 창 안에 맞춰짐)
+        main_frame = tk.Frame(self.root, bg=self.config.bg_color)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # 가사 스타일 vs 기본 스타일 구분
+        if self.config.lyrics_style:
+            self._create_lyrics_style_ui(main_frame, self._orig_font, self._trans_font)
+        else:
+            self._create_default_style_ui(main_frame, self._orig_font, self._trans_font)
+        
+        # 마우스 이벤트 바인딩 (드래그 이동)
+        if not self.config.click_through:
+            self._setup_drag_events()
+            if self.config.performance_mode:
+                self._setup_resize_events()
+        
+        # 키보드 이벤트 바인딩
+        self.root.bind('<Escape>', self._on_escape)
+        self.root.bind('<F1>', self._show_settings)
+        self.root.focus_set()
+        
+        # 업데이트 알림 이벤트 (생산자 스레드에서 발생) 및 누락 대비 감시 타이머
+        self.root.bind('<<SubtitleUpdate>>', lambda e: self._drain_updates())
+        self.root.after(self.WATCHDOG_INTERVAL_MS, self._check_updates)
+    
+    def _setup_click_through(self):
+        """Windows 클릭 투과 설정"""
+        if not WINDOWS_AVAILABLE:
+            return
+        
+        def setup():
+            try:
+                hwnd = self.root.winfo_id()
+                # WS_EX_TRANSPARENT: 클릭 투과
+                # WS_EX_LAYERED: 투명도 적용을 위해 필요
+                extended_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+                win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE,
+                                     extended_style | win32con.WS_EX_LAYERED | win32con.WS_EX_TRANSPARENT)
+            except Exception:
+                pass
+        
+        # 윈도우가 완전히 생성된 후 설정
+        self.root.after(100, setup)
+    
+    def _create_lyrics_style_ui(self, parent, original_font, translated_font):
+        """가사 스타일 UI 생성"""
+        # 자막 투명도 적용된 색상
+        original_color, translated_color = self._line_colors()
+        # 현재 번역 표시용 (맨 아래)
+        if self.config.show_translated:
+            self.translated_label = tk.Label(
+                parent,
+                textvariable=self._trans_var,
+                font=translated_font,
+                fg=translated_color,
+                bg=self.config.bg_color,
+                justify=tk.CENTER,
+                wraplength=self.config.window_width - 20,
+                anchor=tk.CENTER
+            )
+            self.translated_label.pack(side=tk.BOTTOM, pady=(2, 5))
+
+        # 현재 원문 표시용 (번역문 위)
+        if self.config.show_original:
+            self.original_label = tk.Label(
+                parent,
+                textvariable=self._orig_var,
+                font=original_font,
+                fg=original_color,
+                bg=self.config.bg_color,
+                justify=tk.CENTER,
+                wraplength=self.config.window_width - 20,
+                anchor=tk.CENTER
+            )
+            self.original_label.pack(side=tk.BOTTOM, pady=(5, 2))
+
+        # 이력 표시용 프레임 (맨 위)
+        self.history_frame = tk.Frame(parent, bg=self.config.bg_color)
+        self.history_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, pady=5)
+        self._build_history_text()
+
+    def _create_default_style_ui(self, parent, original_font, translated_font):
+        """기본 스타일 UI 생성"""
+        # 자막 투명도 적용된 색상
+        original_color, translated_color = self._line_colors()
+        # 원문 라벨
+        if self.config.show_original:
+            self.original_label = tk.Label(
+                parent,
+                textvariable=self._orig_var,
+                font=original_font,
+                fg=original_color,
+                bg=self.config.bg_color,
+                justify=tk.CENTER,
+                wraplength=self.config.window_width - 20,
+                anchor=tk.CENTER
+            )
+            self.original_label.pack(pady=(5, 2))
+
+        # 번역문 라벨
+        if self.config.show_translated:
+            self.translated_label = tk.Label(
+                parent,
+                textvariable=self._trans_var,
+                font=translated_font,
+                fg=translated_color,
+                bg=self.config.bg_color,
+                justify=tk.CENTER,
+                wraplength=self.config.window_width - 20,
+                anchor=tk.CENTER
+            )
+            self.translated_label.pack(pady=(2, 5))
+
+    def _setup_resize_events(self):
+        """우클릭 드래그로 창 크기 조절 (성능 모드의 테두리 없는 창용, 오른쪽 아래 모서리 기준)"""
+        resize_start = {}
+
+        def start_resize(event):
+            resize_start.update(x=event.x_root, y=event.y_root,
+                                width=self.root.winfo_width(), height=self.root.winfo_height())
+
+        def on_resize(event):
+            if not resize_start:
+                return
+            self.config.window_width = max(200, resize_start['width'] + event.x_root - resize_start['x'])
+            self.config.window_height = max(60, resize_start['height'] + event.y_root - resize_start['y'])
+            self._mark_dirty('width', 'height', 'wrap')
+
+        def end_resize(event):
+            resize_start.clear()
+            self.config.schedule_save(self.root)  # 크기 저장
+
+        # 루트 바인딩은 루트 창의 모든 자식 위젯에도 적용됨
+        self.root.bind('<Button-3>', start_resize)
+        self.root.bind('<B3-Motion>', on_resize)
+        self.root.bind('<ButtonRelease-3>', end_resize)
+
+    def _setup_drag_events(self):
+        """드래그 이벤트 설정"""
+        def start_drag(event):
+            self.is_dragging = True
+            self.drag_start_x = event.x
+            self.drag_start_y = event.y
+        
+        def on_drag(event):
+            if self.is_dragging:
+                x = self.root.winfo_x() + (event.x - self.drag_start_x)
+                y = self.root.winfo_y() + (event.y - self.drag_start_y)
+                self.root.geometry(f"+{x}+{y}")
+                
+                # 설정 업데이트
+                self.config.x_position = x
+                self.config.y_position = y
+        
+        def end_drag(event):
+            self.is_dragging = False
+            self.config.schedule_save(self.root)  # 위치 저장 (연속 드래그는 한 번으로 묶음)
+        
+        # 모든 위젯에 드래그 이벤트 바인딩
+        widgets = [self.root]
+        if self.original_label:
+            widgets.append(self.original_label)
+        if self.translated_label:
+            widgets.append(self.translated_label)
+        
+        for widget in widgets:
+            widget.bind('<Button-1>', start_drag)
+            widget.bind('<B1-Motion>', on_drag)
+            widget.bind('<ButtonRelease-1>', end_drag)
+    
+    def _notify_ui(self):
+        """UI 스레드에 업데이트 알림 (실패 시 감시 타이머가 큐를 처리)"""
+        root = self.root
+        if root is None:
+            return
+        try:
+            root.event_generate('<<SubtitleUpdate>>', when='tail')
+        except (tk.TclError, RuntimeError):
+            pass
+
+    def _drain_updates(self):
+        """업데이트 큐 확인 및 UI 업데이트 (한 번에 쌓인 자막은 마지막 것만 렌더링)"""
+        subtitles = []
+        visibility = None  # 마지막 자막 이후의 표시/숨김 요청
+        try:
+            while True:
+                update = self.update_queue.get_nowait()
+                if update['type'] == 'subtitle':
+                    subtitles.append(update)
+                    visibility = None  # 자막 표시가 이전 표시/숨김 요청을 대체
+                elif update['type'] == 'hide':
+                    visibility = 'hide'
+                elif update['type'] == 'show':
+                    visibility = 'show'
+        except queue.Empty:
+            pass
+
+        if subtitles:
+            # 중간 자막은 화면 갱신 없이 이력에만 반영
+            for update in subtitles[:-1]:
+                self._skip_subtitle(update['original'], update['translated'])
+            last = subtitles[-1]
+            self._update_subtitle_display(last['original'], last['translated'])
+
+        if visibility == 'hide':
+            self._hide_overlay()
+        elif visibility == 'show':
+            self._show_overlay()
+
+    def _check_updates(self):
+        """감시 타이머 - 누락된 알림 대비 큐 처리"""
+        self._drain_updates()
+
+        # 다음 감시 스케줄
+        if self.root:
+            self.root.after(self.WATCHDOG_INTERVAL_MS, self._check_updates)
+    
+    def _update_subtitle_display(self, original: str, translated: str):
+        """자막 표시 업데이트"""
+        self.current_original = original
+        self.current_translated = translated
+        self.last_update_time = time.time()
+
+        # 오버레이 표시
+        if not self.is_visible:
+            self._show_overlay()
+
+        # 텍스트 길이 제한
+        max_length = self.config.max_line_length
+        original = _truncate(original, max_length)
+        translated = _truncate(translated, max_length)
+
+        if self.config.lyrics_style:
+            self._update_lyrics_style(original, translated)
+        else:
+            self._update_default_style(original, translated)
+
+        # 자동 숨김 타이머 재설정 (UI 스레드의 after 예약 - 별도 스레드 없음)
+        self._cancel_auto_hide()
+
+        if self.config.auto_hide_enabled and self.config.auto_hide_delay > 0:
+            self._hide_after_id = self.root.after(int(self.config.auto_hide_delay * 1000), self._on_auto_hide)
+
+    def _on_auto_hide(self):
+        """자동 숨김 타이머 만료"""
+        self._hide_after_id = None
+        self._hide_overlay()
+
+    def _cancel_auto_hide(self):
+        """예약된 자동 숨김 취소"""
+        if self._hide_after_id is not None:
+            self.root.after_cancel(self._hide_after_id)
+            self._hide_after_id = None
+
+    def _update_default_style(self, original: str, translated: str):
+        """기본 스타일 업데이트"""
+        # 라벨 업데이트
+        if self.original_label and self.config.show_original:
+            self._set_text(self._orig_var, original)
+
+        if self.translated_label and self.config.show_translated:
+            self._set_text(self._trans_var, translated)
+
+    def _set_text(self, var: tk.StringVar, text: str):
+        """라벨 텍스트 변수 설정 (마지막으로 설정한 값과 같으면 생략 - 라벨 재배치 방지)"""
+        name = str(var)
+        if self._var_text.get(name) != text:
+            self._var_text[name] = text
+            var.set(text)
+
+    def _skip_subtitle(self, original: str, translated: str):
+        """렌더링 없이 자막 상태만 갱신 (같은 주기에 뒤따르는 자막에 밀려난 경우)"""
+        self.current_original = original
+        self.current_translated = translated
+        if self.config.lyrics_style:
+            self._push_history()
+
+    def _push_history(self):
+        """현재 번역을 이력에 추가"""
+        if self.current_translated and self.current_translated != "실시간 번역을 기다리는 중...":
+            # 최대 이력 수 초과분은 deque가 자동으로 제거
+            self.translation_history.append((self.current_original, self.current_translated))
+            self._history_rev += 1
+
+    def _update_lyrics_style(self, original: str, translated: str):
+        """가사 스타일 업데이트 (위로 밀려 올라감)"""
+        # 현재 번역을 이력에 추가
+        self._push_history()
+
+        # 현재 라벨 업데이트
+        if self.original_label and self.config.show_original:
+            self._set_text(self._orig_var, original)
+
+        if self.translated_label and self.config.show_translated:
+            self._set_text(self._trans_var, translated)
+
+        # 이력 업데이트
+        self._update_history_text()
+    
+    def _show_overlay(self):
+        """오버레이 표시"""
+        if self.is_visible:
+            return
+        
+        self.is_visible = True
+        if self.root:
+            self.root.deiconify()
+    
+    def _hide_overlay(self):
+        """오버레이 숨김"""
+        if not self.is_visible:
+            return
+        
+        self.is_visible = False
+        if self.root:
+            self.root.withdraw()
+    
+    def _on_escape(self, event):
+        """ESC 키 처리"""
+        if self._settings_visible():
+            self._hide_settings()
+        else:
+            self.close()
+    
+    def _settings_visible(self) -> bool:
+        """설정 창이 현재 표시 중인지 여부"""
+        return bool(self.settings_window and self.settings_window.winfo_exists()
+                    and self.settings_window.state() != 'withdrawn')
+
+    def _show_settings(self, event):
+        """설정 창 표시 (F1) - 처음 한 번만 생성하고 이후에는 숨겼다 다시 표시"""
+        if self.settings_window and self.settings_window.winfo_exists():
+            self.settings_window.deiconify()
+            self.settings_window.lift()
+            return
+        
+        self.settings_window = tk.Toplevel(self.root)
+        self.settings_window.title("오버레이 설정")
+        self.settings_window.geometry("400x500")
+        self.settings_window.resizable(False, False)
+        # 창 닫기 버튼도 파괴 대신 숨김
+        self.settings_window.protocol("WM_DELETE_WINDOW", self._hide_settings)
+        
+        # 설정 UI 생성
+        self._create_settings_ui()
+
+    def _hide_settings(self):
+        """설정 창 숨김 (위젯은 다음 표시 때 재사용)"""
+        if self.settings_window and self.settings_window.winfo_exists():
+            self.settings_window.withdraw()
+    
+    def _create_settings_ui(self):
+        """설정 UI 생성"""
+        if not self.settings_window:
+            return
+        
+        notebook = ttk.Notebook(self.settings_window)
+        notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # 외관 탭
+        appearance_frame = ttk.Frame(notebook)
+        notebook.add(appearance_frame, text="외관")
+
+        # 동작 탭
+        behavior_frame = ttk.Frame(notebook)
+        notebook.add(behavior_frame, text="동작")
+
+        # 크기 조절 탭
+        size_frame = ttk.Frame(notebook)
+        notebook.add(size_frame, text="크기")
+
+        # 윈도우 탭
+        window_frame = ttk.Frame(notebook)
+        notebook.add(window_frame, text="윈도우")
+
+        self._create_appearance_settings(appearance_frame)
+        self._create_behavior_settings(behavior_frame)
+        self._create_size_settings(size_frame)
+        self._create_window_settings(window_frame)
+
+    def _create_appearance_settings(self, parent):
+        """외관 설정 UI"""
+
+        # 창 투명도
+        ttk.Label(parent, text="창 투명도:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        alpha_var = tk.DoubleVar(value=self.config.alpha)
+        alpha_scale = ttk.Scale(parent, from_=0.1, to=1.0, variable=alpha_var,
+                               command=lambda v: self._update_alpha(float(v)))
+        alpha_scale.grid(row=0, column=1, columnspan=2, sticky=tk.EW, padx=5)
+        if self.config.performance_mode:
+            # 성능 모드에서는 창 투명도 고정
+            alpha_scale.state(['disabled'])
+
+        # 자막 투명도
+        ttk.Label(parent, text="자막 투명도:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        subtitle_alpha_var = tk.DoubleVar(value=self.config.subtitle_alpha)
+        subtitle_alpha_scale = ttk.Scale(parent, from_=0.1, to=1.0, variable=subtitle_alpha_var,
+                                        command=lambda v: self._update_subtitle_alpha(float(v)))
+        subtitle_alpha_scale.grid(row=1, column=1, columnspan=2, sticky=tk.EW, padx=5)
+
+        # 폰트 크기
+        ttk.Label(parent, text="번역문 폰트 크기:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        font_size_var = tk.IntVar(value=self.config.translated_font_size)
+        font_size_spinbox = ttk.Spinbox(parent, from_=8, to=72, textvariable=font_size_var,
+                                       command=lambda: self._update_font_size(font_size_var.get()))
+        font_size_spinbox.grid(row=2, column=1, sticky=tk.EW, padx=5)
+
+        # 원문 폰트 크기
+        ttk.Label(parent, text="원문 폰트 크기:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        orig_font_size_var = tk.IntVar(value=self.config.original_font_size)
+        orig_font_size_spinbox = ttk.Spinbox(parent, from_=8, to=72, textvariable=orig_font_size_var,
+                                            command=lambda: self._update_original_font_size(orig_font_size_var.get()))
+        orig_font_size_spinbox.grid(row=3, column=1, sticky=tk.EW, padx=5)
+
+    def _create_behavior_settings(self, parent):
+        """동작 설정 UI"""
+        # 원문 표시 토글
+        show_original_var = tk.BooleanVar(value=self.config.show_original)
+        ttk.Checkbutton(parent, text="원문 표시", variable=show_original_var,
+                       command=lambda: self._toggle_original_display(show_original_var.get())).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=5)
+
+        # 가사 스타일 토글
+        lyrics_style_var = tk.BooleanVar(value=self.config.lyrics_style)
+        ttk.Checkbutton(parent, text="가사 스타일 (위로 스크롤)", variable=lyrics_style_var,
+                       command=lambda: self._toggle_lyrics_style(lyrics_style_var.get())).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=5)
+
+        # 자동 숨김 활성화
+        auto_hide_enabled_var = tk.BooleanVar(value=self.config.auto_hide_enabled)
+        ttk.Checkbutton(parent, text="자동 숨김 활성화", variable=auto_hide_enabled_var,
+                       command=lambda: self._toggle_auto_hide(auto_hide_enabled_var.get())).grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=5)
+
+        # 자동 숨김 시간
+        ttk.Label(parent, text="자동 숨김 시간 (초):").grid(row=3, column=0, sticky=tk.W, pady=5)
+        hide_delay_var = tk.DoubleVar(value=self.config.auto_hide_delay)
+        hide_delay_scale = ttk.Scale(parent, from_=3.0, to=20.0, variable=hide_delay_var,
+                                    command=lambda v: self._update_hide_delay(float(v)))
+        hide_delay_scale.grid(row=3, column=1, columnspan=2, sticky=tk.EW, padx=5)
+
+        # 이력 줄 수 (가사 스타일용)
+        ttk.Label(parent, text="이력 표시 줄 수:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        history_lines_var = tk.IntVar(value=self.config.max_history_lines)
+        history_lines_spinbox = ttk.Spinbox(parent, from_=1, to=10, textvariable=history_lines_var,
+                                           command=lambda: self._update_history_lines(history_lines_var.get()))
+        history_lines_spinbox.grid(row=4, column=1, sticky=tk.EW, padx=5)
+
+    def _create_size_settings(self, parent):
+        """크기 설정 UI"""
+        # 윈도우 너비
+        ttk.Label(parent, text="오버레이 너비:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        width_var = tk.IntVar(value=self.config.window_width)
+        width_scale = ttk.Scale(parent, from_=400, to=1200, variable=width_var,
+                               command=lambda v: self._update_window_width(int(float(v))))
+        width_scale.grid(row=0, column=1, columnspan=2, sticky=tk.EW, padx=5)
+
+        # 윈도우 높이
+        ttk.Label(parent, text="오버레이 높이:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        height_var = tk.IntVar(value=self.config.window_height)
+        height_scale = ttk.Scale(parent, from_=100, to=600, variable=height_var,
+                                command=lambda v: self._update_window_height(int(float(v))))
+        height_scale.grid(row=1, column=1, columnspan=2, sticky=tk.EW, padx=5)
+        
+        # 버튼 프레임
+        button_frame = ttk.Frame(self.settings_window)
+        button_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Button(button_frame, text="저장", command=self._save_settings).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="닫기", command=self._hide_settings).pack(side=tk.RIGHT, padx=5)
+
+    def _create_window_settings(self, parent):
+        """윈도우 설정 UI"""
+        # 크기 조절 가능 토글
+        resizable_var = tk.BooleanVar(value=self.config.resizable)
+        ttk.Checkbutton(parent, text="창 테두리로 크기 조절 가능", variable=resizable_var,
+                       command=lambda: self._toggle_resizable(resizable_var.get())).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=5)
+
+        # 클릭 투과 토글
+        click_through_var = tk.BooleanVar(value=self.config.click_through)
+        ttk.Checkbutton(parent, text="클릭 투과 모드", variable=click_through_var,
+                       command=lambda: self._toggle_click_through(click_through_var.get())).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=5)
+
+        # 항상 최상위 토글
+        always_on_top_var = tk.BooleanVar(value=self.config.always_on_top)
+        ttk.Checkbutton(parent, text="항상 최상위 표시", variable=always_on_top_var,
+                       command=lambda: self._toggle_always_on_top(always_on_top_var.get())).grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=5)
+
+        # 성능 모드 토글
+        performance_mode_var = tk.BooleanVar(value=self.config.performance_mode)
+        ttk.Checkbutton(parent, text="성능 모드 (테두리 없음, 우클릭 드래그로 크기 조절)", variable=performance_mode_var,
+                       command=lambda: self._toggle_performance_mode(performance_mode_var.get())).grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=5)
+    
+    def _schedule_flush(self, key: str, callback):
+        """슬라이더 변경을 SLIDER_FLUSH_MS 뒤 한 번만 반영 (이미 예약되어 있으면 무시)"""
+        if not self.root or key in self._flush_jobs:
+            return
+
+        def run():
+            del self._flush_jobs[key]
+            callback()
+
+        self._flush_jobs[key] = self.root.after(self.SLIDER_FLUSH_MS, run)
+
+    def _update_alpha(self, value: float):
+        """창 투명도 실시간 업데이트"""
+        if self.config.performance_mode:
+            return
+        self.config.alpha = value
+        self._schedule_flush('alpha', self._flush_alpha)
+
+    def _flush_alpha(self):
+        """창 투명도 반영 (0.02 단위로 양자화, 값이 같으면 창 재합성 생략)"""
+        alpha = round(self.config.alpha * 50) / 50
+        if self.root and alpha != self._applied_alpha:
+            self._applied_alpha = alpha
+            self.root.wm_attributes('-alpha', alpha)
+
+    def _update_subtitle_alpha(self, value: float):
+        """자막 투명도 실시간 업데이트"""
+        self.config.subtitle_alpha = value
+        # 모든 텍스트 라벨의 색상 업데이트
+        self._schedule_flush('subtitle_alpha', self._apply_subtitle_alpha)
+    
+    def _update_font_size(self, size: int):
+        """폰트 크기 실시간 업데이트 (폰트 객체를 쓰는 라벨은 Tk가 자동 갱신)"""
+        self.config.translated_font_size = size
+        if self.root:
+            self._trans_font.configure(size=size)
+            self._history_trans_font.configure(size=max(8, size - 4))
+
+    def _update_original_font_size(self, size: int):
+        """원문 폰트 크기 실시간 업데이트 (폰트 객체를 쓰는 라벨은 Tk가 자동 갱신)"""
+        self.config.original_font_size = size
+        if self.root:
+            self._orig_font.configure(size=size)
+            self._history_orig_font.configure(size=max(6, size - 6))
+
+    def _toggle_original_display(self, show: bool):
+        """원문 표시 토글"""
+        self.config.show_original = show
+        if self.original_label:
+            if show:
+                self.original_label.pack()
+            else:
+                self.original_label.pack_forget()
+        # 이력의 원문 줄도 다시 구성
+        self._update_history_text(rebuild=True)
+
+    def _toggle_lyrics_style(self, enable: bool):
+        """가사 스타일 토글 (재시작 필요)"""
+        self.config.lyrics_style = enable
+        # 설정 저장하고 재시작 안내
+        self.config.schedule_save(self.root)
+        if hasattr(self, 'settings_window') and self.settings_window:
+            tk.messagebox.showinfo("알림", "가사 스타일 변경은 오버레이를 재시작한 후 적용됩니다.")
+
+    def _toggle_auto_hide(self, enabled: bool):
+        """자동 숨김 기능 토글"""
+        self.config.auto_hide_enabled = enabled
+        if not enabled:
+            self._cancel_auto_hide()
+
+    def _update_hide_delay(self, delay: float):
+        """자동 숨김 시간 업데이트"""
+        self.config.auto_hide_delay = delay
+
+    def _update_history_lines(self, lines: int):
+        """이력 줄 수 업데이트"""
+        self.config.max_history_lines = lines
+        self._history_color_tables.clear()
+        # 새 제한으로 다시 만들면 초과한 오래된 항목부터 버려짐
+        self.translation_history = deque(self.translation_history, maxlen=lines)
+        self._update_history_text(rebuild=True)
+
+    def _update_window_width(self, width: int):
+        """오버레이 너비 실시간 업데이트"""
+        self.config.window_width = width
+        self._mark_dirty('width', 'wrap')
+
+    def _update_window_height(self, height: int):
+        """오버레이 높이 실시간 업데이트"""
+        self.config.window_height = height
+        self._mark_dirty('height')
+
+    def _mark_dirty(self, *tokens: str):
+        """레이아웃 변경 항목 표시 후 한 번의 flush로 묶어서 반영"""
+        self._dirty.update(tokens)
+        self._schedule_flush('layout', self._flush_dirty)
+
+    def _flush_dirty(self):
+        """표시된 레이아웃 변경을 한 번에 반영 (geometry/wraplength 각 1회)"""
+        dirty = self._dirty
+        self._dirty = set()
+        if not self.root:
+            return
+
+        if 'width' in dirty or 'height' in dirty:
+            # 바뀌지 않은 축은 현재 창 크기 유지 (테두리로 조절한 크기 보존), 위치는 Tk가 유지
+            width = self.config.window_width if 'width' in dirty else self.root.winfo_width()
+            height = self.config.window_height if 'height' in dirty else self.root.winfo_height()
+            self.root.geometry(f"{width}x{height}")
+
+        if 'wrap' in dirty:
+            # 텍스트 wraplength도 업데이트
+            wrap_length = self.config.window_width - 40  # 여유 공간 증가
+            if self.original_label:
+                self.original_label.config(wraplength=wrap_length)
+            if self.translated_label:
+                self.translated_label.config(wraplength=wrap_length)
+            # 이력 Text는 위젯 너비에 맞춰 자동으로 줄바꿈
+
+    def _build_history_text(self):
+        """이력 표시용 Text 위젯 생성 (읽기 전용, 번역문/원문 공통 서식은 태그로 지정)"""
+        self.history_text = tk.Text(
+            self.history_frame,
+            bg=self.config.bg_color,
+            height=1,
+            wrap=tk.WORD,
+            padx=20,
+            borderwidth=0,
+            highlightthickness=0,
+            cursor="arrow",
+            takefocus=0,
+            selectbackground=self.config.bg_color,
+            inactiveselectbackground=self.config.bg_color
+        )
+        self.history_text.tag_configure('trans', font=self._history_trans_font,
+                                        justify=tk.CENTER, spacing1=1, spacing3=1)
+        self.history_text.tag_configure('orig', font=self._history_orig_font,
+                                        justify=tk.CENTER, spacing3=3)
+        self.history_text.config(state=tk.DISABLED)
+        self.history_text.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+    def _update_history_text(self, force: bool = False, rebuild: bool = False):
+        """가사 스타일 이력 갱신 (새 항목은 끝에 추가, 밀려난 오래된 항목은 앞에서 삭제)
+
+        이력이 마지막 렌더링 이후 바뀌지 않았으면 생략 (색상 변경 등은 force=True,
+        표시 형식 변경 등 전체 재구성은 rebuild=True).
+        """
+        if not self.config.lyrics_style or self.history_text is None:
+            return
+        added = self._history_rev - self._last_rendered_rev
+        if not (added or force or rebuild):
+            return
+        self._last_rendered_rev = self._history_rev
+
+        text = self.history_text
+        count = len(self.translation_history)
+        text.config(state=tk.NORMAL)
+        if rebuild or added >= count:
+            # 모든 항목이 새것이면 통째로 다시 작성
+            text.delete('1.0', tk.END)
+            for rev, _ in self._rendered_history:
+                text.tag_delete(f"t{rev}", f"o{rev}")
+            self._rendered_history.clear()
+            added = count
+        else:
+            # 이력에서 밀려난 항목을 앞에서 삭제 - 번역문에 줄바꿈이 있을 수 있으므로 줄 수가 아니라
+            # 마지막으로 밀려난 항목의 태그 끝 위치까지 삭제
+            evicted = [self._rendered_history.popleft()
+                       for _ in range(len(self._rendered_history) + added - count)]
+            if evicted:
+                rev, has_orig = evicted[-1]
+                text.delete('1.0', text.index(f"{'o' if has_orig else 't'}{rev}.last"))
+                for rev, _ in evicted:
+                    text.tag_delete(f"t{rev}", f"o{rev}")
+
+        # 새 항목을 끝에 추가 (텍스트/태그 쌍을 insert 한 번에 전달)
+        chunks = []
+        first_rev = self._history_rev - count
+        for i in range(count - added, count):
+            orig, trans = self.translation_history[i]
+            rev = first_rev + i
+            chunks += [trans + "\n", ('trans', f"t{rev}")]
+            # 원문도 표시하는 경우
+            has_orig = bool(self.config.show_original and orig)
+            if has_orig:
+                chunks += [orig + "\n", ('orig', f"o{rev}")]
+            self._rendered_history.append((rev, has_orig))
+        if chunks:
+            text.insert(tk.END, *chunks)
+        text.config(state=tk.DISABLED)
+        text.see(tk.END)
+
+        # 오래된 것부터 위에, 투명도 점진적 감소 - 태그 색상만 바꾸므로 레이아웃 재계산 없음
+        color_table = self._history_color_table(count)
+        for (rev, has_orig), (trans_color, orig_color) in zip(self._rendered_history, color_table):
+            text.tag_configure(f"t{rev}", foreground=trans_color)
+            if has_orig:
+                text.tag_configure(f"o{rev}", foreground=orig_color)
+
+    def _history_color_table(self, count: int) -> tuple:
+        """이력 줄 수에 대한 행별 (번역문 색상, 원문 색상) 테이블 (오래된 것일수록 투명)"""
+        table = self._history_color_tables.get(count)
+        if table is None:
+            table = tuple(
+                (self._blend_color_alpha(self.config.translated_text_color, (i + 1) / count * 0.7 * self.config.subtitle_alpha),
+                 self._blend_color_alpha(self.config.original_text_color, (i + 1) / count * 0.5 * self.config.subtitle_alpha))
+                for i in range(count)
+            )
+            self._history_color_tables[count] = table
+        return table
+
+    def _blend_color_alpha(self, color: str, alpha: float) -> str:
+        """색상에 투명도 적용 (어두운 배경 기준, 결과는 양자화된 알파로 캐시)"""
+        return _blend_hex(color, int(alpha * _ALPHA_STEPS))
+
+    def _line_colors(self) -> Tuple[str, str]:
+        """자막 투명도가 적용된 현재 자막 (원문 색상, 번역문 색상) - 투명도 변경 시에만 재계산"""
+        if self._line_color_cache is None:
+            self._line_color_cache = (
+                self._blend_color_alpha(self.config.original_text_color, self.config.subtitle_alpha),
+                self._blend_color_alpha(self.config.translated_text_color, self.config.subtitle_alpha),
+            )
+        return self._line_color_cache
+
+    def _config_label(self, label: tk.Label, fg: str):
+        """라벨 색상 설정 (마지막으로 적용한 값과 같으면 생략)"""
+        if self._label_fg.get(label) != fg:
+            self._label_fg[label] = fg
+            label.config(fg=fg)
+
+    def _apply_subtitle_alpha(self):
+        """모든 자막 요소에 투명도 적용 (마지막으로 반영한 값과 같으면 생략)"""
+        if self.config.subtitle_alpha == self._applied_subtitle_alpha:
+            return
+        self._applied_subtitle_alpha = self.config.subtitle_alpha
+        self._history_color_tables.clear()
+        self._line_color_cache = None
+
+        # 현재 라벨들에 자막 투명도 적용
+        original_color, translated_color = self._line_colors()
+        if self.original_label:
+            self._config_label(self.original_label, original_color)
+
+        if self.translated_label:
+            self._config_label(self.translated_label, translated_color)
+
+        # 이력 색상도 업데이트 (가사 스타일인 경우)
+        self._update_history_text(force=True)
+
+    def _toggle_resizable(self, enabled: bool):
+        """크기 조절 가능 토글 (재시작 필요)"""
+        self.config.resizable = enabled
+        self.config.schedule_save(self.root)
+        if hasattr(self, 'settings_window') and self.settings_window:
+            tk.messagebox.showinfo("알림", "윈도우 테두리 변경은 오버레이를 재시작한 후 적용됩니다.")
+
+    def _toggle_click_through(self, enabled: bool):
+        """클릭 투과 모드 토글 (재시작 필요)"""
+        self.config.click_through = enabled
+        self.config.schedule_save(self.root)
+        if hasattr(self, 'settings_window') and self.settings_window:
+            tk.messagebox.showinfo("알림", "클릭 투과 모드 변경은 오버레이를 재시작한 후 적용됩니다.")
+
+    def _toggle_performance_mode(self, enabled: bool):
+        """성능 모드 토글 (재시작 필요)"""
+        self.config.performance_mode = enabled
+        self.config.schedule_save(self.root)
+        if hasattr(self, 'settings_window') and self.settings_window:
+            tk.messagebox.showinfo("알림", "성능 모드 변경은 오버레이를 재시작한 후 적용됩니다.")
+
+    def _toggle_always_on_top(self, enabled: bool):
+        """항상 최상위 토글"""
+        self.config.always_on_top = enabled
+        if self.root:
+            self.root.wm_attributes('-topmost', enabled)
+
+    def _save_settings(self):
+        """설정 저장"""
+        self.config.cancel_scheduled_save(self.root)
+        self.config.save()
+        self._hide_settings()
+    
+    def update_subtitle(self, original_text: str, translated_text: str):
+        """자막 업데이트 (외부 호출용)"""
+        self.update_queue.put({
+            'type': 'subtitle',
+            'original': original_text,
+            'translated': translated_text
+        })
+        self._notify_ui()
+    
+    def show(self):
+        """오버레이 표시"""
+        self.update_queue.put({'type': 'show'})
+        self._notify_ui()
+    
+    def hide(self):
+        """오버레이 숨김"""
+        self.update_queue.put({'type': 'hide'})
+        self._notify_ui()
+    
+    def run(self):
+        """UI 메인 루프 시작"""
+        self.create_ui()
+        
+        try:
+            self.root.mainloop()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+    
+    def close(self):
+        """오버레이 종료"""
+        if self.root:
+            self._cancel_auto_hide()
+            self.config.cancel_scheduled_save(self.root)
+            self.root.quit()
+            self.root.destroy()
+        
+        self.config.save()
+
+# 테스트 코드
+if __name__ == "__main__":
+    def test_overlay():
+        overlay = TransparentOverlay()
+        
+        # 테스트용 자막 업데이트
+        def update_test_subtitles():
+            test_data = [
+                ("Hello, how are you?", "안녕하세요, 어떻게 지내세요?"),
+                ("This is a test.", "이것은 테스트입니다."),
+                ("Real-time translation works!", "실시간 번역이 작동합니다!"),
+                ("Press F1 for settings.", "F1을 눌러 설정을 열어보세요."),
+                ("Press Escape to exit.", "ESC를 눌러 종료하세요.")
+            ]
+            
+            def update_loop(index=0):
+                if index < len(test_data):
+                    original, translated = test_data[index]
+                    overlay.update_subtitle(original, translated)
+                    
+                    # 다음 업데이트 스케줄
+                    if overlay.root:
+                        overlay.root.after(4000, lambda: update_loop(index + 1))
+            
+            # 3초 후 시작
+            if overlay.root:
+                overlay.root.after(3000, update_loop)
+        
+        # 테스트 스레드 시작
+        import threading
+        threading.Thread(target=update_test_subtitles, daemon=True).start()
+        
+        # UI 실행
+        overlay.run()
+    
+    print("Testing overlay UI...")
+    print("Controls:")
+    print("- F1: Show settings")
+    print("- ESC: Close")
+    print("- Drag to move")
+    
     test_overlay()
\ No newline at end of file
@@ -1,361 +1,645 @@
-#!/usr/bin/env python3
-"""
-실시간 STT 모듈 - Whisper 기반
-기존 whisperwithgoogletrans2.py의 Whisper 로직을 실시간 처리에 최적화
-"""
-
-import whisper
-import torch
-import numpy as np
-import threading
-import queue
-import time
-import logging
-from typing import Optional, Callable, Dict, Any
-import tempfile
-import wave
-from pathlib import Path
-
-class RealtimeSTTConfig:
-    """실시간 STT 설정"""
-    def __init__(self):
-        # 기본값 설정
-        self.model_size = "medium"  # medium 모델로 더 높은 정확도
-        self.language = "ja"  # 일본어 (ISO 639-1 코드) - 기본값
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.sample_rate = 16000
-        self.min_audio_length = 1.0  # 최소 오디오 길이 (초)
-        self.max_audio_length = 10.0  # 최대 오디오 길이 (초)
-        self.initial_prompt = None
-
-        # 실시간 처리 최적화
-        self.enable_vad = True  # Voice Activity Detection
-        self.vad_threshold = 0.4
-        self.beam_size = 1  # 빠른 처리를 위해 beam search 최소화
-        self.patience = 1.0
-
-        # 후처리 필터
-        self.suppress_tokens = [
-            "Thank you", "Thanks for", "ubscribe", "my channel",
-            "for watching", "Amara", "視聴", "ご視聴"
-        ]
-
-        # config.json에서 설정 로드 시도
-        self.load_from_config()
-
-    def load_from_config(self):
-        """config.json에서 STT 설정 로드"""
-        try:
-            from pathlib import Path
-            import json
-
-            config_file = Path("config.json")
-            if not config_file.exists():
-                return  # config.json이 없으면 기본값 사용
-
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
-            # stt 섹션에서 설정 읽기
-            if "stt" in config:
-                stt_config = config["stt"]
-                self.model_size = stt_config.get("model_size", self.model_size)
-                self.language = stt_config.get("language", self.language)
-                self.device = stt_config.get("device", self.device)
-                self.min_audio_length = stt_config.get("min_audio_length", self.min_audio_length)
-                self.max_audio_length = stt_config.get("max_audio_length", self.max_audio_length)
-                self.initial_prompt = stt_config.get("initial_prompt", self.initial_prompt)
-
-        except Exception:
-            pass  # 로드 실패 시 기본값 사용
-
-class RealtimeSTT:
-    """실시간 Speech-to-Text 처리기"""
-    
-    def __init__(self, config: Optional[RealtimeSTTConfig] = None):
-        self.config = config or RealtimeSTTConfig()
-        self.model: Optional[whisper.Whisper] = None
-        
-        # 처리 큐
-        self.audio_queue = queue.Queue()
-        self.result_queue = queue.Queue()
-        
-        # 상태 관리
-        self.is_running = False
-        self.processing_thread: Optional[threading.Thread] = None
-        
-        # 콜백
-        self.on_transcription: Optional[Callable[[str], None]] = None
-        self.on_error: Optional[Callable[[str], None]] = None
-        
-        # 성능 모니터링
-        self.processing_times = []
-        self.last_result = ""
-        self.result_cache = {}
-        
-        # 로깅
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
-    
-    def load_model(self):
-        """Whisper 모델 로딩"""
-        if self.model is not None:
-            return
-            
-        try:
-            self.logger.info(f"Loading Whisper model: {self.config.model_size}")
-            start_time = time.time()
-            
-            self.model = whisper.load_model(
-                self.config.model_size,
-                device=self.config.device
-            )
-            
-            load_time = time.time() - start_time
-            self.logger.info(f"Model loaded in {load_time:.2f}s on {self.config.device}")
-            
-            # 모델 워밍업
-            self._warmup_model()
-            
-        except Exception as e:
-            error_msg = f"Failed to load Whisper model: {e}"
-            self.logger.error(error_msg)
-            if self.on_error:
-                self.on_error(error_msg)
-            raise
-    
-    def _warmup_model(self):
-        """모델 워밍업 (첫 추론 지연 최소화)"""
-        self.logger.info("Warming up model...")
-        
-        # 더미 오디오 생성 (1초, 무음)
-        dummy_audio = np.zeros(self.config.sample_rate, dtype=np.float32)
-        
-        try:
-            _ = self.model.transcribe(dummy_audio, language=self.config.language)
-            self.logger.info("Model warmup completed")
-        except Exception as e:
-            self.logger.warning(f"Model warmup failed: {e}")
-    
-    def _save_temp_audio(self, audio_data: np.ndarray) -> str:
-        """오디오 데이터를 임시 WAV 파일로 저장"""
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-            with wave.open(tmp_file.name, 'w') as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(self.config.sample_rate)
-                
-                # float32를 int16으로 변환
-                audio_int16 = (audio_data * 32767).astype(np.int16)
-                wf.writeframes(audio_int16.tobytes())
-            
-            return tmp_file.name
-    
-    def _filter_transcription(self, text: str) -> str:
-        """전사 결과 후처리"""
-        if not text or len(text.strip()) < 2:
-            return ""
-            
-        text = text.strip()
-        
-        # 억제할 토큰들 제거
-        for suppress_token in self.config.suppress_tokens:
-            if suppress_token.lower() in text.lower():
-                return ""
-        
-        # 반복 제거 (간단한 중복 감지)
-        if text == self.last_result:
-            return ""
-            
-        self.last_result = text
-        return text
-    
-    def _transcribe_audio(self, audio_data: np.ndarray) -> str:
-        """오디오 데이터를 텍스트로 변환"""
-        if self.model is None:
-            raise RuntimeError("Model not loaded")
-        
-        start_time = time.time()
-        
-        try:
-            # 오디오 길이 검증
-            duration = len(audio_data) / self.config.sample_rate
-            if duration < self.config.min_audio_length:
-                return ""
-            if duration > self.config.max_audio_length:
-                # 오디오를 최대 길이로 자르기
-                max_samples = int(self.config.max_audio_length * self.config.sample_rate)
-                audio_data = audio_data[-max_samples:]
-            
-            # Whisper 추론
-            result = self.model.transcribe(
-                audio_data,
-                language=self.config.language,
-                initial_prompt=self.config.initial_prompt,
-                word_timestamps=False,
-                verbose=False
-            )
-            
-            text = result["text"].strip()
-            
-            # 성능 모니터링
-            processing_time = time.time() - start_time
-            self.processing_times.append(processing_time)
-            if len(self.processing_times) > 10:
-                self.processing_times.pop(0)
-            
-            avg_time = sum(self.processing_times) / len(self.processing_times)
-            self.logger.debug(f"STT processing time: {processing_time:.2f}s (avg: {avg_time:.2f}s)")
-            
-            return self._filter_transcription(text)
-            
-        except Exception as e:
-            self.logger.error(f"Transcription error: {e}")
-            return ""
-    
-    def _processing_worker(self):
-        """백그라운드 처리 워커"""
-        self.logger.info("STT processing worker started")
-        
-        while self.is_running or not self.audio_queue.empty():
-            try:
-                # 큐에서 오디오 데이터 가져오기
-                audio_data = self.audio_queue.get(timeout=1.0)
-                
-                if audio_data is None:  # 종료 신호
-                    break
-                
-                # 전사 수행
-                text = self._transcribe_audio(audio_data)
-                
-                if text:
-                    self.logger.debug(f"Transcribed: {text}")
-                    
-                    # 결과 큐에 추가
-                    self.result_queue.put(text)
-                    
-                    # 콜백 호출
-                    if self.on_transcription:
-                        threading.Thread(
-                            target=self.on_transcription,
-                            args=(text,),
-                            daemon=True
-                        ).start()
-                
-                self.audio_queue.task_done()
-                
-            except queue.Empty:
-                continue
-            except Exception as e:
-                self.logger.error(f"Processing worker error: {e}")
-                if self.on_error:
-                    self.on_error(f"STT processing error: {e}")
-        
-        self.logger.info("STT processing worker stopped")
-    
-    def start(self):
-        """실시간 STT 시작"""
-        if self.is_running:
-            self.logger.warning("STT already running")
-            return
-        
-        # 모델 로딩
-        if self.model is None:
-            self.load_model()
-        
-        # 처리 스레드 시작
-        self.is_running = True
-        self.processing_thread = threading.Thread(
-            target=self._processing_worker,
-            daemon=True
-        )
-        self.processing_thread.start()
-        
-        self.logger.info("Realtime STT started")
-    
-    def stop(self):
-        """실시간 STT 중지"""
-        if not self.is_running:
-            return
-        
-        self.logger.info("Stopping realtime STT...")
-        
-        # 종료 신호
-        self.is_running = False
-        self.audio_queue.put(None)  # 종료 신호
-        
-        # 스레드 종료 대기
-        if self.processing_thread and self.processing_thread.is_alive():
-            self.processing_thread.join(timeout=5.0)
-        
-        self.logger.info("Realtime STT stopped")
-    
-    def process_audio(self, audio_data: np.ndarray):
-        """오디오 데이터 처리 요청"""
-        if not self.is_running:
-            self.logger.warning("STT not running")
-            return
-        
-        try:
-            # 큐에 오디오 데이터 추가
-            self.audio_queue.put(audio_data, timeout=1.0)
-        except queue.Full:
-            self.logger.warning("Audio queue full, dropping audio data")
-    
-    def get_result(self) -> Optional[str]:
-        """결과 큐에서 텍스트 가져오기"""
-        try:
-            return self.result_queue.get_nowait()
-        except queue.Empty:
-            return None
-    
-    def get_stats(self) -> Dict[str, Any]:
-        """성능 통계 반환"""
-        if not self.processing_times:
-            return {}
-        
-        return {
-            "avg_processing_time": sum(self.processing_times) / len(self.processing_times),
-            "queue_size": self.audio_queue.qsize(),
-            "result_queue_size": self.result_queue.qsize(),
-            "device": self.config.device,
-            "model": self.config.model_size
-        }
-
-# 테스트 코드
-if __name__ == "__main__":
-    def on_transcription_callback(text):
-        print(f"Transcribed: {text}")
-    
-    # STT 설정
-    config = RealtimeSTTConfig()
-    stt = RealtimeSTT(config)
-    stt.on_transcription = on_transcription_callback
-    
-    # 테스트용 더미 오디오 (실제로는 audio_capture.py에서 받아옴)
-    def generate_test_audio():
-        # 1초 사인파 생성
-        t = np.linspace(0, 1, 16000, False)
-        audio = np.sin(2 * np.pi * 440 * t).astype(np.float32)  # 440Hz
-        return audio
-    
-    print("Starting realtime STT test...")
-    stt.start()
-    
-    try:
-        # 5초간 테스트 오디오 전송
-        for i in range(5):
-            test_audio = generate_test_audio()
-            stt.process_audio(test_audio)
-            time.sleep(2)
-            
-            # 통계 출력
-            stats = stt.get_stats()
-            if stats:
-                print(f"Stats: {stats}")
-                
-    except KeyboardInterrupt:
-        print("\nStopping...")
-    finally:
-        stt.stop()
+#!/usr/bin/env python3
+"""
+실시간 STT 모듈 - Whisper 기반
+기존 whisperwithgoogletrans2.py의 Whisper 로직을 실시간 처리에 최적화
+"""
+
+import whisper
+import torch
+import numpy as np
+import threading
+import queue
+import time
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque, OrderedDict
+from typing import Optional, Callable, Dict, Any
+from pathlib import Path
+
+import _vad_kernel
+
+# CTranslate2 기반 Whisper 백엔드 (없으면 openai-whisper 사용)
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+# 빠른 비암호화 해시 (없으면 bytes 내장 hash 사용)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+class RealtimeSTTConfig:
+    """실시간 STT 설정"""
+    def __init__(self):
+        # 기본값 설정
+        self.model_size = "medium"  # medium 모델로 더 높은 정확도
+        self.language = "ja"  # 일본어 (ISO 639-1 코드) - 기본값
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.sample_rate = 16000
+        self.min_audio_length = 1.0  # 최소 오디오 길이 (초)
+        self.max_audio_length = 10.0  # 최대 오디오 길이 (초)
+        self.initial_prompt = None
+
+        # 추론 백엔드 ("faster-whisper": CTranslate2 int8 추론, "whisper": openai-whisper)
+        self.backend = "faster-whisper" if FASTER_WHISPER_AVAILABLE else "whisper"
+        self.compute_type = None  # faster-whisper 연산 타입 (None이면 GPU int8_float16, CPU int8)
+        self.inference_workers = 2  # faster-whisper 동시 추론 수 (2 이상이면 다음 발화 추론을 현재 발화와 겹쳐 수행)
+        self.quantize = True  # openai-whisper: GPU는 FP16 가중치, CPU는 Linear INT8 동적 양자화
+        self.compile_encoder = True  # openai-whisper + CUDA: 인코더 torch.compile (모델 로딩 시 컴파일 시간 추가)
+
+        # 실시간 처리 최적화
+        self.enable_vad = True  # Voice Activity Detection
+        self.vad_threshold = 0.4
+        self.drop_stale_audio = True  # 처리가 밀리면 대기 중인 오래된 세그먼트를 버리고 최신 세그먼트만 전사
+        # 가장 큰 블록의 RMS가 이 값 미만이면 Whisper 호출 없이 무음 처리 (캡처 측 무음 임계값과 같음, 0이면 비활성화)
+        self.silence_rms_threshold = 0.005
+        self.beam_size = 1  # 빠른 처리를 위해 beam search 최소화
+        self.patience = 1.0
+
+        # 후처리 필터
+        self.suppress_tokens = [
+            "Thank you", "Thanks for", "ubscribe", "my channel",
+            "for watching", "Amara", "視聴", "ご視聴"
+        ]
+        self.compile_suppress_tokens()
+
+        # config.json에서 설정 로드 시도
+        self.load_from_config()
+
+    def compile_suppress_tokens(self):
+        """suppress_tokens를 대소문자 무시 정규식 하나로 컴파일 (suppress_tokens 변경 후 다시 호출)"""
+        if self.suppress_tokens:
+            self.suppress_pattern = re.compile(
+                "|".join(re.escape(token) for token in self.suppress_tokens), re.IGNORECASE
+            )
+        else:
+            self.suppress_pattern = None
+
+    def load_from_config(self):
+        """config.json에서 STT 설정 로드"""
+        try:
+            from pathlib import Path
+            import json
+
+            config_file = Path("config.json")
+            if not config_file.exists():
+                return  # config.json이 없으면 기본값 사용
+
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+
+            # stt 섹션에서 설정 읽기
+            if "stt" in config:
+                stt_config = config["stt"]
+                self.model_size = stt_config.get("model_size", self.model_size)
+                self.language = stt_config.get("language", self.language)
+                self.device = stt_config.get("device", self.device)
+                self.min_audio_length = stt_config.get("min_audio_length", self.min_audio_length)
+                self.max_audio_length = stt_config.get("max_audio_length", self.max_audio_length)
+                self.initial_prompt = stt_config.get("initial_prompt", self.initial_prompt)
+                self.backend = stt_config.get("backend", self.backend)
+                self.compute_type = stt_config.get("compute_type", self.compute_type)
+                self.inference_workers = stt_config.get("inference_workers", self.inference_workers)
+                self.quantize = stt_config.get("quantize", self.quantize)
+                self.compile_encoder = stt_config.get("compile_encoder", self.compile_encoder)
+                self.drop_stale_audio = stt_config.get("drop_stale_audio", self.drop_stale_audio)
+                self.silence_rms_threshold = stt_config.get("silence_rms_threshold", self.silence_rms_threshold)
+
+        except Exception:
+            pass  # 로드 실패 시 기본값 사용
+
+class RealtimeSTT:
+    """실시간 Speech-to-Text 처리기"""
+
+    SILENCE_BLOCK = 1024  # 무음 판정 블록 크기 (캡처 청크와 같은 64ms)
+    STOP_TIMEOUT = 5.0  # stop()에서 처리 워커 종료를 기다리는 최대 시간 (초)
+    
+    def __init__(self, config: Optional[RealtimeSTTConfig] = None):
+        self.config = config or RealtimeSTTConfig()
+        self.model: Optional[Any] = None  # whisper.Whisper 또는 faster_whisper.WhisperModel
+        self.backend: Optional[str] = None  # 실제 로드된 백엔드
+        
+        # 처리 큐
+        self.audio_queue = queue.Queue()
+        self.result_queue = queue.Queue()
+        
+        # 상태 관리
+        self.is_running = False
+        self.processing_thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None  # faster-whisper 파이프라인 추론 스레드 풀
+        
+        # 콜백
+        self.on_transcription: Optional[Callable[[str], None]] = None  # 처리 워커에서 호출 (블로킹 금지)
+        self.on_error: Optional[Callable[[str], None]] = None
+        self.on_audio_consumed: Optional[Callable[[np.ndarray], None]] = None  # 오디오 버퍼 사용 완료 알림 (버퍼 풀 반환용)
+        
+        # 성능 모니터링
+        self.processing_times = deque(maxlen=10)  # 최근 10회 처리 시간
+        self.last_result = ""
+        self.result_cache: OrderedDict = OrderedDict()  # 오디오 해시 → 추론 결과 (LRU)
+        self.result_cache_size = 64
+        self._cache_lock = threading.Lock()  # 파이프라인 추론 스레드 간 캐시 보호
+
+        # CUDA 전송용 고정(pinned) 메모리 버퍼 - openai-whisper + CUDA에서 load_model 시 할당
+        self._pinned: Optional[torch.Tensor] = None
+        
+        # 로깅 (핸들러 설정은 실행 진입점에서)
+        self.logger = logging.getLogger(__name__)
+    
+    def load_model(self):
+        """Whisper 모델 로딩"""
+        if self.model is not None:
+            return
+            
+        try:
+            backend = self.config.backend
+            if backend == "faster-whisper" and not FASTER_WHISPER_AVAILABLE:
+                self.logger.warning("faster-whisper not installed, falling back to openai-whisper")
+                backend = "whisper"
+
+            self.logger.info(f"Loading Whisper model: {self.config.model_size} ({backend})")
+            start_time = time.time()
+            
+            if backend == "faster-whisper":
+                compute_type = self.config.compute_type or (
+                    "int8_float16" if self.config.device == "cuda" else "int8"
+                )
+                workers = max(1, self.config.inference_workers)
+                self.model = WhisperModel(
+                    self.config.model_size,
+                    device=self.config.device,
+                    compute_type=compute_type,
+                    cpu_threads=max(1, (os.cpu_count() or 1) // workers),
+                    num_workers=workers  # 여러 스레드에서 transcribe()를 동시에 호출 가능
+                )
+            else:
+                self.model = whisper.load_model(
+                    self.config.model_size,
+                    device=self.config.device
+                )
+                if self.config.quantize:
+                    self._reduce_whisper_precision()
+                if self.config.device == "cuda" and self.config.compile_encoder:
+                    self._compile_encoder()
+                if self.config.device == "cuda":
+                    # 30초 윈도우 크기로 한 번만 할당해 두고 매 발화 재사용 (비동기 H2D 복사 가능)
+                    self._pinned = torch.zeros(whisper.audio.N_SAMPLES, dtype=torch.float32).pin_memory()
+            self.backend = backend
+            
+            load_time = time.time() - start_time
+            self.logger.info(f"Model loaded in {load_time:.2f}s on {self.config.device}")
+            
+            # 모델 워밍업
+            self._warmup_model()
+            
+        except Exception as e:
+            error_msg = f"Failed to load Whisper model: {e}"
+            self.logger.error(error_msg)
+            if self.on_error:
+                self.on_error(error_msg)
+            raise
+    
+    def _reduce_whisper_precision(self):
+        """openai-whisper 가중치 정밀도 축소 (GPU: FP16, CPU: Linear INT8 동적 양자화)"""
+        if self.config.device == "cuda":
+            # 가중치를 FP16으로 보관해 호출마다 하던 FP32→FP16 변환 제거 (LayerNorm은 FP32 입력을 받으므로 FP32 유지)
+            self.model = self.model.half()
+            for module in self.model.modules():
+                if isinstance(module, torch.nn.LayerNorm):
+                    module.float()
+            self.logger.info("Whisper weights converted to FP16")
+        elif self.config.device == "cpu":
+            # whisper.model.Linear는 nn.Linear 하위 클래스라 양자화 대상에서 빠지므로 기본 클래스로 교체
+            # (CPU FP32에서는 dtype 변환만 하는 래퍼라 동작 동일)
+            for module in self.model.modules():
+                if isinstance(module, torch.nn.Linear):
+                    module.__class__ = torch.nn.Linear
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+            self.logger.info("Whisper Linear layers dynamically quantized to INT8")
+
+    def _compile_encoder(self):
+        """openai-whisper 인코더 torch.compile (입력 멜이 항상 30초 고정 크기라 CUDA 그래프 재생 가능)"""
+        if not hasattr(torch, "compile"):
+            self.logger.warning("torch.compile requires PyTorch 2.0+, encoder compile skipped")
+            return
+        # 실제 컴파일은 첫 호출(워밍업)에서 수행됨
+        self.model.encoder = torch.compile(self.model.encoder, mode="reduce-overhead")
+        self.logger.info("Whisper encoder compiled (reduce-overhead)")
+
+    def _warmup_model(self):
+        """모델 워밍업 (첫 추론 지연 최소화)"""
+        self.logger.info("Warming up model...")
+        
+        # 더미 오디오 생성 (1초, 무음)
+        dummy_audio = np.zeros(self.config.sample_rate, dtype=np.float32)
+        # 컴파일된 인코더는 첫 실행에서 컴파일, 두 번째 실행에서 CUDA 그래프 기록
+        compiled = hasattr(self.model, "encoder") and hasattr(self.model.encoder, "_orig_mod")
+        
+        try:
+            for _ in range(2 if compiled else 1):
+                self._run_inference(dummy_audio)
+            self.logger.info("Model warmup completed")
+        except Exception as e:
+            self.logger.warning(f"Model warmup failed: {e}")
+            if compiled:
+                # 컴파일 실패 시 원래 인코더로 복구
+                self.model.encoder = self.model.encoder._orig_mod
+                self.logger.warning("Falling back to eager Whisper encoder")
+    
+    def _filter_transcription(self, text: str) -> str:
+        """전사 결과 후처리 (last_result를 갱신하므로 결과 방출 순서대로 한 스레드에서만 호출)"""
+        if not text or len(text.strip()) < 2:
+            return ""
+            
+        text = text.strip()
+        
+        # 억제할 토큰이 포함되면 제거 (컴파일된 정규식 한 번으로 검사)
+        if self.config.suppress_pattern and self.config.suppress_pattern.search(text):
+            return ""
+        
+        # 반복 제거 (간단한 중복 감지)
+        if text == self.last_result:
+            return ""
+            
+        self.last_result = text
+        return text
+    
+    def _run_inference(self, audio_data: np.ndarray) -> str:
+        """로드된 백엔드로 추론 수행 후 전사 텍스트 반환
+
+        짧은 발화 단위이므로 greedy 디코딩 고정 (온도 폴백 재시도, 이전 문맥 조건, 타임스탬프 토큰 비활성화)
+        """
+        if self.backend == "faster-whisper":
+            segments, _ = self.model.transcribe(
+                audio_data,
+                language=self.config.language,
+                beam_size=self.config.beam_size,
+                best_of=1,
+                temperature=0.0,
+                condition_on_previous_text=False,
+                without_timestamps=True,
+                vad_filter=self.config.enable_vad,
+                vad_parameters={"threshold": self.config.vad_threshold},
+                initial_prompt=self.config.initial_prompt
+            )
+            # segments는 제너레이터 - 순회하는 동안 디코딩이 진행됨
+            return "".join(segment.text for segment in segments).strip()
+
+        # openai-whisper: transcribe()의 30초 윈도우 반복/폴백 루프 없이 단일 디코딩
+        # (발화는 max_audio_length 이하로 잘려 오므로 30초 윈도우 하나로 충분)
+        if self._pinned is not None:
+            # 고정 메모리 버퍼에서 패딩 후 non_blocking 전송 (pageable 메모리 경유 동기 복사 제거)
+            n = min(len(audio_data), self._pinned.shape[0])
+            self._pinned[:n].copy_(torch.from_numpy(audio_data[:n]))
+            self._pinned[n:].zero_()
+            audio = self._pinned.to(self.model.device, non_blocking=True)
+        else:
+            audio = whisper.pad_or_trim(torch.from_numpy(audio_data))
+        # 패딩된 오디오를 모델 장치로 옮긴 뒤 STFT/멜 필터 계산 (GPU에서 수행)
+        mel = whisper.log_mel_spectrogram(audio, self.model.dims.n_mels, device=self.model.device)
+        options = whisper.DecodingOptions(
+            language=self.config.language,
+            beam_size=self.config.beam_size if self.config.beam_size > 1 else None,  # 1이면 greedy 디코더
+            temperature=0.0,
+            prompt=self.config.initial_prompt,
+            without_timestamps=True,
+            fp16=(self.config.device == "cuda")
+        )
+        result = whisper.decode(self.model, mel, options)
+
+        # transcribe()와 같은 무음 판정 (무음 확률이 높고 신뢰도가 낮으면 버림)
+        if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+            return ""
+        return result.text.strip()
+
+    def _transcribe_audio(self, audio_data: np.ndarray) -> str:
+        """오디오 데이터를 텍스트로 변환 (후처리 전 원본 - 추론 스레드에서 동시에 호출될 수 있음)"""
+        if self.model is None:
+            raise RuntimeError("Model not loaded")
+        
+        start_time = time.time()
+        
+        try:
+            # 오디오 길이 검증
+            duration = len(audio_data) / self.config.sample_rate
+            if duration < self.config.min_audio_length:
+                return ""
+            if duration > self.config.max_audio_length:
+                # 오디오를 최대 길이로 자르기
+                max_samples = int(self.config.max_audio_length * self.config.sample_rate)
+                audio_data = audio_data[-max_samples:]
+
+            # 거의 무음이면 인코더/디코더를 돌리지 않고 바로 반환
+            # (세그먼트에는 발화 종료 전 침묵이 포함되므로 전체 평균이 아니라 가장 큰 블록으로 판단)
+            if (self.config.enable_vad
+                    and _vad_kernel.max_block_rms(audio_data, self.SILENCE_BLOCK) < self.config.silence_rms_threshold):
+                return ""
+            
+            # 같은 오디오가 다시 들어오면 캐시된 추론 결과 재사용
+            key = self._audio_key(audio_data)
+            with self._cache_lock:
+                text = self.result_cache.get(key)
+                if text is not None:
+                    self.result_cache.move_to_end(key)
+            if text is not None:
+                return text
+
+            # Whisper 추론
+            text = self._run_inference(audio_data)
+            with self._cache_lock:
+                self.result_cache[key] = text
+                if len(self.result_cache) > self.result_cache_size:
+                    self.result_cache.popitem(last=False)
+            
+            # 성능 모니터링
+            processing_time = time.time() - start_time
+            self.processing_times.append(processing_time)
+            
+            avg_time = sum(self.processing_times) / len(self.processing_times)
+            self.logger.debug(f"STT processing time: {processing_time:.2f}s (avg: {avg_time:.2f}s)")
+            
+            return text
+            
+        except Exception as e:
+            self.logger.error(f"Transcription error: {e}")
+            return ""
+    
+    @staticmethod
+    def _audio_key(audio_data: np.ndarray) -> int:
+        """결과 캐시 키 (오디오 샘플 전체의 해시)"""
+        audio_data = np.ascontiguousarray(audio_data)
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_intdigest(audio_data)
+        return hash(audio_data.tobytes())
+
+    def _processing_worker(self, executor: Optional[ThreadPoolExecutor] = None):
+        """백그라운드 처리 워커
+
+        추론 스레드 풀이 있으면 발화를 제출한 뒤 바로 다음 발화를 받아 추론을 겹쳐 수행하고,
+        결과는 제출 순서대로 내보냄. 스레드 풀은 이 워커가 끝날 때 직접 종료함
+        (stop()의 대기 시간을 넘겨 추론 중이어도 이후 제출이 실패하지 않도록).
+        """
+        self.logger.info("STT processing worker started")
+        in_flight = deque()  # (Future, 오디오) - 제출 순서
+        
+        while self.is_running or not self.audio_queue.empty():
+            try:
+                # 큐에서 오디오 데이터 가져오기 (진행 중인 추론이 있으면 짧게 기다리며 완료된 결과 방출)
+                try:
+                    audio_data = self.audio_queue.get(timeout=0.05 if in_flight else 1.0)
+                except queue.Empty:
+                    self._emit_completed(in_flight)
+                    continue
+                
+                if audio_data is None:  # 종료 신호
+                    break
+
+                # 밀린 세그먼트가 있으면 최신 오디오만 전사
+                stop_requested = False
+                if self.config.drop_stale_audio:
+                    audio_data, stop_requested = self._collapse_backlog(audio_data)
+                
+                # 전사 수행
+                if executor is not None:
+                    try:
+                        future = executor.submit(self._transcribe_audio, audio_data)
+                    except Exception:
+                        # 제출하지 못한 세그먼트는 여기서 반환 (풀 버퍼 누수 방지)
+                        self._release_audio(audio_data)
+                        raise
+                    in_flight.append((future, audio_data))
+                    # 동시 추론 한도를 넘으면 가장 오래된 결과부터 기다림
+                    self._emit_completed(in_flight, wait=len(in_flight) - self.config.inference_workers + 1)
+                else:
+                    try:
+                        text = self._transcribe_audio(audio_data)
+                    finally:
+                        self._release_audio(audio_data)
+                    self._emit_transcription(text)
+                
+                self.audio_queue.task_done()
+                if stop_requested:
+                    break
+                
+            except Exception as e:
+                self.logger.error(f"Processing worker error: {e}")
+                if self.on_error:
+                    self.on_error(f"STT processing error: {e}")
+
+        # 남은 추론 결과 방출
+        self._emit_completed(in_flight, wait=len(in_flight))
+
+        # 종료 신호 뒤에 들어온 오디오는 전사하지 않고 반환
+        self._drain_audio_queue()
+
+        if executor is not None:
+            executor.shutdown(wait=True)  # 진행 중인 추론은 위에서 모두 끝남
+            if self._executor is executor:
+                self._executor = None
+        
+        self.logger.info("STT processing worker stopped")
+
+    def _drain_audio_queue(self):
+        """처리 큐에 남은 오디오를 모두 꺼내 반환"""
+        while True:
+            try:
+                audio_data = self.audio_queue.get_nowait()
+            except queue.Empty:
+                return
+            if audio_data is not None:
+                self._release_audio(audio_data)
+
+    def _emit_completed(self, in_flight: deque, wait: int = 0):
+        """제출 순서대로 완료된 추론 결과 방출 (앞쪽 wait개는 완료될 때까지 기다림)"""
+        while in_flight and (wait > 0 or in_flight[0][0].done()):
+            future, audio_data = in_flight.popleft()
+            wait -= 1
+            try:
+                text = future.result()
+            finally:
+                self._release_audio(audio_data)
+            self._emit_transcription(text)
+
+    def _emit_transcription(self, text: str):
+        """전사 결과를 후처리해 결과 큐와 콜백으로 전달 (처리 워커에서 제출 순서대로 호출)"""
+        text = self._filter_transcription(text)
+        if not text:
+            return
+        self.logger.debug(f"Transcribed: {text}")
+        
+        # 결과 큐에 추가
+        self.result_queue.put(text)
+        
+        # 콜백 호출 (워커 스레드에서 직접 호출 - 콜백은 큐에 넣는 등 블로킹 없이 반환해야 함)
+        if self.on_transcription:
+            try:
+                self.on_transcription(text)
+            except Exception as e:
+                self.logger.error(f"Transcription callback error: {e}")
+    
+    def _collapse_backlog(self, audio_data: np.ndarray):
+        """대기 중인 세그먼트를 모두 꺼내 가장 최신 것만 남김
+
+        캡처 측 세그먼트는 링 버퍼의 "최근 N초" 창이라 서로 겹치므로 이어 붙이면 같은 오디오가 반복됨.
+        버려진 세그먼트는 여기서 반환 처리됨.
+
+        Returns:
+            (전사할 오디오, 종료 신호 수신 여부)
+        """
+        latest = audio_data
+        stop_requested = False
+        dropped = 0
+        while True:
+            try:
+                item = self.audio_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.audio_queue.task_done()
+            if item is None:  # 종료 신호 - 지금까지 꺼낸 것만 처리하고 종료
+                stop_requested = True
+                break
+            self._release_audio(latest)
+            latest = item
+            dropped += 1
+
+        if dropped:
+            self.logger.debug(f"STT backlog: dropped {dropped} stale segment(s)")
+        return latest, stop_requested
+
+    def start(self):
+        """실시간 STT 시작"""
+        if self.is_running:
+            self.logger.warning("STT already running")
+            return
+        
+        # 모델 로딩
+        if self.model is None:
+            self.load_model()
+        
+        # faster-whisper는 여러 스레드에서 동시 추론 가능 - 발화 간 추론을 겹치기 위한 스레드 풀
+        if self.backend == "faster-whisper" and self.config.inference_workers > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.config.inference_workers,
+                thread_name_prefix="stt-inference"
+            )
+        
+        # 처리 스레드 시작
+        self.is_running = True
+        self.processing_thread = threading.Thread(
+            target=self._processing_worker,
+            args=(self._executor,),
+            daemon=True
+        )
+        self.processing_thread.start()
+        
+        self.logger.info("Realtime STT started")
+    
+    def stop(self):
+        """실시간 STT 중지"""
+        if not self.is_running:
+            return
+        
+        self.logger.info("Stopping realtime STT...")
+        
+        # 종료 신호
+        self.is_running = False
+        self.audio_queue.put(None)  # 종료 신호
+        
+        # 스레드 종료 대기 (추론 스레드 풀은 처리 워커가 끝나면서 종료)
+        if self.processing_thread and self.processing_thread.is_alive():
+            self.processing_thread.join(timeout=self.STOP_TIMEOUT)
+            if self.processing_thread.is_alive():
+                self.logger.warning("STT processing worker still running, it will finish in the background")
+        
+        self.logger.info("Realtime STT stopped")
+    
+    def _release_audio(self, audio_data: np.ndarray):
+        """오디오 버퍼 사용 완료 알림"""
+        if self.on_audio_consumed:
+            try:
+                self.on_audio_consumed(audio_data)
+            except Exception as e:
+                self.logger.error(f"Audio release error: {e}")
+
+    def process_audio(self, audio_data: np.ndarray):
+        """오디오 데이터 처리 요청"""
+        if not self.is_running:
+            self.logger.warning("STT not running")
+            self._release_audio(audio_data)
+            return
+        
+        try:
+            # 큐에 오디오 데이터 추가
+            self.audio_queue.put(audio_data, timeout=1.0)
+        except queue.Full:
+            self.logger.warning("Audio queue full, dropping audio data")
+            self._release_audio(audio_data)
+    
+    def get_result(self) -> Optional[str]:
+        """결과 큐에서 텍스트 가져오기"""
+        try:
+            return self.result_queue.get_nowait()
+        except queue.Empty:
+            return None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """성능 통계 반환"""
+        if not self.processing_times:
+            return {}
+        
+        return {
+            "avg_processing_time": sum(self.processing_times) / len(self.processing_times),
+            "queue_size": self.audio_queue.qsize(),
+            "result_queue_size": self.result_queue.qsize(),
+            "device": self.config.device,
+            "model": self.config.model_size,
+            "backend": self.backend
+        }
+
+# 테스트 코드
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    def on_transcription_callback(text):
+        print(f"Transcribed: {text}")
+    
+    # STT 설정
+    config = RealtimeSTTConfig()
+    stt = RealtimeSTT(config)
+    stt.on_transcription = on_transcription_callback
+    
+    # 테스트용 더미 오디오 (실제로는 audio_capture.py에서 받아옴)
+    def generate_test_audio():
+        # 1초 사인파 생성
+        t = np.linspace(0, 1, 16000, False)
+        audio = np.sin(2 * np.pi * 440 * t).astype(np.float32)  # 440Hz
+        return audio
+    
+    print("Starting realtime STT test...")
+    stt.start()
+    
+    try:
+        # 5초간 테스트 오디오 전송
+        for i in range(5):
+            test_audio = generate_test_audio()
+            stt.process_audio(test_audio)
+            time.sleep(2)
+            
+            # 통계 출력
+            stats = stt.get_stats()
+            if stats:
+                print(f"Stats: {stats}")
+                
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        stt.stop()
         print("STT test completed.")
\ No newline at end of file
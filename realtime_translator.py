@@ -1,457 +1,1130 @@
-#!/usr/bin/env python3
-"""
-실시간 번역 모듈 - Hunyuan-MT-7B 기반
-기존 h5.py의 번역 로직을 실시간 처리에 최적화
-"""
-
-import json
-import re
-import time
-import threading
-import queue
-from pathlib import Path
-from typing import Dict, Optional, Callable
-from functools import lru_cache
-import logging
-import hashlib
-
-import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
-
-class RealtimeTranslatorConfig:
-    """실시간 번역 설정"""
-    def __init__(self):
-        # h5.py와 동일한 기본 설정
-        self.model_name = "tencent/Hunyuan-MT-7B"
-        self.max_new_tokens = 256
-        self.gen_args = dict(
-            top_k=20,
-            top_p=0.6,
-            temperature=0.7,
-            repetition_penalty=1.05,
-        )
-
-        # 언어 설정 (기본값)
-        self.source_language = "ja"  # 원문 언어
-        self.target_language = "ko"  # 번역 대상 언어
-
-        # 실시간 처리 최적화
-        self.use_cache = True
-        self.cache_dir = Path(".cache")
-        self.batch_size = 4  # 배치 처리
-        self.max_queue_size = 20
-        self.translation_timeout = 10.0
-
-        # 필터링
-        self.min_text_length = 2
-        self.max_text_length = 500
-        self.skip_duplicates = True
-
-        # 성능 최적화
-        self.use_amp = True  # Mixed precision
-        self.torch_dtype = torch.float16 if torch.cuda.is_available() else torch.float32
-
-        # config.json에서 설정 로드 시도
-        self.load_from_config()
-
-    def load_from_config(self):
-        """config.json에서 번역 설정 로드"""
-        try:
-            import json
-
-            config_file = Path("config.json")
-            if not config_file.exists():
-                return  # config.json이 없으면 기본값 사용
-
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
-            # translation 섹션에서 설정 읽기
-            if "translation" in config:
-                trans_config = config["translation"]
-                self.source_language = trans_config.get("source_language", self.source_language)
-                self.target_language = trans_config.get("target_language", self.target_language)
-                self.model_name = trans_config.get("model_name", self.model_name)
-                self.use_cache = trans_config.get("use_cache", self.use_cache)
-                self.batch_size = trans_config.get("batch_size", self.batch_size)
-
-        except Exception:
-            pass  # 로드 실패 시 기본값 사용
-
-class RealtimeTranslator:
-    """실시간 번역기 - h5.py 로직 기반"""
-    
-    def __init__(self, config: Optional[RealtimeTranslatorConfig] = None):
-        self.config = config or RealtimeTranslatorConfig()
-        
-        # 모델 및 토크나이저
-        self.tokenizer: Optional[AutoTokenizer] = None
-        self.model: Optional[AutoModelForCausalLM] = None
-        
-        # 캐싱 시스템 (h5.py와 동일)
-        self.cache_dir = self.config.cache_dir
-        self.cache_dir.mkdir(exist_ok=True)
-        self.translation_cache = self.load_cache() if self.config.use_cache else {}
-        
-        # 처리 큐
-        self.translation_queue = queue.Queue(maxsize=self.config.max_queue_size)
-        self.result_queue = queue.Queue()
-        
-        # 상태 관리
-        self.is_running = False
-        self.processing_threads = []
-        self.last_translated_text = ""
-        
-        # 성능 모니터링
-        self.translation_times = []
-        self.cache_hits = 0
-        self.cache_misses = 0
-        
-        # 콜백
-        self.on_translation: Optional[Callable[[str, str], None]] = None  # (original, translated)
-        self.on_error: Optional[Callable[[str], None]] = None
-        
-        # 로깅
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
-    
-    @lru_cache(maxsize=1000)
-    def get_cache_key(self, text: str) -> str:
-        """캐시 키 생성 - h5.py와 동일"""
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
-    
-    def load_cache(self) -> Dict[str, str]:
-        """캐시 로드 - h5.py와 동일"""
-        cache_file = self.cache_dir / "realtime_translation_cache.json"
-        if cache_file.exists():
-            try:
-                return json.loads(cache_file.read_text(encoding='utf-8'))
-            except Exception as e:
-                self.logger.warning(f"Failed to load cache: {e}")
-                return {}
-        return {}
-    
-    def save_cache(self):
-        """캐시 저장 - h5.py와 동일"""
-        if self.config.use_cache:
-            try:
-                cache_file = self.cache_dir / "realtime_translation_cache.json"
-                cache_file.write_text(
-                    json.dumps(self.translation_cache, ensure_ascii=False, indent=2),
-                    encoding='utf-8'
-                )
-                self.logger.debug(f"Cache saved: {len(self.translation_cache)} entries")
-            except Exception as e:
-                self.logger.error(f"Failed to save cache: {e}")
-    
-    def load_model(self):
-        """모델 로딩 - h5.py와 유사하지만 실시간 처리 최적화"""
-        if self.model is not None:
-            return
-        
-        try:
-            self.logger.info(f"Loading model: {self.config.model_name}")
-            start_time = time.time()
-            
-            self.tokenizer = AutoTokenizer.from_pretrained(self.config.model_name)
-            self.model = AutoModelForCausalLM.from_pretrained(
-                self.config.model_name,
-                torch_dtype=self.config.torch_dtype,
-                device_map="auto",
-            )
-            
-            load_time = time.time() - start_time
-            self.logger.info(f"Model loaded in {load_time:.2f}s on {self.model.device}")
-            
-            # 모델 워밍업
-            self._warmup_model()
-            
-        except Exception as e:
-            error_msg = f"Failed to load translation model: {e}"
-            self.logger.error(error_msg)
-            if self.on_error:
-                self.on_error(error_msg)
-            raise
-    
-    def _warmup_model(self):
-        """모델 워밍업"""
-        self.logger.info("Warming up translation model...")
-        try:
-            dummy_text = "Hello world"
-            _ = self.translate_text(dummy_text)
-            self.logger.info("Translation model warmup completed")
-        except Exception as e:
-            self.logger.warning(f"Model warmup failed: {e}")
-    
-    def translate_text(self, text: str) -> str:
-        """
-        텍스트 번역 - h5.py의 translate_block_text와 100% 동일한 로직
-        """
-        if not text or len(text.strip()) < self.config.min_text_length:
-            return ""
-        
-        text = text.strip()
-        if len(text) > self.config.max_text_length:
-            text = text[:self.config.max_text_length]
-        
-        # 중복 필터링
-        if self.config.skip_duplicates and text == self.last_translated_text:
-            return ""
-        
-        # 캐시 확인
-        cache_key = None
-        if self.config.use_cache:
-            cache_key = self.get_cache_key(text)
-            if cache_key in self.translation_cache:
-                self.cache_hits += 1
-                self.last_translated_text = text
-                return self.translation_cache[cache_key]
-        
-        self.cache_misses += 1
-        
-        if self.model is None or self.tokenizer is None:
-            raise RuntimeError("Model not loaded")
-        
-        start_time = time.time()
-        
-        try:
-            # 언어 이름 매핑 (ISO 639-1 코드 → 영어 이름)
-            language_names = {
-                "ja": "Japanese", "ko": "Korean", "en": "English",
-                "zh": "Chinese", "es": "Spanish", "fr": "French",
-                "de": "German", "ru": "Russian", "ar": "Arabic",
-                "pt": "Portuguese", "it": "Italian"
-            }
-
-            source_lang_name = language_names.get(self.config.source_language, self.config.source_language)
-            target_lang_name = language_names.get(self.config.target_language, self.config.target_language)
-
-            # 동적 번역 프롬프트 생성
-            prompt = (
-                f"Translate the following {source_lang_name} text into {target_lang_name}. "
-                f"Provide natural and accurate {target_lang_name} translation. "
-                "Keep the original line breaks. Do not add any explanation.\n\n"
-                f"{text}"
-            )
-            messages = [{"role": "user", "content": prompt}]
-            
-            inputs = self.tokenizer.apply_chat_template(
-                messages,
-                tokenize=True,
-                add_generation_prompt=False,
-                return_tensors="pt",
-            )
-            
-            inputs = inputs.to(self.model.device)
-            
-            with torch.no_grad():
-                if self.config.use_amp:
-                    with torch.cuda.amp.autocast():
-                        outputs = self.model.generate(
-                            inputs,
-                            max_new_tokens=self.config.max_new_tokens,
-                            **self.config.gen_args,
-                        )
-                else:
-                    outputs = self.model.generate(
-                        inputs,
-                        max_new_tokens=self.config.max_new_tokens,
-                        **self.config.gen_args,
-                    )
-            
-            out_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            
-            # h5.py와 동일한 후처리
-            if text in out_text:
-                out_text = out_text.split(text, 1)[-1].strip()
-            
-            out_text = out_text.strip().strip('"').strip()
-            
-            # 캐시 저장
-            if self.config.use_cache and cache_key:
-                self.translation_cache[cache_key] = out_text
-            
-            # 성능 모니터링
-            processing_time = time.time() - start_time
-            self.translation_times.append(processing_time)
-            if len(self.translation_times) > 10:
-                self.translation_times.pop(0)
-            
-            self.last_translated_text = text
-            self.logger.debug(f"Translation time: {processing_time:.2f}s")
-            
-            return out_text
-            
-        except Exception as e:
-            self.logger.error(f"Translation error: {e}")
-            return text  # 번역 실패시 원문 반환
-    
-    def _translation_worker(self):
-        """번역 워커 스레드"""
-        self.logger.info("Translation worker started")
-        
-        while self.is_running or not self.translation_queue.empty():
-            try:
-                # 큐에서 텍스트 가져오기
-                item = self.translation_queue.get(timeout=1.0)
-                
-                if item is None:  # 종료 신호
-                    break
-                
-                original_text = item
-                
-                # 번역 수행
-                translated_text = self.translate_text(original_text)
-                
-                if translated_text:
-                    # 결과 큐에 추가
-                    self.result_queue.put((original_text, translated_text))
-                    
-                    # 콜백 호출
-                    if self.on_translation:
-                        threading.Thread(
-                            target=self.on_translation,
-                            args=(original_text, translated_text),
-                            daemon=True
-                        ).start()
-                
-                self.translation_queue.task_done()
-                
-            except queue.Empty:
-                continue
-            except Exception as e:
-                self.logger.error(f"Translation worker error: {e}")
-                if self.on_error:
-                    self.on_error(f"Translation error: {e}")
-        
-        self.logger.info("Translation worker stopped")
-    
-    def start(self, num_workers: int = 2):
-        """실시간 번역 시작"""
-        if self.is_running:
-            self.logger.warning("Translator already running")
-            return
-        
-        # 모델 로딩
-        if self.model is None:
-            self.load_model()
-        
-        # 워커 스레드 시작
-        self.is_running = True
-        for i in range(num_workers):
-            worker = threading.Thread(
-                target=self._translation_worker,
-                name=f"TranslationWorker-{i}",
-                daemon=True
-            )
-            worker.start()
-            self.processing_threads.append(worker)
-        
-        self.logger.info(f"Realtime translator started with {num_workers} workers")
-    
-    def stop(self):
-        """실시간 번역 중지"""
-        if not self.is_running:
-            return
-        
-        self.logger.info("Stopping realtime translator...")
-        
-        # 종료 신호
-        self.is_running = False
-        for _ in self.processing_threads:
-            self.translation_queue.put(None)
-        
-        # 스레드 종료 대기
-        for thread in self.processing_threads:
-            if thread.is_alive():
-                thread.join(timeout=5.0)
-        
-        self.processing_threads.clear()
-        
-        # 캐시 저장
-        self.save_cache()
-        
-        self.logger.info("Realtime translator stopped")
-    
-    def translate_async(self, text: str):
-        """비동기 번역 요청"""
-        if not self.is_running:
-            self.logger.warning("Translator not running")
-            return
-        
-        if not text or len(text.strip()) < self.config.min_text_length:
-            return
-        
-        try:
-            self.translation_queue.put(text.strip(), timeout=1.0)
-        except queue.Full:
-            self.logger.warning("Translation queue full, dropping request")
-    
-    def get_result(self) -> Optional[tuple]:
-        """결과 큐에서 번역 결과 가져오기"""
-        try:
-            return self.result_queue.get_nowait()
-        except queue.Empty:
-            return None
-    
-    def get_stats(self) -> Dict:
-        """성능 통계 반환"""
-        total_cache_requests = self.cache_hits + self.cache_misses
-        cache_hit_rate = self.cache_hits / total_cache_requests if total_cache_requests > 0 else 0
-        
-        avg_translation_time = 0
-        if self.translation_times:
-            avg_translation_time = sum(self.translation_times) / len(self.translation_times)
-        
-        return {
-            "cache_hit_rate": cache_hit_rate,
-            "cache_entries": len(self.translation_cache),
-            "avg_translation_time": avg_translation_time,
-            "queue_size": self.translation_queue.qsize(),
-            "result_queue_size": self.result_queue.qsize(),
-            "cache_hits": self.cache_hits,
-            "cache_misses": self.cache_misses
-        }
-
-# 테스트 코드
-if __name__ == "__main__":
-    def on_translation_callback(original, translated):
-        print(f"Original: {original}")
-        print(f"Translated: {translated}")
-        print("-" * 50)
-    
-    # 번역기 설정
-    config = RealtimeTranslatorConfig()
-    translator = RealtimeTranslator(config)
-    translator.on_translation = on_translation_callback
-    
-    # 테스트 텍스트
-    test_texts = [
-        "Hello, how are you?",
-        "This is a test sentence.",
-        "I love machine learning.",
-        "Python is a great programming language.",
-        "Real-time translation is amazing!"
-    ]
-    
-    print("Starting realtime translator test...")
-    translator.start()
-    
-    try:
-        # 테스트 텍스트들 번역 요청
-        for text in test_texts:
-            translator.translate_async(text)
-            time.sleep(2)
-            
-            # 통계 출력
-            stats = translator.get_stats()
-            print(f"Stats: {stats}")
-        
-        # 잠시 기다려서 모든 번역 완료
-        time.sleep(5)
-        
-    except KeyboardInterrupt:
-        print("\nStopping...")
-    finally:
-        translator.stop()
+#!/usr/bin/env python3
+"""
+실시간 번역 모듈 - Hunyuan-MT-7B 기반
+기존 h5.py의 번역 로직을 실시간 처리에 최적화
+"""
+
+import contextlib
+import copy
+import json
+import re
+import sqlite3
+import time
+import threading
+import queue
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Callable
+import logging
+import hashlib
+
+import torch
+from transformers import (
+    AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig,
+    StoppingCriteria, StoppingCriteriaList
+)
+
+# 가중치 양자화 (없으면 설정된 정밀도로 로드)
+try:
+    import bitsandbytes  # noqa: F401
+    BNB_AVAILABLE = True
+except ImportError:
+    BNB_AVAILABLE = False
+
+# FlashAttention-2 커널 (없으면 PyTorch SDPA 사용)
+try:
+    import flash_attn  # noqa: F401
+    FLASH_ATTN_AVAILABLE = True
+except ImportError:
+    FLASH_ATTN_AVAILABLE = False
+
+# KV 캐시 양자화 백엔드 (없으면 KV 캐시를 모델 정밀도로 유지)
+try:
+    try:
+        import optimum.quanto  # noqa: F401
+    except ImportError:
+        import quanto  # noqa: F401
+    QUANTO_AVAILABLE = True
+except ImportError:
+    QUANTO_AVAILABLE = False
+try:
+    import hqq  # noqa: F401
+    HQQ_AVAILABLE = True
+except ImportError:
+    HQQ_AVAILABLE = False
+try:
+    from transformers import QuantizedCacheConfig
+except ImportError:
+    QuantizedCacheConfig = None  # 최신 transformers는 dict 설정을 그대로 받음
+
+# 빠른 비암호화 해시 (없으면 hashlib.blake2b 8바이트 다이제스트 사용)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# 캐시 키용 64비트 해시 함수 (호출마다 백엔드 분기하지 않도록 한 번만 선택)
+if XXHASH_AVAILABLE:
+    _hash64 = xxhash.xxh3_64_intdigest
+else:
+    def _hash64(data: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+# 번역 결과 앞뒤의 공백/큰따옴표 제거 (h5.py 후처리의 strip 조합을 한 번에)
+_OUTPUT_TRIM_RE = re.compile(r'^\s*"*\s*|\s*"*\s*$')
+
+# 문장 경계 (전각 。？！는 바로, ASCII ?!.는 뒤에 공백이 올 때만 - "3.5", "음..." 같은 문장 안의 마침표 제외)
+# 원문은 텍스트 끝도 경계로 보지만, 생성 중에는 다음 토큰을 봐야 알 수 있으므로 공백이 나올 때까지 기다림
+_SOURCE_SENTENCE_END_RE = re.compile(r"[。？！]+\s*|(?:[?!]+|(?<!\.)\.)(?:\s+|$)|\n\n+")
+_GENERATED_SENTENCE_END_RE = re.compile(r"[。？！]+\s*|(?:[?!]+|(?<!\.)\.)\s+|\n\n+")
+
+class SentenceEndStoppingCriteria(StoppingCriteria):
+    """원문 문장 수만큼 문장 경계가 생성되면 생성 중지 (EOS 전에 덧붙는 군더더기 생성 방지)
+
+    ASCII 부호 뒤 공백으로 경계를 확인하면 다음 문장의 첫 토큰까지 생성된 상태이므로
+    overshoot가 True가 되고, 호출 측에서 마지막 토큰을 버려야 함 (단일 시퀀스 생성 전용).
+    """
+
+    def __init__(self, tokenizer, sentence_count: int, prompt_len: int):
+        self.tokenizer = tokenizer
+        self.sentence_count = sentence_count
+        self.prompt_len = prompt_len
+        self.overshoot = False
+
+    @staticmethod
+    def count_sentences(text: str) -> int:
+        """원문 문장 수 (끝 부호 없이 끝나는 마지막 문장도 한 문장으로 셈)"""
+        ends = list(_SOURCE_SENTENCE_END_RE.finditer(text))
+        trailing = text[ends[-1].end():] if ends else text
+        return len(ends) + bool(trailing.strip())
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> bool:
+        # 토큰 하나만 디코딩하면 SentencePiece 앞 공백이 사라지므로 생성 부분 전체를 디코딩 (발화 단위라 짧음)
+        generated = self.tokenizer.decode(input_ids[0, self.prompt_len:], skip_special_tokens=True)
+        ends = list(_GENERATED_SENTENCE_END_RE.finditer(generated))
+        if len(ends) < self.sentence_count:
+            return False
+        # 경계 뒤에 다음 문장 글자가 이미 생성되었으면 마지막 토큰은 출력에서 제외
+        self.overshoot = bool(generated[ends[-1].end():].strip())
+        return True
+
+class RealtimeTranslatorConfig:
+    """실시간 번역 설정"""
+    def __init__(self):
+        # h5.py와 동일한 기본 설정
+        self.model_name = "tencent/Hunyuan-MT-7B"
+        self.max_new_tokens = 256
+        # 생성 상한을 본문 토큰 수 × 비율 + 16으로 줄임 (max_new_tokens를 넘지 않음, 0이면 항상 max_new_tokens)
+        self.max_new_tokens_ratio = 1.5
+        self.stop_at_sentence_end = True  # 원문 문장 수만큼 문장이 끝나면 EOS를 기다리지 않고 중지
+        self.gen_args = dict(
+            top_k=20,
+            top_p=0.6,
+            temperature=0.7,
+            repetition_penalty=1.05,
+            use_cache=True,  # 디코딩 단계에서 KV 캐시 재사용 (토큰마다 프롬프트 전체 재계산 방지)
+        )
+
+        # 언어 설정 (기본값)
+        self.source_language = "ja"  # 원문 언어
+        self.target_language = "ko"  # 번역 대상 언어
+
+        # 실시간 처리 최적화
+        self.use_cache = True
+        self.cache_dir = Path(".cache")
+        self.batch_size = 4  # 배치 처리
+        self.max_queue_size = 20
+        self.translation_timeout = 10.0
+
+        # 필터링
+        self.min_text_length = 2
+        self.max_text_length = 500
+        self.skip_duplicates = True
+
+        # 성능 최적화
+        self.reuse_prompt_prefix = True  # 고정 지시문 접두부의 KV 캐시를 한 번만 계산해 매 번역에 재사용
+        # 모델 forward를 torch.compile + 정적 KV 캐시로 CUDA 그래프 재생 (CUDA 전용, 워밍업 시간 증가,
+        # 켜면 접두부 캐시 재사용은 꺼지고 생성은 한 번에 하나씩 수행)
+        self.compile_model = False
+        # generate의 GPU 시간을 CUDA 이벤트로 측정 (디버그용 - 매번 동기화하므로 파이프라인 겹침이 사라짐)
+        self.profile_gpu_time = False
+        # 모델 가중치 정밀도 (bf16 지원 GPU는 bf16 - fp16보다 오버플로에 강함)
+        if torch.cuda.is_available():
+            self.torch_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        else:
+            self.torch_dtype = torch.float32
+        # 가중치 전용 양자화 ("nf4", "int8", "none", None이면 24GB 미만 GPU에서 nf4)
+        self.quantization: Optional[str] = None
+        # 생성 중 KV 캐시 양자화 비트 수 (0이면 끔, quanto: 2/4, HQQ: 1/2/3/4/8 - 켜면 접두부 캐시 재사용은 꺼짐)
+        self.kv_cache_bits = 0
+        # 어텐션 구현 ("flash_attention_2", "sdpa", "eager", None이면 가능한 가장 빠른 것)
+        self.attn_implementation: Optional[str] = None
+
+        # config.json에서 설정 로드 시도
+        self.load_from_config()
+
+    def load_from_config(self):
+        """config.json에서 번역 설정 로드"""
+        try:
+            import json
+
+            config_file = Path("config.json")
+            if not config_file.exists():
+                return  # config.json이 없으면 기본값 사용
+
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+
+            # translation 섹션에서 설정 읽기
+            if "translation" in config:
+                trans_config = config["translation"]
+                self.source_language = trans_config.get("source_language", self.source_language)
+                self.target_language = trans_config.get("target_language", self.target_language)
+                self.model_name = trans_config.get("model_name", self.model_name)
+                self.use_cache = trans_config.get("use_cache", self.use_cache)
+                self.batch_size = trans_config.get("batch_size", self.batch_size)
+                self.quantization = trans_config.get("quantization", self.quantization)
+                self.compile_model = trans_config.get("compile_model", self.compile_model)
+                self.attn_implementation = trans_config.get("attn_implementation", self.attn_implementation)
+                self.kv_cache_bits = trans_config.get("kv_cache_bits", self.kv_cache_bits)
+
+        except Exception:
+            pass  # 로드 실패 시 기본값 사용
+
+class TranslationCacheStore:
+    """번역 캐시 저장소 - 조회는 메모리 dict, 디스크(SQLite) 쓰기는 백그라운드 스레드에서 묶어서 수행
+
+    키는 RealtimeTranslator.get_cache_key()의 64비트 부호 없는 정수.
+    """
+
+    WRITE_BATCH = 100  # 트랜잭션 하나에 묶는 최대 쓰기 수
+
+    def __init__(self, db_path: Path, legacy_json: Optional[Path] = None):
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        self._entries: Dict[int, str] = {}
+        self._write_queue = queue.Queue()
+
+        is_new = not db_path.exists()
+        try:
+            conn = sqlite3.connect(str(db_path))
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS translations (key INTEGER PRIMARY KEY, value TEXT NOT NULL)")
+                for key, value in conn.execute("SELECT key, value FROM translations"):
+                    self._entries[self._from_db_key(key)] = value
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to load cache: {e}")
+
+        # 예전 JSON 캐시는 새 DB를 만들 때 한 번만 가져옴 (정수 키가 아닌 MD5 키 항목은 버림)
+        if is_new and legacy_json is not None and legacy_json.exists():
+            try:
+                data = json.loads(legacy_json.read_text(encoding='utf-8'))
+                for key, value in data.items():
+                    if key.isdigit() and int(key) < 1 << 64:
+                        self[int(key)] = value
+            except Exception as e:
+                self.logger.warning(f"Failed to import legacy cache: {e}")
+
+        self._writer = threading.Thread(target=self._write_worker, name="TranslationCacheWriter", daemon=True)
+        self._writer.start()
+
+    @staticmethod
+    def _to_db_key(key: int) -> int:
+        """부호 없는 64비트 키 → SQLite INTEGER (부호 있는 64비트)"""
+        return key - (1 << 64) if key >= 1 << 63 else key
+
+    @staticmethod
+    def _from_db_key(key: int) -> int:
+        return key + (1 << 64) if key < 0 else key
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: int) -> str:
+        return self._entries[key]
+
+    def __setitem__(self, key: int, value: str):
+        self._entries[key] = value
+        self._write_queue.put((self._to_db_key(key), value))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def flush(self):
+        """대기 중인 쓰기가 디스크에 반영될 때까지 대기"""
+        self._write_queue.join()
+
+    def _write_worker(self):
+        """쓰기 큐를 모아 트랜잭션 단위로 저장"""
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            while True:
+                rows = [self._write_queue.get()]
+                while len(rows) < self.WRITE_BATCH:
+                    try:
+                        rows.append(self._write_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO translations (key, value) VALUES (?, ?)", rows
+                        )
+                except sqlite3.Error as e:
+                    self.logger.error(f"Failed to save cache: {e}")
+                finally:
+                    for _ in rows:
+                        self._write_queue.task_done()
+        finally:
+            conn.close()
+
+class RealtimeTranslator:
+    """실시간 번역기 - h5.py 로직 기반"""
+
+    TEXT_PLACEHOLDER = "<<<TEXT>>>"  # 템플릿 렌더링 시 본문 위치 표시
+    QUANTIZATION_MODES = ("nf4", "int8", "none")  # config.quantization에 허용되는 값 (None은 자동)
+    
+    def __init__(self, config: Optional[RealtimeTranslatorConfig] = None):
+        self.config = config or RealtimeTranslatorConfig()
+        
+        # 모델 및 토크나이저
+        self.tokenizer: Optional[AutoTokenizer] = None
+        self.model: Optional[AutoModelForCausalLM] = None
+        
+        # 캐싱 시스템 (h5.py와 동일)
+        self.cache_dir = self.config.cache_dir
+        self.cache_dir.mkdir(exist_ok=True)
+        self.translation_cache = self.load_cache() if self.config.use_cache else {}
+        
+        # 처리 큐
+        # 번역 요청 (왼쪽에 넣고 오른쪽에서 꺼냄 - 락 없는 deque, 새 요청은 이벤트로 토큰화 스레드를 깨움)
+        self._pending = deque()
+        self._work_event = threading.Event()
+        self.result_queue = queue.Queue()
+        # 파이프라인 단계 사이 큐 (토큰화 → 생성 → 디코딩, 생성 대기는 조금만 쌓아 배치가 커질 여지를 남김)
+        self._generate_queue = queue.Queue(maxsize=2)
+        self._detokenize_queue = queue.Queue()
+        
+        # 상태 관리
+        self.is_running = False
+        self.processing_threads = []
+        self._callback_thread: Optional[threading.Thread] = None
+        self.last_translated_text = ""
+        self._pending_keys = set()  # 큐에 넣었지만 아직 결과를 내지 않은 텍스트의 캐시 키
+        # _pending_keys / last_translated_text 보호 (요청 스레드, 토큰화 스레드, 디코딩 스레드가 공유)
+        self._state_lock = threading.Lock()
+
+        # 프롬프트 접두부 KV 캐시 ((원문 언어, 대상 언어), (접두부 토큰, past_key_values) 또는 None)
+        self._prefix_cache: Optional[tuple] = None
+        self._prefix_lock = threading.Lock()
+        # 채팅 템플릿 앞/뒤 고정 부분 토큰 ((원문 언어, 대상 언어), (앞 토큰, 뒤 토큰))
+        self._template_cache: Optional[tuple] = None
+
+        # 컴파일된 모델은 정적 캐시를 모델에 보관하므로 생성을 직렬화 (컴파일 시에만 사용)
+        self._generate_lock: Optional[threading.Lock] = None
+        
+        # 성능 모니터링
+        self.translation_times = deque(maxlen=10)  # 최근 10회 번역 시간 (초)
+        self.gpu_times = deque(maxlen=10)  # 최근 10회 generate GPU 시간 (초, profile_gpu_time일 때만)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # 콜백
+        self.on_translation: Optional[Callable[[str, str], None]] = None  # (original, translated)
+        self.on_error: Optional[Callable[[str], None]] = None
+        
+        # 로깅
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(__name__)
+    
+    @staticmethod
+    def get_cache_key(text: str) -> int:
+        """캐시 키 생성 (텍스트의 64비트 해시 - 16진 문자열 변환 없이 정수 그대로 사용)"""
+        return _hash64(text.encode('utf-8'))
+    
+    def load_cache(self) -> TranslationCacheStore:
+        """캐시 로드 (SQLite 저장소 열기, 처음 만들 때 예전 JSON 캐시를 가져옴)"""
+        return TranslationCacheStore(
+            self.cache_dir / "realtime_translation_cache.sqlite3",
+            legacy_json=self.cache_dir / "realtime_translation_cache.json"
+        )
+    
+    def save_cache(self):
+        """캐시 저장 (번역마다 백그라운드에서 저장되므로 남은 쓰기만 마무리)"""
+        if isinstance(self.translation_cache, TranslationCacheStore):
+            self.translation_cache.flush()
+            self.logger.debug(f"Cache saved: {len(self.translation_cache)} entries")
+    
+    def load_model(self):
+        """모델 로딩 - h5.py와 유사하지만 실시간 처리 최적화"""
+        if self.model is not None:
+            return
+        
+        try:
+            self.logger.info(f"Loading model: {self.config.model_name}")
+            start_time = time.time()
+            
+            self.tokenizer = AutoTokenizer.from_pretrained(self.config.model_name)
+            # 배치 생성 패딩 토큰
+            if self.tokenizer.pad_token is None:
+                self.tokenizer.pad_token = self.tokenizer.eos_token
+            load_kwargs = dict(
+                torch_dtype=self.config.torch_dtype,
+                device_map="auto",
+                quantization_config=self._quantization_config(),
+            )
+            attn_impl = self._attn_implementation()
+            try:
+                self.model = AutoModelForCausalLM.from_pretrained(
+                    self.config.model_name, attn_implementation=attn_impl, **load_kwargs
+                )
+            except (ImportError, ValueError, TypeError) as e:
+                # 모델/transformers 버전이 해당 구현을 지원하지 않으면 기본 어텐션으로 로드
+                self.logger.warning(f"Attention implementation '{attn_impl}' unavailable, using default: {e}")
+                self.model = AutoModelForCausalLM.from_pretrained(self.config.model_name, **load_kwargs)
+            # 모델 설정에서 KV 캐시가 꺼져 있어도 생성 시 항상 사용
+            self.model.config.use_cache = True
+            if getattr(self.model, "generation_config", None) is not None:
+                self.model.generation_config.use_cache = True
+
+            if self.config.kv_cache_bits:
+                self._enable_kv_cache_quantization()
+            if self.config.compile_model:
+                self._compile_model()
+            
+            load_time = time.time() - start_time
+            self.logger.info(
+                f"Model loaded in {load_time:.2f}s on {self.model.device} "
+                f"(attention: {getattr(self.model.config, '_attn_implementation', 'default')})"
+            )
+            
+            # 모델 워밍업
+            self._warmup_model()
+            
+        except Exception as e:
+            error_msg = f"Failed to load translation model: {e}"
+            self.logger.error(error_msg)
+            if self.on_error:
+                self.on_error(error_msg)
+            raise
+    
+    def _enable_kv_cache_quantization(self):
+        """생성 중 KV 캐시를 정수로 양자화 (디코딩 스텝마다 읽는 KV 메모리 감소) - 지원되지 않으면 그대로 둠"""
+        bits = self.config.kv_cache_bits
+        if self.config.compile_model:
+            self.logger.warning("KV cache quantization skipped: compiled model uses a static cache")
+            return
+        if bits in (2, 4) and QUANTO_AVAILABLE:
+            backend = "quanto"
+        elif bits in (1, 2, 3, 4, 8) and HQQ_AVAILABLE:
+            backend = "HQQ"
+        else:
+            self.logger.warning(f"KV cache quantization skipped: no backend for {bits}-bit (install optimum-quanto or hqq)")
+            return
+        
+        generation_config = self.model.generation_config
+        previous = (generation_config.cache_implementation, getattr(generation_config, "cache_config", None))
+        generation_config.cache_implementation = "quantized"
+        if QuantizedCacheConfig is not None:
+            generation_config.cache_config = QuantizedCacheConfig(backend=backend, nbits=bits)
+        else:
+            generation_config.cache_config = {"backend": backend, "nbits": bits}
+        try:
+            # 설정 오류는 generate 호출 시에야 드러나므로 짧게 한 번 생성해 확인
+            probe = self.tokenizer("Hello", return_tensors="pt").input_ids.to(self.model.device)
+            with torch.inference_mode():
+                self.model.generate(probe, max_new_tokens=2)
+        except Exception as e:
+            generation_config.cache_implementation, generation_config.cache_config = previous
+            self.logger.warning(f"KV cache quantization disabled: {e}")
+            return
+        
+        # 접두부 KV 캐시(일반 캐시)는 양자화 캐시와 함께 넘길 수 없으므로 재사용 비활성화
+        self.config.reuse_prompt_prefix = False
+        self.logger.info(f"KV cache quantized to {bits}-bit ({backend})")
+
+    def _attn_implementation(self) -> str:
+        """사용할 어텐션 구현 (FlashAttention-2는 CUDA + fp16/bf16 가중치에서만)"""
+        if self.config.attn_implementation:
+            return self.config.attn_implementation
+        if (
+            FLASH_ATTN_AVAILABLE
+            and torch.cuda.is_available()
+            and self.config.torch_dtype in (torch.float16, torch.bfloat16)
+            and not self.config.compile_model  # 정적 KV 캐시는 SDPA로
+        ):
+            return "flash_attention_2"
+        return "sdpa"
+
+    def _quantization_config(self) -> Optional[BitsAndBytesConfig]:
+        """설정에 따른 bitsandbytes 가중치 양자화 설정 (양자화하지 않으면 None)"""
+        mode = self.config.quantization
+        auto = mode is None
+        if auto:
+            # 자동: 7B fp16 가중치(~14GB)가 빠듯한 24GB 미만 GPU에서만 NF4
+            if not torch.cuda.is_available():
+                return None
+            total_memory = torch.cuda.get_device_properties(0).total_memory
+            mode = "nf4" if total_memory < 24 * 1024 ** 3 else "none"
+        elif not isinstance(mode, str) or mode.lower() not in self.QUANTIZATION_MODES:
+            # config.json의 false 등 문자열이 아닌 값도 여기서 걸러냄
+            self.logger.warning(
+                f"Unknown quantization {mode!r} (expected one of {', '.join(self.QUANTIZATION_MODES)}), "
+                "loading without it"
+            )
+            return None
+        mode = mode.lower()
+        if mode == "none":
+            return None
+
+        if not torch.cuda.is_available() or not BNB_AVAILABLE:
+            # 자동 선택이면 사용자가 요청한 것이 아니므로 정보 로그로만 남김
+            log = self.logger.info if auto else self.logger.warning
+            log(f"Quantization '{mode}' requires CUDA and bitsandbytes, loading without it")
+            return None
+
+        self.logger.info(f"Loading model with {mode} weight quantization")
+        if mode == "nf4":
+            return BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_compute_dtype=self.config.torch_dtype,
+                bnb_4bit_use_double_quant=True,
+            )
+        return BitsAndBytesConfig(load_in_8bit=True)
+
+    def _compile_model(self):
+        """모델 forward를 torch.compile (정적 KV 캐시로 디코딩 스텝 형상을 고정해 CUDA 그래프 재생)"""
+        if not torch.cuda.is_available() or not hasattr(torch, "compile"):
+            self.logger.warning("Model compile requires CUDA and PyTorch 2.0+, skipped")
+            return
+        if getattr(self.model, "is_quantized", False):
+            self.logger.warning("Model compile is not supported with bitsandbytes quantization, skipped")
+            return
+
+        self.model.generation_config.cache_implementation = "static"
+        self.model.forward = torch.compile(self.model.forward, mode="reduce-overhead", fullgraph=False)
+        # 정적 캐시에는 외부 KV 캐시를 넘길 수 없으므로 접두부 재사용 비활성화
+        self.config.reuse_prompt_prefix = False
+        self._generate_lock = threading.Lock()
+        self.logger.info("Translation model compiled (reduce-overhead, static cache)")
+
+    def _generate(self, inputs: torch.Tensor, max_new_tokens: Optional[int] = None, **kwargs) -> torch.Tensor:
+        """번역 생성 (가중치가 이미 반정밀도이므로 autocast 없이 실행)"""
+        profile = self.config.profile_gpu_time and inputs.is_cuda
+        with torch.inference_mode(), (self._generate_lock or contextlib.nullcontext()):
+            if profile:
+                start_ev = torch.cuda.Event(enable_timing=True)
+                end_ev = torch.cuda.Event(enable_timing=True)
+                start_ev.record()
+            outputs = self.model.generate(
+                inputs,
+                max_new_tokens=max_new_tokens or self.config.max_new_tokens,
+                **self.config.gen_args,
+                **kwargs,
+            )
+            if profile:
+                end_ev.record()
+                end_ev.synchronize()
+                gpu_time = start_ev.elapsed_time(end_ev) / 1000.0
+                self.gpu_times.append(gpu_time)
+                self.logger.debug(f"Generate GPU time: {gpu_time:.3f}s")
+        return outputs
+
+    def _max_new_tokens(self, prompt_len: int) -> int:
+        """본문 길이에 맞춘 생성 토큰 상한 (prompt_len은 템플릿 포함 프롬프트 토큰 수)"""
+        if self.config.max_new_tokens_ratio <= 0:
+            return self.config.max_new_tokens
+        before_ids, after_ids = self._template_ids()
+        text_len = prompt_len - before_ids.shape[1] - after_ids.shape[1]
+        return min(self.config.max_new_tokens, int(text_len * self.config.max_new_tokens_ratio) + 16)
+
+    def _warmup_model(self):
+        """모델 워밍업"""
+        self.logger.info("Warming up translation model...")
+        try:
+            dummy_text = "Hello world"
+            _ = self.translate_text(dummy_text)
+            if self._generate_lock is not None:
+                # 컴파일된 모델은 prefill/디코딩 그래프가 모두 기록되도록 캐시를 거치지 않고 두 번 더 생성
+                inputs = self._encode_prompt(dummy_text)
+                for _ in range(2):
+                    self._generate(inputs)
+            self.logger.info("Translation model warmup completed")
+        except Exception as e:
+            self.logger.warning(f"Model warmup failed: {e}")
+    
+    def _build_messages(self, text: str) -> List[Dict[str, str]]:
+        """번역 프롬프트 채팅 메시지 생성"""
+        # 언어 이름 매핑 (ISO 639-1 코드 → 영어 이름)
+        language_names = {
+            "ja": "Japanese", "ko": "Korean", "en": "English",
+            "zh": "Chinese", "es": "Spanish", "fr": "French",
+            "de": "German", "ru": "Russian", "ar": "Arabic",
+            "pt": "Portuguese", "it": "Italian"
+        }
+
+        source_lang_name = language_names.get(self.config.source_language, self.config.source_language)
+        target_lang_name = language_names.get(self.config.target_language, self.config.target_language)
+
+        # 동적 번역 프롬프트 생성
+        prompt = (
+            f"Translate the following {source_lang_name} text into {target_lang_name}. "
+            f"Provide natural and accurate {target_lang_name} translation. "
+            "Keep the original line breaks. Do not add any explanation.\n\n"
+            f"{text}"
+        )
+        return [{"role": "user", "content": prompt}]
+
+    def _template_ids(self) -> tuple:
+        """채팅 템플릿에서 본문 앞/뒤 고정 부분의 토큰 (1, n) 텐서 쌍 (모델 장치에 상주) - 언어 설정이 바뀌면 다시 계산"""
+        key = (self.config.source_language, self.config.target_language)
+        cached = self._template_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        # 자리표시자로 템플릿을 한 번 렌더링한 뒤 앞/뒤로 나눠 토큰화 (특수 토큰은 템플릿에 포함됨)
+        rendered = self.tokenizer.apply_chat_template(
+            self._build_messages(self.TEXT_PLACEHOLDER),
+            tokenize=False,
+            add_generation_prompt=False,
+        )
+        if self.TEXT_PLACEHOLDER not in rendered:
+            raise RuntimeError("Chat template dropped the text placeholder")
+        before, after = rendered.split(self.TEXT_PLACEHOLDER, 1)
+        parts = tuple(
+            self.tokenizer(part, add_special_tokens=False, return_tensors="pt").input_ids.to(self.model.device)
+            for part in (before, after)
+        )
+        self._template_cache = (key, parts)
+        return parts
+
+    def _encode_text(self, text: str) -> torch.Tensor:
+        """본문 토큰 (n,, CPU) - 모델을 건드리지 않으므로 토큰화 스레드에서 호출
+
+        수십 개 토큰뿐이라 건마다 고정 메모리를 할당하는 비용이 전송 이득보다 큼 - 일반 CPU 텐서로 둠
+        """
+        return self.tokenizer(text, add_special_tokens=False, return_tensors="pt").input_ids[0]
+
+    def _build_inputs(self, rows: List[torch.Tensor]) -> tuple:
+        """본문 토큰들을 템플릿 앞/뒤 부분 사이에 끼워 모델 장치의 (input_ids, attention_mask) 생성
+
+        한 건이면 attention_mask는 None, 여러 건이면 왼쪽 패딩 (생성 토큰이 모든 행에서 같은 위치에 이어지도록).
+        """
+        before_ids, after_ids = self._template_ids()
+        device = before_ids.device
+        # 장치로는 본문 토큰만 전송 (고정 메모리가 아니므로 동기 복사)
+        rows = [row.to(device) for row in rows]
+        if len(rows) == 1:
+            return torch.cat([before_ids, rows[0].unsqueeze(0), after_ids], dim=1), None
+        
+        fixed = before_ids.shape[1] + after_ids.shape[1]
+        width = fixed + max(len(row) for row in rows)
+        input_ids = torch.full((len(rows), width), self.tokenizer.pad_token_id, dtype=before_ids.dtype, device=device)
+        attention_mask = torch.zeros((len(rows), width), dtype=torch.long, device=device)
+        for j, row in enumerate(rows):
+            start = width - fixed - len(row)
+            input_ids[j, start:] = torch.cat([before_ids[0], row, after_ids[0]])
+            attention_mask[j, start:] = 1
+        return input_ids, attention_mask
+
+    def _encode_prompt(self, text: str) -> torch.Tensor:
+        """번역 프롬프트 토큰 (1, n, 모델 장치)"""
+        return self._build_inputs([self._encode_text(text)])[0]
+
+    def _prompt_prefix_cache(self) -> Optional[tuple]:
+        """본문 앞의 고정 프롬프트 접두부 (토큰, KV 캐시) - 언어 설정이 바뀌면 다시 계산"""
+        key = (self.config.source_language, self.config.target_language)
+        with self._prefix_lock:
+            if self._prefix_cache is not None and self._prefix_cache[0] == key:
+                return self._prefix_cache[1]
+            try:
+                # 프롬프트는 항상 템플릿 앞부분 토큰으로 시작하므로 그대로 접두부로 사용
+                prefix_ids = self._template_ids()[0]
+                with torch.no_grad():
+                    past = self.model(prefix_ids, use_cache=True).past_key_values
+                self._prefix_cache = (key, (prefix_ids, past))
+                self.logger.info(f"Prompt prefix cached: {prefix_ids.shape[1]} tokens")
+            except Exception as e:
+                self.logger.warning(f"Prompt prefix caching disabled: {e}")
+                self.config.reuse_prompt_prefix = False
+                self._prefix_cache = None
+                return None
+            return self._prefix_cache[1]
+
+    def _prepare_text(self, text: str) -> Optional[str]:
+        """번역 입력 정리 (너무 짧으면 None, 너무 길면 자름)"""
+        if not text or len(text.strip()) < self.config.min_text_length:
+            return None
+        
+        text = text.strip()
+        if len(text) > self.config.max_text_length:
+            text = text[:self.config.max_text_length]
+        return text
+
+    def _lookup_cache(self, text: str) -> tuple:
+        """캐시 확인 - (캐시 키, 캐시된 번역 또는 None)"""
+        cache_key = None
+        if self.config.use_cache:
+            cache_key = self.get_cache_key(text)
+            if cache_key in self.translation_cache:
+                self.cache_hits += 1
+                return cache_key, self.translation_cache[cache_key]
+        
+        self.cache_misses += 1
+        return cache_key, None
+
+    def _finish_translation(self, text: str, cache_key: Optional[int], out_text: str) -> str:
+        """생성 결과 후처리 (h5.py와 동일) 후 캐시 저장"""
+        # 출력에 원문이 반복되면 그 뒤만 사용
+        idx = out_text.find(text)
+        if idx >= 0:
+            out_text = out_text[idx + len(text):]
+        
+        out_text = _OUTPUT_TRIM_RE.sub('', out_text)
+        
+        # 캐시 저장
+        if self.config.use_cache and cache_key is not None:
+            self.translation_cache[cache_key] = out_text
+        return out_text
+
+    def _record_time(self, processing_time: float):
+        """성능 모니터링"""
+        self.translation_times.append(processing_time)
+        self.logger.debug(f"Translation time: {processing_time:.2f}s")
+
+    def translate_text(self, text: str) -> str:
+        """
+        텍스트 번역 - h5.py의 translate_block_text와 100% 동일한 로직
+        """
+        text = self._prepare_text(text)
+        if text is None:
+            return ""
+        
+        # 중복 필터링
+        with self._state_lock:
+            if self.config.skip_duplicates and text == self.last_translated_text:
+                return ""
+        
+        # 캐시 확인
+        cache_key, cached = self._lookup_cache(text)
+        if cached is None:
+            cached = self._generate_translation(text, cache_key)
+        with self._state_lock:
+            self.last_translated_text = text
+        return cached
+
+    def _generate_translation(self, text: str, cache_key: Optional[int]) -> str:
+        """캐시에 없는 텍스트 한 건을 모델로 번역 (실패 시 원문 반환)"""
+        if self.model is None or self.tokenizer is None:
+            raise RuntimeError("Model not loaded")
+        
+        start_time = time.time()
+        
+        try:
+            pending = [(0, text, cache_key)]
+            outputs = self._generate_ids(pending, [self._encode_text(text)])
+            out_text = self._decode_outputs(pending, outputs)[0]
+            
+            self._record_time(time.time() - start_time)
+            
+            return out_text
+            
+        except Exception as e:
+            self.logger.error(f"Translation error: {e}")
+            return text  # 번역 실패시 원문 반환
+
+    def _collect_batch(self, texts: List[str]) -> tuple:
+        """
+        배치 입력 정리 - (결과 목록, 생성할 항목 [(인덱스, 정리된 텍스트, 캐시 키)])
+
+        결과 목록은 texts와 같은 순서이며, 캐시 적중은 채워지고 나머지는 빈 문자열.
+        """
+        results = [""] * len(texts)
+        pending = []
+        with self._state_lock:
+            last_text = self.last_translated_text
+            for i, raw_text in enumerate(texts):
+                text = self._prepare_text(raw_text)
+                if text is None:
+                    continue
+                # 중복 필터링 (배치 안에서는 바로 앞 항목과 비교)
+                if self.config.skip_duplicates and text == last_text:
+                    continue
+                last_text = text
+                
+                cache_key, cached = self._lookup_cache(text)
+                if cached is not None:
+                    results[i] = cached
+                else:
+                    pending.append((i, text, cache_key))
+            self.last_translated_text = last_text
+        return results, pending
+
+    def _generate_ids(self, pending: List[tuple], rows: List[torch.Tensor]) -> torch.Tensor:
+        """본문 토큰들로 generate 실행 - 모델을 사용하는 유일한 단계 (출력 토큰은 모델 장치에 있음)"""
+        input_ids, attention_mask = self._build_inputs(rows)
+        
+        if attention_mask is None:
+            # 한 건이면 미리 계산한 접두부 KV 캐시에서 시작 (본문 토큰만 prefill)
+            text = pending[0][1]
+            gen_kwargs = {}
+            if self.config.reuse_prompt_prefix:
+                prefix = self._prompt_prefix_cache()
+                if prefix is not None:
+                    prefix_ids, prefix_past = prefix
+                    if input_ids.shape[1] > prefix_ids.shape[1]:
+                        # 공유 캐시가 생성 중 변경되지 않도록 복사본 사용
+                        gen_kwargs["past_key_values"] = copy.deepcopy(prefix_past)
+            
+            stop_criteria = None
+            if self.config.stop_at_sentence_end:
+                stop_criteria = SentenceEndStoppingCriteria(
+                    self.tokenizer, SentenceEndStoppingCriteria.count_sentences(text), input_ids.shape[1]
+                )
+                gen_kwargs["stopping_criteria"] = StoppingCriteriaList([stop_criteria])
+            
+            outputs = self._generate(input_ids, self._max_new_tokens(input_ids.shape[1]), **gen_kwargs)
+            if stop_criteria is not None and stop_criteria.overshoot:
+                outputs = outputs[:, :-1]  # 다음 문장의 첫 토큰 제거
+            return outputs
+        
+        return self._generate(
+            input_ids,
+            self._max_new_tokens(input_ids.shape[1]),
+            attention_mask=attention_mask,
+            pad_token_id=self.tokenizer.pad_token_id,
+        )
+
+    def _decode_outputs(self, pending: List[tuple], outputs: torch.Tensor) -> List[str]:
+        """생성 토큰 디코딩 + 후처리 (pending과 같은 순서의 번역 목록)"""
+        decoded = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        return [
+            self._finish_translation(text, cache_key, out_text)
+            for (_, text, cache_key), out_text in zip(pending, decoded)
+        ]
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        여러 텍스트를 generate 한 번으로 번역 (캐시 적중/중복은 생성 없이 처리)
+
+        반환 목록은 texts와 같은 순서이며, 번역하지 않은 항목은 빈 문자열.
+        """
+        results, pending = self._collect_batch(texts)
+        if not pending:
+            return results
+        
+        if self.model is None or self.tokenizer is None:
+            raise RuntimeError("Model not loaded")
+        
+        start_time = time.time()
+        
+        try:
+            outputs = self._generate_ids(pending, [self._encode_text(text) for _, text, _ in pending])
+            for (i, _, _), out_text in zip(pending, self._decode_outputs(pending, outputs)):
+                results[i] = out_text
+            
+            self._record_time(time.time() - start_time)
+            
+        except Exception as e:
+            self.logger.error(f"Batch translation error: {e}")
+            for i, text, _ in pending:
+                results[i] = text  # 번역 실패시 원문 반환
+        
+        return results
+    
+    def _take_request(self) -> Optional[str]:
+        """가장 오래된 번역 요청 꺼내기 (없으면 들어올 때까지 대기, 종료 신호는 None)"""
+        while True:
+            try:
+                return self._pending.pop()
+            except IndexError:
+                # 이벤트를 지운 뒤 다시 확인해야 그 사이에 들어온 요청의 신호를 놓치지 않음
+                self._work_event.clear()
+                if not self._pending:
+                    self._work_event.wait()
+
+    def _tokenize_worker(self):
+        """토큰화 스레드 (대기 중인 요청을 batch_size개까지 모아 캐시 확인/토큰화 후 생성 단계로 전달)"""
+        self.logger.info("Translation tokenize worker started")
+        
+        while True:
+            item = self._take_request()
+            if item is None:  # 종료 신호
+                break
+            
+            # 이미 쌓여 있는 요청을 함께 꺼냄
+            originals = [item]
+            stop_requested = False
+            while len(originals) < self.config.batch_size:
+                try:
+                    item = self._pending.pop()
+                except IndexError:
+                    break
+                if item is None:  # 종료 신호 - 꺼낸 요청만 처리하고 종료
+                    stop_requested = True
+                    break
+                originals.append(item)
+            
+            job = {"originals": originals, "start": time.time(), "outputs": None}
+            try:
+                job["results"], job["pending"] = self._collect_batch(originals)
+                job["rows"] = [self._encode_text(text) for _, text, _ in job["pending"]]
+            except Exception as e:
+                # 번역 실패시 원문 반환
+                self.logger.error(f"Translation tokenize error: {e}")
+                job["results"], job["pending"], job["rows"] = list(originals), [], []
+                if self.on_error:
+                    self.on_error(f"Translation error: {e}")
+            
+            # 생성할 항목이 없으면 (캐시 적중/중복) 모델 단계를 건너뜀
+            (self._generate_queue if job["pending"] else self._detokenize_queue).put(job)
+            
+            if stop_requested:
+                break
+        
+        # 다음 단계는 종료 신호를 받을 때까지 남은 작업을 모두 처리
+        self._generate_queue.put(None)
+        self.logger.info("Translation tokenize worker stopped")
+
+    def _generate_worker(self):
+        """생성 스레드 (모델을 사용하는 유일한 스레드 - 토큰화/디코딩과 겹쳐 실행됨)"""
+        self.logger.info("Translation generate worker started")
+        
+        while True:
+            job = self._generate_queue.get()
+            if job is None:  # 종료 신호
+                break
+            
+            try:
+                job["outputs"] = self._generate_ids(job["pending"], job["rows"])
+            except Exception as e:
+                # outputs가 None이면 디코딩 단계에서 원문 반환
+                self.logger.error(f"Translation error: {e}")
+                if self.on_error:
+                    self.on_error(f"Translation error: {e}")
+            self._detokenize_queue.put(job)
+        
+        self._detokenize_queue.put(None)
+        self.logger.info("Translation generate worker stopped")
+
+    def _detokenize_worker(self):
+        """디코딩 스레드 (생성 결과 디코딩/후처리 후 결과 전달)"""
+        self.logger.info("Translation detokenize worker started")
+        
+        while True:
+            job = self._detokenize_queue.get()
+            if job is None:  # 종료 신호
+                break
+            
+            results = job["results"]
+            if job["pending"]:
+                try:
+                    if job["outputs"] is None:
+                        raise RuntimeError("generation failed")
+                    translations = self._decode_outputs(job["pending"], job["outputs"])
+                    self._record_time(time.time() - job["start"])
+                except Exception as e:
+                    if job["outputs"] is not None:
+                        self.logger.error(f"Translation decode error: {e}")
+                    translations = [text for _, text, _ in job["pending"]]  # 번역 실패시 원문 반환
+                for (i, _, _), out_text in zip(job["pending"], translations):
+                    results[i] = out_text
+            
+            for original_text, translated_text in zip(job["originals"], results):
+                if translated_text:
+                    self._emit_translation(original_text, translated_text)
+                # 결과를 내보낸 뒤에 대기 목록에서 제거 (캐시 적중 바로 전달이 이 결과를 앞지르지 않도록)
+                with self._state_lock:
+                    self._pending_keys.discard(self.get_cache_key(original_text))
+        
+        self.logger.info("Translation detokenize worker stopped")
+    
+    def _emit_translation(self, original_text: str, translated_text: str):
+        """번역 결과를 결과 큐로 전달 (콜백이 설정되어 있으면 콜백 스레드가 꺼내서 호출)"""
+        self.result_queue.put((original_text, translated_text))
+
+    def _callback_loop(self):
+        """콜백 스레드 (결과 큐를 순서대로 꺼내 on_translation 호출 - 결과마다 스레드를 만들지 않음)"""
+        while True:
+            item = self.result_queue.get()
+            if item is None:  # 종료 신호
+                break
+            try:
+                self.on_translation(*item)
+            except Exception as e:
+                self.logger.error(f"Translation callback error: {e}")
+
+    def start(self, num_workers: int = 2):
+        """
+        실시간 번역 시작 (토큰화 → 생성 → 디코딩 단계별 스레드 하나씩)
+
+        num_workers는 이전 버전 호환용 - 모델은 생성 스레드 하나만 사용하고
+        대기 중인 요청은 batch_size개까지 묶어 한 번에 생성함.
+        """
+        if self.is_running:
+            self.logger.warning("Translator already running")
+            return
+        
+        # 모델 로딩
+        if self.model is None:
+            self.load_model()
+        
+        # 워커 스레드 시작
+        self.is_running = True
+        for name, target in (
+            ("TranslationTokenizer", self._tokenize_worker),
+            ("TranslationGenerator", self._generate_worker),
+            ("TranslationDetokenizer", self._detokenize_worker),
+        ):
+            worker = threading.Thread(target=target, name=name, daemon=True)
+            worker.start()
+            self.processing_threads.append(worker)
+        
+        # 콜백을 쓰면 결과 큐는 콜백 스레드가 소비 (없으면 get_result()로 가져감)
+        if self.on_translation:
+            self._callback_thread = threading.Thread(
+                target=self._callback_loop, name="TranslationCallback", daemon=True
+            )
+            self._callback_thread.start()
+        
+        self.logger.info("Realtime translator started (tokenize/generate/detokenize pipeline)")
+    
+    def stop(self):
+        """실시간 번역 중지"""
+        if not self.is_running:
+            return
+        
+        self.logger.info("Stopping realtime translator...")
+        
+        # 종료 신호
+        self.is_running = False
+        # 남은 요청 뒤에 종료 신호 (토큰화 단계가 종료 후 다음 단계로 전달)
+        self._pending.appendleft(None)
+        self._work_event.set()
+        
+        # 스레드 종료 대기
+        for thread in self.processing_threads:
+            if thread.is_alive():
+                thread.join(timeout=5.0)
+        
+        self.processing_threads.clear()
+        
+        # 남은 결과까지 콜백 전달 후 콜백 스레드 종료
+        if self._callback_thread is not None:
+            self.result_queue.put(None)
+            self._callback_thread.join(timeout=5.0)
+            self._callback_thread = None
+        
+        # 캐시 저장
+        self.save_cache()
+        
+        self.logger.info("Realtime translator stopped")
+    
+    def translate_async(self, text: str):
+        """비동기 번역 요청"""
+        if not self.is_running:
+            self.logger.warning("Translator not running")
+            return
+        
+        text = self._prepare_text(text)
+        if text is None:
+            return
+        
+        cache_key = self.get_cache_key(text)
+        with self._state_lock:
+            # 직전 번역과 같거나 이미 큐에 있는 텍스트는 넣지 않음
+            if self.config.skip_duplicates and text == self.last_translated_text:
+                return
+            if cache_key in self._pending_keys:
+                return
+            
+            # 대기 중인 번역이 없으면 캐시 적중은 워커를 거치지 않고 바로 전달 (결과 순서 유지)
+            if self.config.use_cache and not self._pending_keys and cache_key in self.translation_cache:
+                self.cache_hits += 1
+                self.last_translated_text = text
+                self._emit_translation(text, self.translation_cache[cache_key])
+                return
+            
+            if len(self._pending) >= self.config.max_queue_size:
+                self.logger.warning("Translation queue full, dropping request")
+                return
+            
+            self._pending_keys.add(cache_key)
+            self._pending.appendleft(text)
+        self._work_event.set()
+    
+    def get_result(self) -> Optional[tuple]:
+        """결과 큐에서 번역 결과 가져오기"""
+        try:
+            return self.result_queue.get_nowait()
+        except queue.Empty:
+            return None
+    
+    def get_stats(self) -> Dict:
+        """성능 통계 반환"""
+        total_cache_requests = self.cache_hits + self.cache_misses
+        cache_hit_rate = self.cache_hits / total_cache_requests if total_cache_requests > 0 else 0
+        
+        avg_translation_time = 0
+        if self.translation_times:
+            avg_translation_time = sum(self.translation_times) / len(self.translation_times)
+        
+        return {
+            "cache_hit_rate": cache_hit_rate,
+            "cache_entries": len(self.translation_cache),
+            "avg_translation_time": avg_translation_time,
+            "avg_gpu_time": sum(self.gpu_times) / len(self.gpu_times) if self.gpu_times else 0,
+            "queue_size": len(self._pending),
+            "result_queue_size": self.result_queue.qsize(),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses
+        }
+
+# 테스트 코드
+if __name__ == "__main__":
+    def on_translation_callback(original, translated):
+        print(f"Original: {original}")
+        print(f"Translated: {translated}")
+        print("-" * 50)
+    
+    # 번역기 설정
+    config = RealtimeTranslatorConfig()
+    translator = RealtimeTranslator(config)
+    translator.on_translation = on_translation_callback
+    
+    # 테스트 텍스트
+    test_texts = [
+        "Hello, how are you?",
+        "This is a test sentence.",
+        "I love machine learning.",
+        "Python is a great programming language.",
+        "Real-time translation is amazing!"
+    ]
+    
+    print("Starting realtime translator test...")
+    translator.start()
+    
+    try:
+        # 테스트 텍스트들 번역 요청
+        for text in test_texts:
+            translator.translate_async(text)
+            time.sleep(2)
+            
+            # 통계 출력
+            stats = translator.get_stats()
+            print(f"Stats: {stats}")
+        
+        # 잠시 기다려서 모든 번역 완료
+        time.sleep(5)
+        
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        translator.stop()
         print("Translation test completed.")
\ No newline at end of file
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+오디오 캡처 테스트 (PyAudio 장치는 열지 않고 링 버퍼/VAD 워커 로직만 검증)
+"""
+
+import numpy as np
+import pytest
+
+import audio_capture
+from audio_capture import AudioCaptureConfig, AudioSegmentPool, ChromeAudioCapture
+
+SAMPLE_RATE = 16000
+
+
+class _FakePyAudio:
+    """장치 없는 PyAudio 대체"""
+
+    def terminate(self):
+        pass
+
+
+@pytest.fixture
+def capture(monkeypatch):
+    monkeypatch.setattr(audio_capture.pyaudio, "PyAudio", _FakePyAudio)
+    cap = ChromeAudioCapture(AudioCaptureConfig())
+    yield cap
+    cap.is_recording = False
+
+
+def _tone(seconds: float, freq: float, amplitude: float = 0.3) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * freq * t)
+
+
+def _to_int16(audio: np.ndarray) -> np.ndarray:
+    return np.round(audio * 32767).astype(np.int16)
+
+
+def test_speech_end_segment_follows_lagging_vad_worker(capture):
+    """VAD 워커가 캡처보다 밀려 있어도 발화 종료 세그먼트는 발화 종료 위치에서 끝남"""
+    chunk = capture.config.chunk_size
+    signal = _to_int16(np.concatenate([
+        np.zeros(int(0.3 * SAMPLE_RATE)),
+        _tone(1.0, 440),        # 발화
+        np.zeros(int(2.5 * SAMPLE_RATE)),  # 발화 종료 판단까지의 침묵
+        _tone(1.5, 1000),       # VAD 워커가 아직 처리하지 않은 이후 오디오
+    ]))
+    # 캡처는 전부 기록했지만 VAD 워커는 아직 처음부터 처리하지 못한 상태
+    for start in range(0, len(signal) - chunk + 1, chunk):
+        capture._write_ring(signal[start:start + chunk])
+
+    segments = []
+    capture.on_speech_ended = segments.append
+    capture.is_recording = True
+    end_position = None
+    position = 0
+    while capture._ring_total - position >= chunk and end_position is None:
+        block = capture._read_ring_block(position, chunk)
+        position += chunk
+        capture._process_chunk(block, position)
+        if not capture._dispatch_queue.empty():
+            end_position = position
+
+    assert end_position is not None, "speech end was not detected"
+    assert end_position < capture._ring_total  # 캡처 헤드보다 뒤에서 발화 종료 판단
+    _, segment = capture._dispatch_queue.get_nowait()
+
+    expected = signal[end_position - len(segment):end_position] * audio_capture._INT16_TO_FLOAT
+    np.testing.assert_array_equal(segment, expected)
+    assert np.sqrt(np.mean(segment ** 2)) > 0.05  # 무음이 아니라 발화가 담겨 있음
+
+
+def test_pool_ignores_double_release():
+    """같은 세그먼트를 두 번 반환해도 버퍼가 두 세그먼트에 동시에 대여되지 않음"""
+    pool = AudioSegmentPool(num_slots=2, max_samples=16)
+    first = pool.acquire(8)
+    pool.release(first)
+    pool.release(first)
+
+    leased = [pool.acquire(8), pool.acquire(8)]
+    assert all(segment is not None for segment in leased)
+    assert leased[0].base is not leased[1].base
+    assert pool.acquire(8) is None
+
+
+def test_pool_ignores_foreign_arrays():
+    pool = AudioSegmentPool(num_slots=1, max_samples=16)
+    pool.release(np.zeros(8, dtype=np.float32))
+    assert pool.acquire(8) is not None
+    assert pool.acquire(8) is None
+
+
+def test_dispatch_failure_does_not_release_transferred_segment(capture):
+    """콜백이 세그먼트를 넘긴 뒤 예외를 내도 전달 워커가 반환하지 않음 (소비자의 반환과 중복 방지)"""
+    handed_off = []
+
+    def failing_callback(segment):
+        handed_off.append(segment)  # 예: STT 큐에 넣은 뒤
+        raise RuntimeError("late failure")
+
+    capture.is_recording = True
+    segment = capture.segment_pool.acquire(capture.config.chunk_size)
+    capture._dispatch_callback(failing_callback, segment)
+    capture._dispatch_queue.put(None)
+    capture._dispatch_worker()
+
+    # 소비자가 사용을 마친 뒤 반환 - 슬롯은 한 번만 자유 목록으로 돌아감
+    capture.release_segment(handed_off[0])
+    slots = [capture.segment_pool.acquire(capture.config.chunk_size) for _ in range(4)]
+    assert len({id(slot.base) for slot in slots if slot is not None}) == 4
+    assert capture.segment_pool.acquire(capture.config.chunk_size) is None
+
+
+def _baseline_speech_ratio(audio: np.ndarray) -> float:
+    """원래 VAD 공식 - 전체 FFT의 양의 주파수 300Hz - 3400Hz 에너지 / 양쪽 스펙트럼 전체 에너지"""
+    fft = np.fft.fft(audio)
+    freqs = np.fft.fftfreq(len(audio), 1 / SAMPLE_RATE)
+    band = (freqs >= 300) & (freqs <= 3400)
+    return float(np.sum(np.abs(fft[band]) ** 2) / np.sum(np.abs(fft) ** 2))
+
+
+def _tone_mix(seconds: float, band_fraction: float) -> np.ndarray:
+    """62.5Hz 저음 + 1000Hz 음성 대역 톤 (둘 다 정확한 bin 주파수라 누설 없음)의 실제 대역 비율이 band_fraction인 신호"""
+    low = 0.3
+    high = low * np.sqrt(band_fraction / (1 - band_fraction))
+    return (_tone(seconds, 62.5, low) + _tone(seconds, 1000, high)).astype(np.float32)
+
+
+def test_fft_speech_ratio_matches_baseline_scale(capture):
+    """rFFT 경로 비율은 원래 공식(양쪽 스펙트럼 기준 절반 비율)의 정확히 두 배 - 임계값도 0.1 → 0.2"""
+    noise = (0.1 * np.random.default_rng(0).standard_normal(capture.config.chunk_size)).astype(np.float32)
+    baseline = _baseline_speech_ratio(noise)
+    assert capture._fft_energy_ratio(noise) == pytest.approx(2 * baseline, rel=1e-5)
+    assert capture.SPEECH_BAND_RATIO == pytest.approx(2 * 0.1)
+
+
+def test_fft_path_rejects_weak_speech_band(capture):
+    """원래 공식으로 0.1 미만(실제 비율 0.15)인 저음 위주 청크는 scipy 없는 경로에서도 음성이 아님"""
+    capture._bp_sos = None
+    chunk = _tone_mix(capture.config.chunk_size / SAMPLE_RATE, 0.15)
+    assert _baseline_speech_ratio(chunk) < 0.1
+    assert not capture.detect_voice_activity(chunk)
+    assert capture.detect_voice_activity(_tone_mix(capture.config.chunk_size / SAMPLE_RATE, 0.3))
+
+
+@pytest.mark.skipif(not audio_capture.SCIPY_AVAILABLE, reason="scipy not installed")
+def test_bandpass_ratio_matches_fft_ratio(capture):
+    """대역통과 경로도 실제 대역 비율(원래 공식의 두 배)을 내므로 같은 임계값으로 같은 판정"""
+    chunk = capture.config.chunk_size
+    signal = _tone_mix(6 * chunk / SAMPLE_RATE, 0.15)
+    blocks = [signal[start:start + chunk] for start in range(0, len(signal), chunk)]
+    for block in blocks:
+        ratio = capture._bandpass_energy_ratio(block, float(np.dot(block, block)))
+    # 필터 상태가 이어진 뒤에는 rFFT 경로/원래 공식의 두 배와 일치
+    assert ratio == pytest.approx(capture._fft_energy_ratio(blocks[-1]), abs=0.005)
+    assert ratio == pytest.approx(2 * _baseline_speech_ratio(blocks[-1]), abs=0.005)
+
+    capture._bp_primed = False
+    assert not any(capture.detect_voice_activity(block) for block in blocks)
+    assert capture.detect_voice_activity(_tone_mix(chunk / SAMPLE_RATE, 0.3))
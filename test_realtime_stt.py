@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+실시간 STT 처리 워커 테스트 (Whisper 추론은 대체 함수 사용)
+"""
+
+import time
+
+import numpy as np
+
+from realtime_stt import RealtimeSTT, RealtimeSTTConfig
+
+SAMPLE_RATE = 16000
+
+
+def _make_audio(tag: int, seconds: float = 1.0) -> np.ndarray:
+    """tag를 첫 샘플에 담은 일정 크기 오디오 (결과 캐시 키가 서로 다르도록)"""
+    audio = np.full(int(seconds * SAMPLE_RATE), 0.5, dtype=np.float32)
+    audio[0] = tag / 1000.0
+    return audio
+
+
+def _tag(audio_data: np.ndarray) -> int:
+    return int(round(audio_data[0] * 1000))
+
+
+def _make_stt(texts, delays, workers: int = 2, drop_stale: bool = False) -> RealtimeSTT:
+    """tag → 텍스트/지연을 돌려주는 대체 추론으로 동작하는 STT (모델 로딩 없음)"""
+    config = RealtimeSTTConfig()
+    config.backend = "faster-whisper"
+    config.inference_workers = workers
+    config.drop_stale_audio = drop_stale
+    stt = RealtimeSTT(config)
+    stt.model = object()
+    stt.backend = "faster-whisper"
+    stt.inference_inputs = []
+
+    def fake_inference(audio_data):
+        tag = _tag(audio_data)
+        stt.inference_inputs.append((tag, len(audio_data)))
+        time.sleep(delays[tag])
+        return texts[tag]
+
+    stt._run_inference = fake_inference
+    return stt
+
+
+def _run(stt: RealtimeSTT, count: int) -> list:
+    emitted = []
+    stt.on_transcription = emitted.append
+    stt.start()
+    for tag in range(count):
+        stt.process_audio(_make_audio(tag))
+    stt.stop()
+    return emitted
+
+
+def test_ordered_emission_with_two_workers():
+    """먼저 제출한 발화가 늦게 끝나도 제출 순서대로 방출"""
+    texts = ["첫째", "둘째", "셋째", "넷째"]
+    stt = _make_stt(texts, delays=[0.2, 0.05, 0.15, 0.0])
+    assert _run(stt, len(texts)) == texts
+
+
+def test_duplicate_filter_follows_submission_order():
+    """중복 판정은 완료 순서가 아니라 직전에 방출한 결과와 비교"""
+    texts = ["가나다", "가나다", "라마바", "가나다"]
+    # 뒤 발화일수록 빨리 끝나 완료 순서가 제출 순서와 반대
+    stt = _make_stt(texts, delays=[0.2, 0.15, 0.1, 0.0])
+    assert _run(stt, len(texts)) == ["가나다", "라마바", "가나다"]
+
+
+def test_backlog_collapse_keeps_only_newest_segment():
+    """밀린 세그먼트(서로 겹치는 최근 N초 창)는 이어 붙이지 않고 최신 것만 전사, 나머지는 반환"""
+    texts = ["하나", "두울", "세엣", "네엣"]
+    stt = _make_stt(texts, delays=[0.3, 0.0, 0.0, 0.0], workers=1, drop_stale=True)
+    released = []
+    stt.on_audio_consumed = lambda audio: released.append(_tag(audio))
+    emitted = []
+    stt.on_transcription = emitted.append
+    stt.start()
+
+    stt.process_audio(_make_audio(0))
+    time.sleep(0.1)  # 첫 세그먼트 추론 중에 나머지가 쌓이도록
+    for tag in (1, 2, 3):
+        stt.process_audio(_make_audio(tag, seconds=3.0))
+    stt.stop()
+
+    samples = int(3.0 * SAMPLE_RATE)
+    assert stt.inference_inputs == [(0, SAMPLE_RATE), (3, samples)]
+    assert emitted == ["하나", "네엣"]
+    assert sorted(released) == [0, 1, 2, 3]
+
+
+def test_quiet_short_utterance_padded_with_silence_is_transcribed():
+    """짧고 조용한 발화 + 발화 종료 전 침묵 세그먼트는 전체 RMS가 낮아도 무음으로 건너뛰지 않음"""
+    stt = _make_stt(["작은 목소리", ""], delays=[0.0, 0.0], workers=1)
+    t = np.arange(int(0.3 * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = (0.02 * np.sin(2 * np.pi * 300 * t)).astype(np.float32)
+    audio = np.concatenate([tone, np.zeros(int(2.7 * SAMPLE_RATE), dtype=np.float32)])
+    audio[0] = 0.0  # tag 0
+    assert np.sqrt(np.mean(audio ** 2)) < stt.config.silence_rms_threshold
+
+    assert stt._transcribe_audio(audio) == "작은 목소리"
+    assert stt.inference_inputs == [(0, len(audio))]
+
+
+def test_pure_silence_skips_inference():
+    stt = _make_stt(["무음"], delays=[0.0], workers=1)
+    assert stt._transcribe_audio(np.zeros(2 * SAMPLE_RATE, dtype=np.float32)) == ""
+    assert stt.inference_inputs == []
+
+
+def test_stop_timeout_does_not_leak_segments():
+    """stop() 대기 시간을 넘긴 추론 뒤의 제출도 성공하고, 종료 신호 뒤에 들어온 오디오도 반환"""
+    texts = ["느린 발화", "둘째", "셋째", "넷째"]
+    stt = _make_stt(texts, delays=[0.4, 0.0, 0.0, 0.0])
+    stt.STOP_TIMEOUT = 0.05
+    released = []
+    stt.on_audio_consumed = lambda audio: released.append(_tag(audio))
+    emitted = []
+    stt.on_transcription = emitted.append
+    stt.start()
+    worker = stt.processing_thread
+
+    for tag in range(3):
+        stt.process_audio(_make_audio(tag))
+    time.sleep(0.05)  # 0, 1 제출 후 0의 완료를 기다리는 중
+    stt.stop()
+    assert worker.is_alive()
+    stt.audio_queue.put(_make_audio(3))  # stop() 직전 is_running을 확인한 생산자가 늦게 넣은 오디오
+    worker.join(timeout=2.0)
+
+    assert not worker.is_alive()
+    assert emitted == texts[:3]
+    assert sorted(released) == [0, 1, 2, 3]
+    assert stt._executor is None
+
+
+def test_failed_submit_releases_segment():
+    stt = _make_stt(["하나"], delays=[0.0])
+    released = []
+    stt.on_audio_consumed = lambda audio: released.append(_tag(audio))
+
+    class _ClosedExecutor:
+        def submit(self, *args):
+            raise RuntimeError("cannot schedule new futures after shutdown")
+
+        def shutdown(self, wait=True):
+            pass
+
+    stt.audio_queue.put(_make_audio(0))
+    stt.audio_queue.put(None)
+    stt._processing_worker(_ClosedExecutor())
+
+    assert released == [0]
+    assert stt.inference_inputs == []
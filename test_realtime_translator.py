@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+실시간 번역기 테스트 (모델 없이 토크나이저/생성 결과만 대체)
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from realtime_translator import RealtimeTranslator, RealtimeTranslatorConfig, SentenceEndStoppingCriteria
+
+
+class _PieceTokenizer:
+    """토큰 id를 미리 정한 문자열 조각으로 디코딩하는 토크나이저 대체"""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+
+    def decode(self, ids, skip_special_tokens=True):
+        return "".join(self.pieces[i] for i in ids)
+
+
+def _stop_step(source: str, pieces, prompt_len: int = 3):
+    """생성 조각을 한 토큰씩 늘려 가며 처음 중지된 스텝 (1부터, 끝까지 안 멈추면 None)과 criteria 반환"""
+    tokenizer = _PieceTokenizer(["<p>"] * prompt_len + list(pieces))
+    criteria = SentenceEndStoppingCriteria(
+        tokenizer, SentenceEndStoppingCriteria.count_sentences(source), prompt_len
+    )
+    for step in range(1, len(pieces) + 1):
+        input_ids = np.arange(prompt_len + step)[None, :]
+        if criteria(input_ids, None):
+            return step, criteria
+    return None, criteria
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("3.5キロです", 1),
+    ("はい。そうです", 2),
+    ("こんにちは", 1),
+    ("はい。", 1),
+    ("Wait... what? OK.", 2),
+    ("一行目\n\n二行目", 2),
+])
+def test_count_sentences(source, expected):
+    assert SentenceEndStoppingCriteria.count_sentences(source) == expected
+
+
+def test_decimal_point_does_not_stop():
+    """소수점은 문장 끝이 아님 - "3." 에서 잘리지 않음"""
+    step, _ = _stop_step("3.5キロです", ["3", ".", "5", "킬로", "입니다", "."])
+    assert step is None
+
+
+def test_ellipsis_does_not_stop():
+    """말줄임표(여러 "." 토큰)는 문장 끝이 아님"""
+    step, _ = _stop_step("えっと…そうですね", ["음", ".", ".", ".", " 그렇", "네요"])
+    assert step is None
+
+
+def test_stops_after_sentence_boundary_and_flags_overshoot():
+    """ASCII 마침표 뒤 다음 문장이 시작되면 중지하고 그 토큰은 버리도록 표시"""
+    step, criteria = _stop_step("こんにちは", ["안녕", "하세요", ".", " 저는", " 번역"])
+    assert step == 4
+    assert criteria.overshoot
+
+
+def test_paragraph_break_stops_without_overshoot():
+    """빈 줄(\\n\\n)에서 중지 - 공백뿐이므로 마지막 토큰을 버리지 않음"""
+    step, criteria = _stop_step("こんにちは", ["안녕", "하세요", "\n\n", "설명"])
+    assert step == 3
+    assert not criteria.overshoot
+
+
+def test_full_width_stop_is_immediate():
+    step, criteria = _stop_step("はい。", ["네", "。", "추가"])
+    assert step == 2
+    assert not criteria.overshoot
+
+
+def test_waits_for_source_sentence_count():
+    """원문이 두 문장이면 첫 문장 끝에서 멈추지 않음"""
+    step, _ = _stop_step("はい。そうです。", ["네", ". ", "그렇", "습니다", ". ", "추가"])
+    assert step == 5
+
+
+@pytest.fixture
+def translator(tmp_path):
+    """모델 대신 "[원문]"을 번역 결과로 내는 번역기 (토큰화/생성/디코딩 단계 대체)"""
+    config = RealtimeTranslatorConfig()
+    config.cache_dir = tmp_path
+    config.batch_size = 1
+    t = RealtimeTranslator(config)
+    t.model = object()
+    t.tokenizer = object()
+    t._encode_text = lambda text: text
+    t._generate_ids = lambda pending, rows: rows
+    t._decode_outputs = lambda pending, outputs: [f"[{text}]" for _, text, _ in pending]
+    yield t
+    t.stop()
+
+
+def _wait_for(condition, timeout: float = 2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_cached_result_does_not_overtake_live_translation(translator):
+    """실시간 번역 결과를 내보내는 순간 들어온 캐시 적중은 그 결과 뒤에 전달"""
+    translator.translation_cache[translator.get_cache_key("캐시된 문장")] = "[캐시]"
+    emitted = []
+    translator.on_translation = lambda original, translated: emitted.append(original)
+    translator.start()
+
+    emit = translator._emit_translation
+
+    def racing_emit(original, translated):
+        # 디코딩 단계가 결과를 내보내는 바로 그 시점에 다음 요청이 들어옴
+        if original == "실시간 문장":
+            translator.translate_async("캐시된 문장")
+        emit(original, translated)
+
+    translator._emit_translation = racing_emit
+    translator.translate_async("실시간 문장")
+    _wait_for(lambda: len(emitted) == 2)
+
+    assert emitted == ["실시간 문장", "캐시된 문장"]
+
+
+@pytest.mark.parametrize("value", [False, 0, "fp8", ["nf4"]])
+def test_invalid_quantization_value_is_rejected(translator, caplog, value):
+    """config.json의 잘못된 quantization 값은 예외 없이 경고 후 양자화 없이 로드"""
+    translator.config.quantization = value
+    assert translator._quantization_config() is None
+    assert any(record.levelname == "WARNING" for record in caplog.records)
+
+
+def test_auto_quantization_unavailable_is_not_a_warning(translator, caplog, monkeypatch):
+    """요청하지 않은 자동 NF4가 불가능하면 경고가 아니라 정보 로그"""
+    import realtime_translator
+    monkeypatch.setattr(realtime_translator.torch.cuda, "is_available", lambda: True)
+    monkeypatch.setattr(
+        realtime_translator.torch.cuda, "get_device_properties",
+        lambda index: type("Props", (), {"total_memory": 8 * 1024 ** 3})(), raising=False,
+    )
+    monkeypatch.setattr(realtime_translator, "BNB_AVAILABLE", False)
+    translator.config.quantization = None
+    caplog.set_level("INFO")
+
+    assert translator._quantization_config() is None
+    assert not any(record.levelname == "WARNING" for record in caplog.records)
+    assert any("requires CUDA and bitsandbytes" in record.getMessage() for record in caplog.records)